@@ -0,0 +1 @@
+"""标记语言解析与渲染的性能基准，在 SQA 目录下以 python -m benchmarks.<name> 运行"""
@@ -0,0 +1,64 @@
+"""数据绑定基准：模拟后台每秒推送 10k 次字段更新
+
+更新分布在 FIELDS 个字段上，每轮事件处理（一个 tick）到达 UPDATES // TICKS 次。
+分别统计立即通知（不合并）和按 tick 合并两种方式下订阅者被调用的次数——
+每次调用对应一次写Tk变量和一次控件重绘——以及总耗时。不需要图形界面。
+"""
+import random
+import time
+
+from markup.binding import Model
+
+UPDATES = 10000
+TICKS = 60
+FIELDS = 50
+
+
+class _Ticks:
+    """代替 after_idle：收集回调，到一个 tick 结束时统一执行"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def schedule(self, callback):
+        self.callbacks.append(callback)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def run(coalesce, seed=0):
+    """返回 (重绘次数, 刷新次数, 耗时毫秒)"""
+    ticks = _Ticks()
+    model = Model(schedule=ticks.schedule if coalesce else None)
+    redraws = [0]
+
+    def redraw(path, value):
+        redraws[0] += 1
+
+    for field in range(FIELDS):
+        model.subscribe(f"feed.f{field}", redraw)
+
+    rng = random.Random(seed)
+    per_tick = UPDATES // TICKS
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        for i in range(per_tick):
+            model.set(f"feed.f{rng.randrange(FIELDS)}", tick * per_tick + i)
+        ticks.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    return redraws[0], model.flushes, elapsed
+
+
+def main():
+    print(f"更新数: {UPDATES}，tick数: {TICKS}，字段数: {FIELDS}")
+    print(f"{'方式':<8} {'重绘次数':>10} {'刷新次数':>10} {'耗时(ms)':>10}")
+    for name, coalesce in (("立即通知", False), ("合并", True)):
+        redraws, flushes, elapsed = run(coalesce)
+        print(f"{name:<8} {redraws:>10} {flushes:>10} {elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
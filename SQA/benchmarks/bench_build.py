@@ -0,0 +1,50 @@
+"""批量编译基准：生成一批标记文件，比较不同工作进程数下 compile_files 的总耗时
+
+进程数从1开始翻倍，直到CPU核数。每个文件互不相关，理想情况下耗时按进程数线性下降。
+不需要图形界面。
+"""
+import os
+import tempfile
+import time
+
+from markup.build import compile_files, find_files
+
+FILES = 200
+ROWS = 300
+
+
+def write_screen(path, rows):
+    lines = ['<window title="表单">', '<frame layout="grid" cols="2" colweights="0,1">']
+    for i in range(rows):
+        lines.append(f'<label text="字段{i}："/><entry id="field_{i}" width="30" bind="form.f{i}"/>')
+    lines.extend(['</frame>', '<frame layout="horizontal">',
+                  '<button text="保存" command="save"/><button text="取消" command="cancel"/>',
+                  '</frame>', '</window>'])
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+
+
+def main():
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(FILES):
+            write_screen(os.path.join(directory, f"screen_{index}.xml"), ROWS)
+        files = find_files([directory], "*.xml")
+        print(f"文件数: {FILES}，每个文件 {ROWS * 2 + 4} 个控件，CPU核数: {cores}")
+        print(f"{'进程数':>6} {'耗时(ms)':>10} {'加速比':>8}")
+        baseline = None
+        jobs = 1
+        while True:
+            start = time.perf_counter()
+            reports = list(compile_files(files, jobs))
+            elapsed = (time.perf_counter() - start) * 1000
+            assert all(not report.diagnostics for report in reports)
+            baseline = baseline or elapsed
+            print(f"{jobs:>6} {elapsed:>10.0f} {baseline / elapsed:>8.2f}")
+            if jobs >= cores:
+                break
+            jobs = min(jobs * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""组件基准：同一个表单行重复 N 次，比较三种写法的编译耗时
+
+    内联      每一行直接写出全部元素
+    展开      先把组件实例展开为元素树再编译（相当于文本宏替换）
+    组件      compile_document 按缓存的组件模板实例化
+
+组件模板中不引用参数的元素只编译一次，实例化时复制指令。不需要图形界面。
+"""
+import time
+
+from markup.components import LIBRARY
+from markup.plan import compile_document, parse_markup
+
+COUNTS = (100, 1000, 5000)
+REPEAT = 5
+
+COMPONENT = '''<component name="row" params="index, label, width=30">
+    <frame layout="grid" cols="3" colweights="0,1,0" padx="3" pady="3">
+        <label text="{label}" font="Arial 10 bold" row="0" col="0" />
+        <entry id="field_{index}" bind="form.f{index}" width="{width}" row="0" col="1" />
+        <button text="清除" command="clear_field" row="0" col="2" />
+        <label text="必填项，不超过30个字符" foreground="gray" row="1" col="1" />
+    </frame>
+</component>'''
+
+
+def inline_row(index):
+    return (f'<frame layout="grid" cols="3" colweights="0,1,0" padx="3" pady="3">'
+            f'<label text="字段{index}：" font="Arial 10 bold" row="0" col="0" />'
+            f'<entry id="field_{index}" bind="form.f{index}" width="30" row="0" col="1" />'
+            f'<button text="清除" command="clear_field" row="0" col="2" />'
+            f'<label text="必填项，不超过30个字符" foreground="gray" row="1" col="1" />'
+            f'</frame>')
+
+
+def best(function):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+
+def main():
+    print(f"{'实例数':>6} {'内联(ms)':>10} {'展开(ms)':>10} {'组件(ms)':>10} {'加速比':>8}")
+    for count in COUNTS:
+        inline = parse_markup("<window>" + "".join(map(inline_row, range(count))) + "</window>")
+        document = parse_markup("<window>" + COMPONENT + "".join(
+            f'<row index="{index}" label="字段{index}：" />' for index in range(count)) + "</window>")
+
+        inline_ms, expected = best(lambda: compile_document(inline))
+        expand_ms, _ = best(lambda: compile_document(LIBRARY.scope(document).expand_document(document)))
+        component_ms, plan = best(lambda: compile_document(document))
+        assert [tuple(i) for i in plan.instructions] == [tuple(i) for i in expected.instructions]
+        print(f"{count:>6} {inline_ms:>10.1f} {expand_ms:>10.1f} {component_ms:>10.1f} "
+              f"{inline_ms / component_ms:>8.2f}")
+    print(f"模板编译 {LIBRARY.builds} 次，命中 {LIBRARY.hits} 次")
+
+
+if __name__ == "__main__":
+    main()
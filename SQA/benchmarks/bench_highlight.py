@@ -0,0 +1,92 @@
+"""语法高亮基准：在 1k/10k/50k 行的缓冲区中间逐字输入，比较每次按键的分析耗时
+
+增量方式只重新分析改动的行（LineCache），与 SyntaxHighlighter 一样每次按键最多
+分析 BUDGET_MS 毫秒：输入未闭合的注释时行末状态会一直向后传播，超出预算的部分
+留给空闲时处理，不计入按键耗时。整体方式每次按键重新分析整个缓冲区，相当于朴素的
+全文 tag_add。只测词法分析，着色时每次按键只涉及改动的行，Tk调用次数与文件大小无关。
+不需要图形界面。
+"""
+import statistics
+import time
+
+from markup.highlight import LineCache, lex_line, TEXT
+
+SIZES = (1000, 10000, 50000)
+TYPED = '<label text="新字段" font="Arial 10"/>\n' * 3
+NAIVE_KEYSTROKES = 5
+BUDGET_MS = 8
+
+
+def make_buffer(lines):
+    result = ['<window title="生成的界面">']
+    for i in range(lines - 2):
+        if i % 10 == 0:
+            result.append('    <frame layout="grid" cols="2">')
+        elif i % 10 == 9:
+            result.append('    </frame>')
+        else:
+            result.append(f'        <label text="字段{i}："/><entry id="f{i}" width="30"/>')
+    result.append('</window>')
+    return result
+
+
+def type_text(lines, on_key):
+    """在缓冲区中间逐字输入 TYPED，每次按键后调用 on_key(改动行, 新增行数)，返回各次耗时（微秒）"""
+    row = len(lines) // 2
+    column = 0
+    times = []
+    for char in TYPED:
+        start = time.perf_counter()
+        line = lines[row]
+        if char == "\n":
+            lines[row:row + 1] = [line[:column], line[column:]]
+            on_key(row, 1)
+            row, column = row + 1, 0
+        else:
+            lines[row] = line[:column] + char + line[column:]
+            on_key(row, 0)
+            column += 1
+        times.append((time.perf_counter() - start) * 1e6)
+    return times
+
+
+def incremental(lines):
+    cache = LineCache()
+    get_lines = lambda first, last: lines[first:last]
+    start = time.perf_counter()
+    cache.relex(get_lines, len(lines))
+    initial = (time.perf_counter() - start) * 1000
+
+    def on_key(row, added):
+        cache.edit(row, 0, added)
+        cache.relex(get_lines, len(lines), deadline=time.perf_counter() + BUDGET_MS / 1000)
+
+    return initial, type_text(lines, on_key)
+
+
+def naive(lines):
+    def on_key(row, added):
+        state = TEXT
+        for line in lines:
+            _, state, _ = lex_line(line, state)
+
+    global TYPED
+    typed, TYPED = TYPED, TYPED[:NAIVE_KEYSTROKES]
+    try:
+        return type_text(lines, on_key)
+    finally:
+        TYPED = typed
+
+
+def main():
+    print(f"每个缓冲区输入 {len(TYPED)} 个字符（整体方式只测 {NAIVE_KEYSTROKES} 次按键）")
+    print(f"{'行数':>6} {'首次分析(ms)':>12} {'增量中位(us)':>12} {'增量最大(us)':>12} {'整体中位(us)':>12}")
+    for size in SIZES:
+        initial, times = incremental(make_buffer(size))
+        naive_times = naive(make_buffer(size))
+        print(f"{size:>6} {initial:>12.1f} {statistics.median(times):>12.1f} "
+              f"{max(times):>12.1f} {statistics.median(naive_times):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""图片基准：渲染含 COUNT 个 <image> 的仪表盘（DISTINCT 个不同的图片文件），比较
+
+    同步解码  每个控件在主线程中 tk.PhotoImage(file=...) 读取并解码
+    ImageView 首次渲染：后台解码，先显示占位图
+    ImageView 再次渲染：全部命中解码缓存
+
+给出主线程创建全部控件的耗时、全部图片显示完成的耗时和缓存的内存占用。
+测试图片为生成的PPM文件，不依赖 Pillow。需要图形界面。
+"""
+import os
+import tempfile
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from markup.images import ImageCache, ImageView
+
+COUNT = 400
+DISTINCT = 40
+SIZE = 256
+THUMBNAIL = 64
+
+
+def write_images(directory):
+    paths = []
+    for index in range(DISTINCT):
+        path = os.path.join(directory, f"image_{index}.ppm")
+        pixel = bytes(((index * 37) % 256, (index * 91) % 256, (index * 53) % 256))
+        with open(path, "wb") as file:
+            file.write(f"P6 {SIZE} {SIZE} 255\n".encode("ascii") + pixel * (SIZE * SIZE))
+        paths.append(path)
+    return paths
+
+
+def pump(root, done):
+    """处理事件直到 done() 为真"""
+    while not done():
+        root.update()
+
+
+def synchronous(root, paths):
+    frame = ttk.Frame(root)
+    frame.pack()
+    start = time.perf_counter()
+    for index in range(COUNT):
+        photo = tk.PhotoImage(master=frame, file=paths[index % DISTINCT])
+        photo = photo.subsample(max(1, SIZE // THUMBNAIL))
+        label = ttk.Label(frame, image=photo)
+        label.photo = photo
+        label.grid(row=index // 20, column=index % 20)
+    root.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    frame.destroy()
+    return elapsed, elapsed
+
+
+def with_cache(root, paths, cache):
+    frame = ttk.Frame(root)
+    frame.pack()
+    start = time.perf_counter()
+    views = []
+    for index in range(COUNT):
+        view = ImageView(frame, src=paths[index % DISTINCT], width=THUMBNAIL, height=THUMBNAIL, cache=cache)
+        view.grid(row=index // 20, column=index % 20)
+        views.append(view)
+    created = (time.perf_counter() - start) * 1000
+    pump(root, lambda: all(view.photo is not None and view.cget("text") == "" for view in views))
+    loaded = (time.perf_counter() - start) * 1000
+    frame.destroy()
+    return created, loaded
+
+
+def main():
+    root = tk.Tk()
+    cache = ImageCache(max_bytes=16 << 20)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_images(directory)
+        print(f"{COUNT}个图片控件，{DISTINCT}个文件，{SIZE}x{SIZE} 缩小到 {THUMBNAIL}x{THUMBNAIL}")
+        print(f"{'方式':<16} {'创建控件(ms)':>12} {'显示完成(ms)':>12}")
+        for name, run in (("同步解码", lambda: synchronous(root, paths)),
+                          ("ImageView 首次", lambda: with_cache(root, paths, cache)),
+                          ("ImageView 再次", lambda: with_cache(root, paths, cache))):
+            created, loaded = run()
+            print(f"{name:<16} {created:>12.1f} {loaded:>12.1f}")
+        stats = cache.stats()
+        print(f"缓存: {stats['images']}张，{stats['memory'] / 1024:.0f}KB / {stats['max_bytes'] / 1024:.0f}KB，"
+              f"命中{stats['hits']}次，解码{stats['decoded']}次")
+    cache.shutdown()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
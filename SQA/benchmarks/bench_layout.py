@@ -0,0 +1,82 @@
+"""布局基准：同一张表单分别用逐行嵌套的 frame（pack）和单个网格 frame 实现
+
+表单有 ROWS 行，每行一个 label 和一个 entry。比较控件数、按渲染计划创建控件的耗时，
+以及随后第一次布局计算（update_idletasks）的耗时。需要图形界面。
+"""
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from markup.plan import compile_markup, execute_plan
+
+ROWS = 300
+REPEAT = 5
+
+
+def nested_form(rows):
+    """每行一个水平排列的 frame"""
+    lines = ['<window>', '<frame>']
+    for i in range(rows):
+        lines.append(f'<frame layout="horizontal"><label text="字段{i}："/>'
+                     f'<entry id="field_{i}" width="30"/></frame>')
+    lines.extend(['</frame>', '</window>'])
+    return "\n".join(lines)
+
+
+def grid_form(rows):
+    """全部行放在同一个两列的网格 frame 中"""
+    lines = ['<window>', '<frame layout="grid" cols="2" colweights="0,1">']
+    for i in range(rows):
+        lines.append(f'<label text="字段{i}："/><entry id="field_{i}" width="30"/>')
+    lines.extend(['</frame>', '</window>'])
+    return "\n".join(lines)
+
+
+class _Renderer:
+    def __init__(self):
+        self.widgets = {}
+        self.variables = {}
+        self.data_sources = {}
+
+    def get_command_handler(self, name):
+        return None
+
+
+def measure(root, markup_text):
+    """返回 (控件数, 创建耗时中位数, 布局耗时中位数)，单位毫秒"""
+    plan = compile_markup(markup_text)
+    build_times = []
+    layout_times = []
+    for _ in range(REPEAT):
+        container = ttk.Frame(root)
+        container.pack(fill=tk.BOTH, expand=True)
+        start = time.perf_counter()
+        execute_plan(plan, container, _Renderer())
+        built = time.perf_counter()
+        root.update_idletasks()
+        build_times.append((built - start) * 1000)
+        layout_times.append((time.perf_counter() - built) * 1000)
+        container.destroy()
+    return len(plan.instructions), statistics.median(build_times), statistics.median(layout_times)
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建Tk窗口（需要图形界面）：{e}")
+        sys.exit(1)
+    root.geometry("600x400")
+
+    print(f"表单行数: {ROWS}")
+    print(f"{'布局':<10} {'控件数':>8} {'创建(ms)':>10} {'布局计算(ms)':>14}")
+    for name, markup_text in (("嵌套pack", nested_form(ROWS)), ("网格", grid_form(ROWS))):
+        widgets, build, layout = measure(root, markup_text)
+        print(f"{name:<10} {widgets:>8} {build:>10.1f} {layout:>14.1f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""实时预览基准：在500个元素的文档上回放一段录制的输入过程
+
+每次按键后直接调用实时预览回调并刷新界面，统计从按键到预览更新的耗时
+（处理耗时 + 防抖延迟），检查是否在 50 ms 的预算之内。需要图形界面。
+"""
+import statistics
+import sys
+import time
+import tkinter as tk
+
+from benchmarks.generate import generate_markup
+from example1 import MarkupRenderer
+
+DOCUMENT_SIZE = 500
+BUDGET_MS = 50
+
+# 录制的输入过程：(定位文本, 操作, 内容)
+#   type      在定位文本之后逐字输入
+#   backspace 在定位文本之后逐个删除前面的字符，内容为删除的字符数
+SESSION = [
+    ('<label text="字段80', 'type', '（必填）'),
+    ('<label text="字段80（必填）', 'backspace', 4),
+    ('<entry id="field_120" width="3', 'type', '5'),
+    ('<label text="字段121："', 'type', ' padx="4"'),
+    ('<label text="字段121：" padx="4"', 'backspace', 9),
+    ('<label text="字段160', 'type', '（选填）'),
+]
+
+
+def keystrokes(text):
+    """把录制的输入过程展开为逐次按键后的 (光标位置, 插入文本, 删除字符数)"""
+    for anchor, action, content in SESSION:
+        position = text.index(anchor) + len(anchor)
+        if action == 'type':
+            for char in content:
+                yield position, char, 0
+                text = text[:position] + char + text[position:]
+                position += 1
+        else:
+            for _ in range(content):
+                yield position, '', 1
+                text = text[:position - 1] + text[position:]
+                position -= 1
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建Tk窗口（需要图形界面）：{e}")
+        sys.exit(1)
+    root.withdraw()
+
+    renderer = MarkupRenderer(root)
+    renderer.chunked_var.set(False)
+    text = generate_markup(DOCUMENT_SIZE)
+    editor = renderer.code_editor
+    editor.delete("1.0", tk.END)
+    editor.insert("1.0", text)
+
+    # 初始完整渲染
+    renderer.pending_code = text
+    renderer.apply_plan(renderer.plan_cache.get(text))
+    root.update_idletasks()
+
+    delay = renderer.live_preview.delay_ms
+    latencies = []
+    subtree_updates = 0
+    for position, inserted, deleted in keystrokes(text):
+        if inserted:
+            editor.insert(f"1.0+{position}c", inserted)
+        else:
+            editor.delete(f"1.0+{position - deleted}c", f"1.0+{position}c")
+        start = time.perf_counter()
+        renderer.on_live_change()
+        root.update_idletasks()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if renderer.status_label.cget("text").startswith("实时预览"):
+            subtree_updates += 1
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"文档元素数: {DOCUMENT_SIZE}，按键数: {len(latencies)}，"
+          f"子树更新: {subtree_updates}")
+    print(f"处理耗时 中位数 {statistics.median(latencies):.2f} ms，"
+          f"P95 {p95:.2f} ms，最大 {latencies[-1]:.2f} ms")
+    worst = latencies[-1] + delay
+    verdict = "达标" if worst < BUDGET_MS else "未达标"
+    print(f"按键到预览（含 {delay} ms 防抖）最坏 {worst:.2f} ms，预算 {BUDGET_MS} ms：{verdict}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""MarkupParser.parse 的解析耗时基准
+
+在 1k/10k/100k 个元素的文档上分别计时，输出每个元素的平均耗时和峰值内存；
+单遍分词器下每元素耗时应基本保持不变，即总耗时随文档规模线性增长。
+"""
+import time
+import tracemalloc
+
+from example import MarkupParser
+from benchmarks.generate import generate_markup
+
+SIZES = (1000, 10000, 100000)
+
+
+def count_elements(element):
+    """统计树中的元素个数"""
+    return 1 + sum(count_elements(child) for child in element)
+
+
+def bench(size, repeat=3):
+    """返回 (元素个数, 最佳耗时秒数, 峰值内存字节)"""
+    markup_text = generate_markup(size)
+    parser = MarkupParser()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        root = parser.parse(markup_text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    parser.parse(markup_text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return count_elements(root), best, peak
+
+
+def main():
+    print(f"{'元素数':>10} {'耗时(ms)':>10} {'每元素(us)':>12} {'峰值内存(KB)':>14}")
+    for size in SIZES:
+        elements, elapsed, peak = bench(size)
+        print(f"{elements:>10} {elapsed * 1000:>10.1f} "
+              f"{elapsed / elements * 1e6:>12.2f} {peak / 1024:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""解析与渲染基准：在合成文档上分阶段计时，以JSON输出结果
+
+阶段：
+    parse           example.MarkupParser.parse
+    render          example.MarkupParser.render
+    render_element  example1.MarkupRenderer.render_element
+
+渲染阶段在隐藏的 Tk() 根窗口中进行，没有图形界面时可加 --xvfb 启动虚拟显示。
+指定 --baseline 时与之前保存的结果比较，耗时增长超过 --threshold 的阶段视为退化，
+以退出码1结束，便于在不同版本之间对比。--profile 时附带各标签的统计。
+
+    python -m benchmarks.bench_render --depth 4 --width 8 --output result.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from benchmarks.generate import DEFAULT_TAG_MIX, generate_document, parse_tag_mix
+from example import MarkupParser
+from markup.plan import parse_markup
+from markup.profile import RenderProfiler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """进程的峰值常驻内存（KB），平台不支持时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 上单位为字节
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def count_widgets(widget):
+    """统计 widget 的全部后代控件数"""
+    children = widget.winfo_children()
+    return len(children) + sum(count_widgets(child) for child in children)
+
+
+def start_xvfb(display=":99"):
+    """没有图形界面时启动 Xvfb，返回进程对象；不需要或无法启动时返回None"""
+    if os.environ.get("DISPLAY") or shutil.which("Xvfb") is None:
+        return None
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    return process
+
+
+def timed(func, repeat):
+    """执行 repeat 次，返回 (各次耗时毫秒列表, 最后一次的返回值)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return times, result
+
+
+def summarize(times, **extra):
+    """一个阶段的统计结果"""
+    result = {
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "max_ms": round(max(times), 3),
+        "runs": len(times),
+    }
+    result.update(extra)
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def bench_parse(markup_text, repeat):
+    parser = MarkupParser()
+    times, _ = timed(lambda: parser.parse(markup_text), repeat)
+    return summarize(times)
+
+
+def profile_stats(profiler):
+    """最后一次渲染的各标签统计"""
+    if profiler is None:
+        return {}
+    return {"profile": profiler.finish()}
+
+
+def bench_render(root, markup_text, repeat, profiler=None):
+    """MarkupParser.render：每次渲染到新的容器中，计时包括布局计算"""
+    parser = MarkupParser()
+    parser.profiler = profiler
+    element = parser.parse(markup_text)
+    counts = []
+
+    def run():
+        if profiler is not None:
+            profiler.reset()
+        container = ttk.Frame(root)
+        parser.render(element, container)
+        root.update_idletasks()
+        counts.append(count_widgets(container))
+        return container
+
+    times = []
+    for _ in range(repeat):
+        run_times, container = timed(run, 1)
+        times.extend(run_times)
+        stats = profile_stats(profiler)
+        container.destroy()
+    return summarize(times, widgets=counts[-1], **stats)
+
+
+def bench_render_element(root, markup_text, repeat, profiler=None):
+    """MarkupRenderer.render_element：不经过渲染计划和控件池，逐元素创建控件"""
+    from example1 import MarkupRenderer
+
+    host = tk.Toplevel(root)
+    host.withdraw()
+    renderer = MarkupRenderer(host)
+    renderer.profiler = profiler
+    element = parse_markup(markup_text)
+    counts = []
+
+    def run():
+        if profiler is not None:
+            profiler.reset()
+        container = ttk.Frame(renderer.preview_frame)
+        container.pack()
+        renderer.widgets = {}
+        renderer.render_element(element, container)
+        root.update_idletasks()
+        counts.append(count_widgets(container))
+        return container
+
+    times = []
+    for _ in range(repeat):
+        run_times, container = timed(run, 1)
+        times.extend(run_times)
+        stats = profile_stats(profiler)
+        container.destroy()
+    host.destroy()
+    return summarize(times, widgets=counts[-1], **stats)
+
+
+def compare(result, baseline, threshold):
+    """返回耗时增长超过 threshold（比例）的阶段及其增长比例"""
+    regressions = {}
+    for phase, stats in result["phases"].items():
+        old = baseline.get("phases", {}).get(phase)
+        if not old or "median_ms" not in old or "median_ms" not in stats:
+            continue
+        ratio = stats["median_ms"] / max(old["median_ms"], 1e-9) - 1
+        if ratio > threshold:
+            regressions[phase] = round(ratio, 3)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="标记语言解析与渲染基准")
+    parser.add_argument("--depth", type=int, default=3, help="frame 嵌套深度")
+    parser.add_argument("--width", type=int, default=8, help="每个容器的子元素个数")
+    parser.add_argument("--tags", default=None,
+                        help="标签权重，如 label=4,entry=2,frame=2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true",
+                        help="附带各标签的耗时、控件数和Tk调用次数（会增加渲染耗时）")
+    parser.add_argument("--xvfb", action="store_true", help="没有图形界面时启动 Xvfb")
+    parser.add_argument("--output", help="结果写入文件，默认输出到标准输出")
+    parser.add_argument("--baseline", help="用于比较的历史结果文件")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="中位耗时增长超过该比例视为退化")
+    args = parser.parse_args(argv)
+
+    tag_mix = parse_tag_mix(args.tags) if args.tags else DEFAULT_TAG_MIX
+    markup_text, elements = generate_document(args.depth, args.width, tag_mix, args.seed)
+
+    result = {
+        "python": platform.python_version(),
+        "tk": tk.TkVersion,
+        "document": {"depth": args.depth, "width": args.width, "tags": tag_mix,
+                     "seed": args.seed, "elements": elements,
+                     "characters": len(markup_text)},
+        "phases": {},
+    }
+    result["phases"]["parse"] = bench_parse(markup_text, args.repeat)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        root = None
+        for phase in ("render", "render_element"):
+            result["phases"][phase] = {"error": f"无法创建Tk窗口：{e}"}
+    if root is not None:
+        root.withdraw()
+        profiler = None
+        if args.profile:
+            profiler = RenderProfiler()
+            profiler.install(root)
+        result["phases"]["render"] = bench_render(root, markup_text, args.repeat, profiler)
+        result["phases"]["render_element"] = bench_render_element(root, markup_text,
+                                                                  args.repeat, profiler)
+        root.destroy()
+    if xvfb is not None:
+        xvfb.terminate()
+
+    result["peak_rss_kb"] = peak_rss_kb()
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        result["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
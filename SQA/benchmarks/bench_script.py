@@ -0,0 +1,97 @@
+"""Tcl脚本后端基准：同一渲染计划分别逐个控件创建（execute_plan）和按子树生成脚本创建（execute_script）
+
+表单有 ROWS 行，每行一个 frame，内含 label、entry 和 button，分成 GROUPS 个顶层 frame。
+比较创建耗时中位数，以及 Python→Tcl 调用次数（tk.call 与 tk.eval 合计）。需要图形界面。
+"""
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from markup.plan import compile_markup, execute_plan
+from markup.tclscript import execute_script
+
+ROWS = 600
+GROUPS = 20
+REPEAT = 5
+
+
+def form(rows, groups):
+    lines = ['<window>']
+    per_group = rows // groups
+    for group in range(groups):
+        lines.append('<frame>')
+        for i in range(group * per_group, (group + 1) * per_group):
+            lines.append(f'<frame layout="horizontal"><label text="字段{i}：" font="Arial 10"/>'
+                         f'<entry width="30"/><button text="清除" command="clear"/></frame>')
+        lines.append('</frame>')
+    lines.append('</window>')
+    return "\n".join(lines)
+
+
+class _Counter:
+    """统计 call() 和 eval() 次数的 tkapp 代理"""
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tkapp.call(*args)
+
+    def eval(self, script):
+        self.calls += 1
+        return self._tkapp.eval(script)
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+class _Renderer:
+    def __init__(self):
+        self.widgets = {}
+        self.variables = {}
+        self.data_sources = {}
+
+    def get_command_handler(self, name):
+        return lambda: None
+
+
+def measure(root, plan, execute):
+    """返回 (创建耗时中位数毫秒, Tcl调用次数)"""
+    times = []
+    calls = 0
+    for _ in range(REPEAT):
+        host = ttk.Frame(root)
+        host.pack(fill=tk.BOTH, expand=True)
+        counter = _Counter(host.tk)
+        host.tk = counter
+        start = time.perf_counter()
+        execute(plan, host, _Renderer())
+        times.append((time.perf_counter() - start) * 1000)
+        calls = counter.calls
+        host.tk = counter._tkapp
+        host.destroy()
+        root.update_idletasks()
+    return statistics.median(times), calls
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建Tk窗口（需要图形界面）：{e}")
+        sys.exit(1)
+    plan = compile_markup(form(ROWS, GROUPS))
+    print(f"控件数: {len(plan.instructions)}，顶层子树: {GROUPS}")
+    print(f"{'后端':<10} {'创建(ms)':>10} {'Tcl调用次数':>12}")
+    for name, execute in (("逐个控件", execute_plan), ("Tcl脚本", execute_script)):
+        elapsed, calls = measure(root, plan, execute)
+        print(f"{name:<10} {elapsed:>10.1f} {calls:>12}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""冷启动基准：50 个界面在无缓存与磁盘缓存命中两种情况下的加载耗时
+
+温启动在独立的子进程中测量，与真实的进程重启一致。
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import generate_markup
+from markup.diskcache import DiskPlanCache
+from markup.plan import compile_markup
+
+SCREEN_COUNT = 50
+SCREEN_SIZE = 600
+
+
+def write_screens(directory):
+    """生成界面文件，返回文件路径列表"""
+    paths = []
+    for i in range(SCREEN_COUNT):
+        path = os.path.join(directory, f"screen_{i}.markup")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generate_markup(SCREEN_SIZE + i))
+        paths.append(path)
+    return paths
+
+
+def read_screens(paths):
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def load_cold(paths):
+    """不使用缓存，逐个解析编译"""
+    start = time.perf_counter()
+    for text in read_screens(paths):
+        compile_markup(text)
+    return time.perf_counter() - start
+
+
+def load_warm(paths, cache_dir):
+    """新建磁盘缓存对象并读取全部界面，返回 (耗时, 命中数)"""
+    start = time.perf_counter()
+    cache = DiskPlanCache(cache_dir)
+    for text in read_screens(paths):
+        cache.get(text)
+    return time.perf_counter() - start, cache.hits
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--warm":
+        # 子进程：只测量温启动
+        cache_dir, paths = sys.argv[2], sys.argv[3:]
+        elapsed, hits = load_warm(paths, cache_dir)
+        print(f"{elapsed:.6f} {hits}")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_screens(directory)
+        cache_dir = os.path.join(directory, "cache")
+
+        cold = load_cold(paths)
+        # 第一次运行填充磁盘缓存
+        load_warm(paths, cache_dir)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--warm", cache_dir, *paths],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        warm, hits = float(output[0]), int(output[1])
+
+    print(f"界面数: {SCREEN_COUNT}")
+    print(f"无缓存解析编译: {cold * 1000:.1f} ms")
+    print(f"磁盘缓存命中:   {warm * 1000:.1f} ms（命中 {hits}/{SCREEN_COUNT}）")
+    print(f"加速比: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
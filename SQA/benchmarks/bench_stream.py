@@ -0,0 +1,71 @@
+"""流式渲染基准：生成一个大标记文件，比较整体解析编译与按顶层子树流式解析编译
+
+整体方式先把文件读成字符串，再构造完整的文档树和渲染计划；流式方式分块读取，
+每个顶层子树闭合后立即编译并释放。统计耗时和 tracemalloc 记录的内存峰值
+（tracemalloc 本身会使耗时变长，两种方式同样受影响）。只测解析和编译，不需要图形界面。
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from markup.node import PARSE_CHUNK_SIZE
+from markup.plan import compile_markup
+from markup.stream import SubtreeBuilder, compile_fragment
+
+ROWS = 20000
+
+
+def write_report(path, rows):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<window title="报表">\n')
+        for i in range(rows):
+            file.write(f'<frame layout="horizontal"><label text="第{i}行："/>'
+                       f'<entry id="field_{i}" width="30"/><button text="详情" command="show_{i}"/></frame>\n')
+        file.write('</window>\n')
+
+
+def whole(path):
+    with open(path, encoding="utf-8") as file:
+        return len(compile_markup(file.read()).instructions)
+
+
+def streamed(path):
+    count = [0]
+
+    def on_subtree(node):
+        count[0] += len(compile_fragment(node).instructions)
+
+    parser = ET.XMLParser(target=SubtreeBuilder(lambda node: None, on_subtree))
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(PARSE_CHUNK_SIZE), b""):
+            parser.feed(chunk)
+    parser.close()
+    return count[0]
+
+
+def measure(func, path):
+    """返回 (指令数, 耗时毫秒, 内存峰值MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    instructions = func(path)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return instructions, elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.xml")
+        write_report(path, ROWS)
+        print(f"行数: {ROWS}，文件大小: {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+        print(f"{'方式':<6} {'指令数':>8} {'耗时(ms)':>10} {'内存峰值(MB)':>14}")
+        for name, func in (("整体", whole), ("流式", streamed)):
+            instructions, elapsed, peak = measure(func, path)
+            print(f"{name:<6} {instructions:>8} {elapsed:>10.1f} {peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""生成用于基准测试的合成标记文档"""
+import random
+
+# 默认标签权重：frame 为容器，其余为叶子控件
+DEFAULT_TAG_MIX = {
+    'frame': 2,
+    'label': 4,
+    'entry': 2,
+    'button': 1,
+    'checkbox': 1,
+    'radio': 1,
+    'combobox': 1,
+    'separator': 1,
+}
+
+
+def generate_markup(element_count):
+    """生成大约包含 element_count 个元素的表单文档"""
+    rows = max(1, element_count // 3)
+    lines = ['<window title="基准测试" width="400" height="300">']
+    for i in range(rows):
+        lines.append('    <frame layout="horizontal" padx="3" pady="3">')
+        lines.append(f'        <label text="字段{i}：" />')
+        lines.append(f'        <entry id="field_{i}" width="30" />')
+        lines.append('    </frame>')
+    lines.append('</window>')
+    return '\n'.join(lines)
+
+
+def parse_tag_mix(spec):
+    """解析 "label=4,entry=2,frame=1" 形式的标签权重"""
+    mix = {}
+    for item in spec.split(','):
+        tag, _, weight = item.partition('=')
+        mix[tag.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def _leaf(tag, number):
+    """生成一个叶子元素的标签文本"""
+    if tag == 'label':
+        return f'<label text="标签{number}" />'
+    if tag == 'entry':
+        return f'<entry id="entry_{number}" width="20" />'
+    if tag == 'button':
+        return f'<button text="按钮{number}" command="show_message" />'
+    if tag == 'checkbox':
+        return f'<checkbox text="选项{number}" variable="check_{number}" />'
+    if tag == 'radio':
+        return f'<radio text="单选{number}" variable="group_{number // 4}" value="{number}" />'
+    if tag == 'combobox':
+        return f'<combobox id="combo_{number}" values="甲,乙,丙" width="10" />'
+    if tag == 'text':
+        return f'<text id="text_{number}" width="30" height="3" />'
+    if tag == 'separator':
+        return '<separator orient="horizontal" />'
+    return f'<{tag} />'
+
+
+def generate_document(depth=3, width=6, tag_mix=None, seed=0):
+    """生成frame嵌套深度为 depth、每个容器有 width 个子元素的文档
+
+    每个容器中 frame 的个数按 tag_mix 中的权重占比确定（未到最大深度时至少一个），
+    其余叶子元素的标签按权重随机选取；相同参数总是生成相同的文档。
+    返回 (标记文本, 元素个数)。
+    """
+    mix = dict(tag_mix or DEFAULT_TAG_MIX)
+    frame_weight = mix.pop('frame', 0)
+    tags = list(mix) or ['label']
+    weights = [mix[tag] for tag in tags] if mix else [1]
+    frames = 0
+    if frame_weight > 0:
+        frames = max(1, round(width * frame_weight / (frame_weight + sum(weights))))
+    rng = random.Random(seed)
+    lines = ['<window title="基准测试" width="400" height="300">']
+    count = 1
+
+    def container(level):
+        nonlocal count
+        indent = '    ' * level
+        nested = min(frames, width) if level <= depth else 0
+        children = ['frame'] * nested + rng.choices(tags, weights, k=width - nested)
+        rng.shuffle(children)
+        for tag in children:
+            count += 1
+            if tag == 'frame':
+                layout = rng.choice(('horizontal', 'vertical'))
+                lines.append(f'{indent}<frame layout="{layout}" padx="3" pady="3">')
+                container(level + 1)
+                lines.append(f'{indent}</frame>')
+            else:
+                lines.append(indent + _leaf(tag, count))
+
+    container(1)
+    lines.append('</window>')
+    return '\n'.join(lines), count
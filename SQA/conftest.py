@@ -0,0 +1,5 @@
+"""pytest 配置：测试从本目录导入 markup 和示例模块
+
+tests/ 下的测试都不需要图形界面，控件用桩对象代替，或只用 tkinter.Tcl() 解释器。
+运行：在本目录下执行 python -m pytest -q
+"""
@@ -1,7 +1,14 @@
+import logging
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-import re
-from xml.etree.ElementTree import Element, SubElement
+
+from markup.attrs import parse_font, parse_pad, shared_font, to_int
+from markup.images import ImageView
+from markup.layout import MANAGERS, arrange, configure_container, geometry
+from markup.node import NodeBuilder
+from markup.tokenizer import START, END, tokenize
+
+logger = logging.getLogger(__name__)
 
 class MarkupParser:
     """解析类似HTML的自定义标记语言"""
@@ -18,7 +25,9 @@ class MarkupParser:
             'checkbox': ttk.Checkbutton,
             'radio': ttk.Radiobutton,
             'combobox': ttk.Combobox,
-            'separator': ttk.Separator
+            'separator': ttk.Separator,
+            # 图片在后台解码，width、height 为像素尺寸
+            'image': ImageView
         }
         
         # 定义支持的属性 - 新增layout属性支持
@@ -35,9 +44,25 @@ class MarkupParser:
             'values': None,
             'orient': 'orient',
             'title': None,
-            'layout': None,  # 新增：布局方式 horizontal/vertical
+            'layout': None,  # 新增：布局方式 horizontal/vertical/grid/constraint
             'padx': None,    # 新增：水平间距
-            'pady': None     # 新增：垂直间距
+            'pady': None,    # 新增：垂直间距
+            # 网格布局和约束布局，见 markup.layout
+            'cols': None,
+            'colweights': None,
+            'rowweights': None,
+            'row': None,
+            'col': None,
+            'span': None,
+            'rowspan': None,
+            'sticky': None,
+            'left': None,
+            'right': None,
+            'top': None,
+            'bottom': None,
+            'place_width': None,
+            'place_height': None,
+            'src': None      # 只有 image 标签使用，见 render()
         }
         
         # 存储解析后的元素
@@ -48,71 +73,53 @@ class MarkupParser:
         
         # 存储命令回调
         self.commands = {}
+        
+        # 性能分析（markup.profile.RenderProfiler），为None时不统计
+        self.profiler = None
 
     def parse(self, markup_text):
-        """解析标记文本并返回根元素"""
-        # 简单的标签提取正则表达式
-        tag_pattern = re.compile(r'<(\/?)(\w+)([^>]*?)>')
-        matches = list(tag_pattern.finditer(markup_text))
+        """解析标记文本并返回根元素（markup.node.Node）"""
+        builder = NodeBuilder()
         
-        if not matches:
-            return None
+        # 单遍扫描，逐个处理分词器产出的事件
+        for event in tokenize(markup_text):
+            kind = event[0]
             
-        # 创建根元素
-        root_tag = matches[0].group(2)
-        root_attrs = self._parse_attributes(matches[0].group(3))
-        root = Element(root_tag, root_attrs)
-        
-        # 使用栈来处理嵌套结构
-        stack = [root]
-        
-        # 处理文本内容
-        last_pos = matches[0].end()
-        
-        for i in range(1, len(matches)):
-            match = matches[i]
-            # 提取标签之间的文本
-            text_content = markup_text[last_pos:match.start()].strip()
-            if text_content and stack:
-                current = stack[-1]
-                current.text = text_content
-            
-            # 处理标签
-            closing = match.group(1) == '/'
-            tag = match.group(2)
-            attrs = self._parse_attributes(match.group(3))
-            
-            if closing:
-                # 关闭标签
-                if stack and stack[-1].tag == tag:
-                    stack.pop()
-            else:
+            if kind == START:
                 # 开始标签
-                if tag in self.supported_tags:
-                    element = SubElement(stack[-1], tag, attrs)
-                    stack.append(element)
-            
-            last_pos = match.end()
-        
-        return root
+                tag = event[1]
+                attrs = self._parse_attributes(event[2])
+                if builder.root is None:
+                    # 第一个标签作为根元素
+                    builder.start(tag, attrs)
+                elif builder.current is None:
+                    # 根元素已经闭合，忽略后续内容
+                    break
+                elif tag in self.supported_tags:
+                    builder.start(tag, attrs)
+            elif kind == END:
+                # 关闭标签
+                current = builder.current
+                if current is not None and current.tag == event[1]:
+                    builder.end(event[1])
+            elif builder.current is not None:
+                # 标签之间的文本
+                builder.data(event[1])
+        
+        return builder.close()
 
-    def _parse_attributes(self, attr_str):
-        """解析属性字符串为字典"""
-        attrs = {}
-        if not attr_str:
-            return attrs
-            
-        # 简单的属性解析正则表达式
-        attr_pattern = re.compile(r'(\w+)\s*=\s*["\'](.*?)["\']')
-        for name, value in attr_pattern.findall(attr_str):
-            if name in self.supported_attributes:
-                attrs[name] = value
-        
-        return attrs
+    def _parse_attributes(self, attrs):
+        """过滤出支持的属性"""
+        supported = self.supported_attributes
+        return {name: value for name, value in attrs.items() if name in supported}
 
-    def render(self, root_element, parent=None):
-        """将解析后的元素渲染为Tkinter组件"""
-        if not root_element:
+    def render(self, root_element, parent=None, managed=False):
+        """将解析后的元素渲染为Tkinter组件
+
+        managed 为True时由父容器负责布局（网格/约束布局的frame）。
+        """
+        # 叶子节点没有子节点，len() 为0，不能用真值判断
+        if root_element is None:
             return None
             
         tag = root_element.tag
@@ -121,6 +128,9 @@ class MarkupParser:
             
         # 获取属性
         attrs = root_element.attrib
+        profiler = self.profiler
+        if profiler is not None:
+            token = profiler.begin()
         
         # 创建组件
         component_class = self.supported_tags[tag]
@@ -129,12 +139,26 @@ class MarkupParser:
         kwargs = {}
         for attr, tk_attr in self.supported_attributes.items():
             if attr in attrs and tk_attr:
-                # 处理特殊类型的属性
-                if attr in ['width', 'height', 'padx', 'pady']:
-                    kwargs[tk_attr] = int(attrs[attr])
+                # 处理特殊类型的属性，相同的属性值只转换一次
+                if attr in ['width', 'height']:
+                    kwargs[tk_attr] = to_int(attrs[attr])
+                elif attr == 'font':
+                    try:
+                        font = parse_font(attrs[attr])
+                    except ValueError as e:
+                        # 字体写错时使用默认字体，不影响其余部分的渲染
+                        logger.warning("<%s> %s", tag, e)
+                        font = None
+                    if font is not None:
+                        # 相同字体的组件共用一个Font对象
+                        kwargs[tk_attr] = shared_font(font, parent)
                 else:
                     kwargs[tk_attr] = attrs[attr]
         
+        # 图片路径只传给 image 标签，其他控件没有 src 参数
+        if tag == 'image' and 'src' in attrs:
+            kwargs['src'] = attrs['src']
+        
         # 处理命令
         if 'command' in attrs:
             cmd_name = attrs['command']
@@ -159,11 +183,15 @@ class MarkupParser:
         if tag == 'window':
             # 设置标题作为标签显示
             if 'title' in attrs:
-                title_label = ttk.Label(component, text=attrs['title'], font=('Arial', 12, 'bold'))
+                title_label = ttk.Label(component, text=attrs['title'],
+                                        font=shared_font(('Arial', 12, 'bold', 'roman'), component))
                 title_label.pack(pady=5)
             # 设置内部填充
             component.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
         
+        if profiler is not None:
+            profiler.end(token, tag, component, parent)
+        
         # 存储带有ID的组件
         if 'id' in attrs:
             self.elements[attrs['id']] = component
@@ -176,15 +204,29 @@ class MarkupParser:
         
         # 获取布局方式和间距
         layout = attrs.get('layout', 'vertical')  # 默认垂直布局
-        padx = int(attrs.get('padx', 5))         # 默认水平间距
-        pady = int(attrs.get('pady', 5))         # 默认垂直间距
+        padx = parse_pad(attrs.get('padx', 5))    # 默认水平间距
+        pady = parse_pad(attrs.get('pady', 5))    # 默认垂直间距
+        
+        # 网格/约束布局：先创建全部子元素，再一次算出位置并放置
+        if tag == 'frame' and layout in MANAGERS:
+            configure_container(component, attrs)
+            placed = []
+            for child in root_element:
+                child_component = self.render(child, component, managed=True)
+                if child_component is not None:
+                    placed.append((child.attrib, child_component))
+            manager, positions = arrange(attrs, [child_attrs for child_attrs, _ in placed])
+            padding = {'padx': padx, 'pady': pady}
+            for (_, child_component), position in zip(placed, positions):
+                getattr(child_component, manager)(**geometry(manager, position, padding))
+            return component
         
         # 渲染子元素 - 根据布局方式设置不同排列
         for child in root_element:
             child_component = self.render(child, component)
             
-            # 对frame的子元素进行特殊布局处理
-            if tag == 'frame':
+            # 对frame的子元素进行特殊布局处理（不支持的标签没有组件）
+            if tag == 'frame' and child_component is not None:
                 if layout == 'horizontal':
                     # 水平布局：左对齐，带间距
                     child_component.pack(side=tk.LEFT, padx=padx, pady=pady, anchor=tk.W)
@@ -193,7 +235,7 @@ class MarkupParser:
                     child_component.pack(fill=tk.X, padx=padx, pady=pady)
         
         # 非window和frame标签的布局
-        if tag not in ['window', 'frame']:
+        if tag not in ['window', 'frame'] and not managed:
             component.pack(fill=tk.X, padx=padx, pady=pady)
         
         return component
@@ -1,8 +1,31 @@
+import copy
+import functools
+import os
 import tkinter as tk
-from tkinter import scrolledtext, ttk, messagebox
-import xml.etree.ElementTree as ET
+from tkinter import filedialog, scrolledtext, ttk, messagebox
 from xml.etree.ElementTree import ParseError
 
+from markup.plan import (CONTAINER_TAGS, LAZY_TAGS, WIDGET_CLASSES, PlanCache, RenderNode,
+                         build_widget, compile_node, iter_plan,
+                         unload_node, with_placement)
+from markup.binding import Binder, Model
+from markup.commands import CommandRegistry
+from markup.layout import placements
+from markup.attrs import to_int
+from markup.pool import WidgetPool
+from markup.scheduler import ChunkedRender
+from markup.stream import StreamRender
+from markup.components import expand_markup
+from markup.template import compile_template_markup, is_template
+from markup.tclscript import iter_script
+from markup.diskcache import DiskPlanCache
+from markup.reconcile import Reconciler
+from markup.highlight import SyntaxHighlighter
+from markup.live import LiveDocument, LivePreview
+from markup.node import parse_nodes
+from markup.profile import HeatOverlay, RenderProfiler
+from markup.worker import BackgroundCompiler
+
 class MarkupRenderer:
     def __init__(self, root):
         self.root = root
@@ -35,6 +58,58 @@ class MarkupRenderer:
         self.widgets = {}
         self.variables = {}
         
+        # <list>/<table> 的 source 属性绑定的数据源
+        self.data_sources = {"numbers": range(1000000)}
+        
+        # bind 属性绑定的数据模型，同一轮事件中的修改合并为一次界面刷新
+        self.model = Model(schedule=self.root.after_idle)
+        self.binder = Binder(self.model, self.root)
+        
+        # 命令注册表只构建一次；async def 处理函数在异步事件循环中执行，不阻塞界面
+        self.commands = CommandRegistry(self.root, default=self.default_command)
+        self.commands.register("show_message", self.show_message)
+        self.commands.register("clear_text", self.clear_text)
+        self.commands.listeners.append(self.on_command_done)
+        
+        # 上次渲染的控件树，用于增量渲染比对
+        self.render_tree = None
+        self.reconciler = Reconciler(self)
+        
+        # 按标记文本哈希缓存的渲染计划，磁盘缓存保证重启后同样命中
+        self.plan_cache = PlanCache(disk_cache=DiskPlanCache())
+        # 含 for/if 指令的数据模板，编译一次，每次渲染按模型数据生成计划
+        self.template_cache = PlanCache(compile=compile_template_markup)
+        
+        # 控件回收池，清空预览时控件归还到池中供下次渲染复用
+        self.widget_pool = WidgetPool(WIDGET_CLASSES, caps={"ScrolledText": 16})
+        
+        # 分批渲染任务，再次渲染时取消未完成的批次
+        self.render_job = ChunkedRender(self.root, budget_ms=12,
+                                        on_progress=self.on_render_progress,
+                                        on_done=self.on_render_done,
+                                        on_error=self.on_render_error)
+        self.render_hits = 0
+        
+        # 流式渲染文件，边解析边渲染，文件再大内存占用也有上限
+        self.stream_job = StreamRender(self.root, budget_ms=12,
+                                       on_root=self.on_stream_root,
+                                       on_progress=self.on_stream_progress,
+                                       on_done=self.on_stream_done,
+                                       on_error=self.on_render_error)
+        
+        # 后台解析线程，解析和编译不阻塞界面，控件仍在主线程中创建
+        self.compiler = BackgroundCompiler(self.root)
+        
+        # 实时预览：防抖监听编辑器的修改，只重新渲染变化的顶层子树
+        self.live_preview = LivePreview(self.code_editor, self.on_live_change)
+        self.live_document = LiveDocument()
+        self.pending_code = None
+        self.quiet_errors = False
+        
+        # 性能分析，关闭时为None，渲染代码只做一次判断
+        self.profiler = None
+        self.heat_overlay = HeatOverlay(self.preview_frame)
+        
         # 初始渲染区域
         self.render_frame = None
         self.clear_preview()
@@ -48,6 +123,10 @@ class MarkupRenderer:
         )
         self.code_editor.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
+        # 增量语法高亮；Ctrl+单击标签所在的行折叠或展开其子树
+        self.highlighter = SyntaxHighlighter(self.code_editor)
+        self.code_editor.bind("<Control-Button-1>", self.toggle_fold)
+        
         # 示例代码
         example_code = """<window title="示例界面" width="400" height="300">
     <label text="欢迎使用自定义标记语言演示" font="Arial 14 bold" />
@@ -55,24 +134,24 @@ class MarkupRenderer:
     <label text="请输入您的信息：" />
     <frame layout="horizontal" padx="3" pady="3">
         <label text="姓名：" />
-        <entry id="name_entry" width="30" />
+        <entry id="name_entry" bind="form.name" width="30" />
     </frame>
     <frame layout="horizontal" padx="3" pady="3">
         <label text="性别：" />
-        <radio text="男" variable="gender" value="male" />
-        <radio text="女" variable="gender" value="female" />
+        <radio text="男" bind="form.gender" value="male" />
+        <radio text="女" bind="form.gender" value="female" />
     </frame>
     <frame layout="horizontal" padx="3" pady="3">
         <label text="爱好：" />
-        <checkbox text="阅读" variable="hobby_read" />
-        <checkbox text="运动" variable="hobby_sport" />
-        <checkbox text="编程" variable="hobby_code" />
+        <checkbox text="阅读" bind="form.hobbies.read" />
+        <checkbox text="运动" bind="form.hobbies.sport" />
+        <checkbox text="编程" bind="form.hobbies.code" />
     </frame>
     <frame layout="horizontal" padx="3" pady="3">
         <label text="职业：" />
-        <combobox id="job" values="学生,教师,工程师,医生,其他" width="20" />
+        <combobox id="job" bind="form.job" values="学生,教师,工程师,医生,其他" width="20" />
     </frame>
-    <text id="info_text" width="50" height="5" />
+    <text id="info_text" bind="form.info" width="50" height="5" />
     <frame layout="horizontal" padx="3" pady="3">
         <button text="显示信息" command="show_message" />
         <button text="清空文本" command="clear_text" />
@@ -87,10 +166,42 @@ class MarkupRenderer:
         
         ttk.Button(control_frame, text="渲染", command=self.render_markup).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="清空", command=self.clear_code).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="打开文件", command=self.open_file).pack(side=tk.LEFT, padx=5)
+        
+        # 增量渲染复选框
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="增量渲染", variable=self.incremental_var).pack(side=tk.LEFT, padx=5)
+        
+        # 分批渲染复选框
+        self.chunked_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(control_frame, text="分批渲染", variable=self.chunked_var).pack(side=tk.LEFT, padx=5)
+        
+        # 脚本渲染复选框，每个顶层子树生成一段Tcl脚本一次创建
+        self.script_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="脚本渲染", variable=self.script_var).pack(side=tk.LEFT, padx=5)
+        
+        # 实时预览复选框，停止输入后自动刷新预览
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="实时预览", variable=self.live_var,
+                        command=self.toggle_live_preview).pack(side=tk.LEFT, padx=5)
+        
+        # 性能分析复选框，统计各标签的渲染耗时并在预览区标出最慢的子树
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="性能分析", variable=self.profile_var,
+                        command=self.toggle_profiling).pack(side=tk.LEFT, padx=5)
         
         # 状态标签
         self.status_label = ttk.Label(control_frame, text="就绪")
         self.status_label.pack(side=tk.RIGHT, padx=5)
+        
+        # 渲染进度条
+        self.progress = ttk.Progressbar(control_frame, length=100, mode="determinate")
+        self.progress.pack(side=tk.RIGHT, padx=5)
+
+    def toggle_fold(self, event):
+        """折叠或展开单击位置所在行的标签子树"""
+        self.highlighter.toggle_fold(f"@{event.x},{event.y}")
+        return "break"
 
     def clear_code(self):
         """清空代码编辑区"""
@@ -99,7 +210,15 @@ class MarkupRenderer:
 
     def clear_preview(self):
         """清空预览区"""
-        # 销毁现有渲染内容
+        # 停止尚未完成的分批渲染，丢弃尚未交付的后台解析结果
+        self.render_job.cancel()
+        self.stream_job.cancel()
+        self.compiler.cancel()
+        self.heat_overlay.clear()
+        
+        # 已渲染的控件归还到控件池，再销毁现有渲染内容
+        if self.render_tree is not None:
+            self.widget_pool.release_tree(self.render_tree)
         if self.render_frame:
             self.render_frame.destroy()
             
@@ -110,219 +229,313 @@ class MarkupRenderer:
         # 重置变量和控件引用
         self.widgets = {}
         self.variables = {}
+        self.render_tree = None
+        self.live_document.update(None)
         
         ttk.Label(self.render_frame, text="渲染结果将显示在这里", foreground="gray").pack(pady=20)
 
-    def render_markup(self):
-        """解析并渲染标记语言"""
+    def render_markup(self, live=False):
+        """解析并渲染标记语言
+
+        解析和编译在后台线程中进行，完成后回到主线程创建控件；
+        解析出错时保留当前的预览内容。live 为True时总是增量渲染，出错时不弹窗。
+        """
+        # 取消上一次尚未完成的分批渲染
+        self.render_job.cancel()
+        self.progress.config(value=0)
+        
+        # 获取代码
+        markup_code = self.code_editor.get("1.0", tk.END).strip()
+        if not markup_code:
+            self.clear_preview()
+            self.status_label.config(text="错误：代码为空", foreground="red")
+            return
+        self.pending_code = markup_code
+        self.quiet_errors = live
+            
+        # 数据模板按模型数据的快照在后台生成渲染计划，模型只在主线程中读取
+        if is_template(markup_code):
+            self.compiler.submit(self.render_template, markup_code, copy.deepcopy(self.model.data),
+                                 on_done=self.apply_plan, on_error=self.on_render_error)
+        # 增量渲染模式下保留现有控件，只更新变化的部分；组件实例先展开为内置标签
+        elif (live or self.incremental_var.get()) and self.render_tree is not None:
+            self.compiler.submit(expand_markup, markup_code,
+                                 on_done=self.apply_element, on_error=self.on_render_error)
+        else:
+            # 获取渲染计划，相同的代码直接命中缓存，跳过解析和属性解释。
+            # 计划缓存只在唯一的后台线程中访问，无需加锁
+            self.compiler.submit(self.plan_cache.get, markup_code,
+                                 on_done=self.apply_plan, on_error=self.on_render_error)
+        self.status_label.config(text="解析中...", foreground="blue")
+
+    def render_template(self, markup_code, data):
+        """在后台线程中执行：取得编译好的数据模板，按数据生成渲染计划"""
+        return self.template_cache.get(markup_code).render(data)
+
+    def apply_element(self, root_element):
+        """后台解析完成后，在主线程中与上次的控件树比对并更新"""
+        try:
+            if self.profiler is not None:
+                self.profiler.reset()
+            stats = self.reconciler.reconcile(self.render_tree, root_element)
+            self.live_document.update(self.pending_code)
+            self.status_label.config(text=f"增量渲染成功：{stats.summary()}{self.show_profile()}",
+                                     foreground="green")
+        except Exception as e:
+            # 控件树可能只更新了一部分，下次改为完整渲染
+            self.render_tree = None
+            self.on_render_error(e)
+
+    def apply_plan(self, plan):
+        """后台编译完成后，在主线程中按渲染计划创建控件"""
         try:
             # 清空预览区
             self.clear_preview()
             
-            # 获取代码
-            markup_code = self.code_editor.get("1.0", tk.END).strip()
-            if not markup_code:
-                self.status_label.config(text="错误：代码为空", foreground="red")
-                return
-                
-            # 解析XML
-            root_element = ET.fromstring(markup_code)
-            
-            # 检查根元素是否为window
-            if root_element.tag != "window":
-                raise ValueError("根元素必须是window")
-                
             # 处理window属性
-            window_title = root_element.get("title", "自定义界面")
-            window_width = root_element.get("width", "400")
-            window_height = root_element.get("height", "300")
+            window_title = plan.attrs.get("title", "自定义界面")
+            window_width = to_int(plan.attrs.get("width", 400))
+            window_height = to_int(plan.attrs.get("height", 300))
             
             # 创建窗口容器
             window_frame = ttk.Frame(self.render_frame)
             window_frame.pack(fill=tk.BOTH, expand=True)
             window_frame.config(width=window_width, height=window_height)
             
-            # 递归渲染子元素
-            self.render_element(root_element, window_frame)
-            
-            self.status_label.config(text="渲染成功", foreground="green")
-            
+            # 按渲染计划创建控件，优先复用控件池中的控件
+            self.render_hits = self.widget_pool.hits
+            if self.profiler is not None:
+                self.profiler.reset()
+            if self.script_var.get():
+                # 每个顶层子树一次 tk.eval；不经过控件池，也不保留控件树，下次渲染为完整渲染
+                self.render_tree = None
+                total, steps = iter_script(plan, window_frame, self)
+            else:
+                self.render_tree, steps = iter_plan(plan, window_frame, self, pool=self.widget_pool,
+                                                    host=self.preview_frame, profiler=self.profiler)
+                total = len(plan.instructions)
+            self.live_document.update(self.pending_code)
+            if self.chunked_var.get():
+                # 分批执行，每批不超过时间预算，批次之间界面保持响应
+                self.render_job.start(steps, total)
+            else:
+                for _ in steps:
+                    pass
+                self.on_render_done()
+        except Exception as e:
+            self.render_tree = None
+            self.on_render_error(e)
+
+    def open_file(self):
+        """选择标记文件并流式渲染"""
+        path = filedialog.askopenfilename(title="打开标记文件",
+                                          filetypes=[("标记文件", "*.xml *.markup"), ("所有文件", "*.*")])
+        if path:
+            self.render_file(path)
+
+    def render_file(self, path):
+        """流式渲染标记文件
+
+        文件不载入编辑区，后台线程边读边解析，每个顶层元素解析完即创建控件并释放，
+        适合很大的生成文件。流式渲染的控件不经过控件池，也不参与增量渲染比对。
+        """
+        self.clear_preview()
+        self.quiet_errors = False
+        self.progress.config(value=0)
+        self.status_label.config(text=f"正在读取 {os.path.basename(path)}...", foreground="blue")
+        try:
+            self.stream_job.start(path, self)
+        except OSError as e:
+            self.on_render_error(e)
+
+    def on_stream_root(self, attrs):
+        """流式渲染读到根元素时创建窗口容器"""
+        window_frame = ttk.Frame(self.render_frame)
+        window_frame.pack(fill=tk.BOTH, expand=True)
+        window_frame.config(width=to_int(attrs.get("width", 400)),
+                            height=to_int(attrs.get("height", 300)))
+        return window_frame
+
+    def on_stream_progress(self, done, total):
+        """流式渲染的进度回调，按已读取的字节数计算"""
+        self.progress.config(value=done * 100 / max(total, 1))
+        self.status_label.config(text=f"流式渲染中 {done // 1024}/{total // 1024}KB，"
+                                      f"已创建控件{self.stream_job.widgets}个", foreground="blue")
+
+    def on_stream_done(self):
+        """流式渲染完成回调"""
+        self.status_label.config(text=f"流式渲染成功：{self.stream_job.subtrees}个顶层元素，"
+                                      f"{self.stream_job.widgets}个控件", foreground="green")
+
+    def toggle_live_preview(self):
+        """开启或关闭实时预览，开启时立即渲染一次"""
+        self.live_preview.set_enabled(self.live_var.get())
+        if self.live_var.get():
+            self.render_markup(live=True)
+
+    def on_live_change(self):
+        """停止输入后调用，编辑只落在一个顶层元素内时只重新解析和渲染该子树"""
+        markup_code = self.code_editor.get("1.0", tk.END).strip()
+        try:
+            located = self.live_document.locate(markup_code, self.render_tree)
         except ParseError as e:
-            self.status_label.config(text=f"XML解析错误: {str(e)}", foreground="red")
-            messagebox.showerror("解析错误", f"XML格式错误:\n{str(e)}")
+            try:
+                # 子树片段解析失败时整个文档仍可能是完整的
+                parse_nodes(markup_code)
+            except ParseError:
+                # 输入尚未完成，保留当前预览
+                self.status_label.config(text=f"XML解析错误: {str(e)}", foreground="red")
+                return
+            located = None
+        if located is None:
+            # 编辑跨越多个顶层元素或涉及根元素，整体比对
+            self.render_markup(live=True)
+            return
+        
+        # 丢弃后台线程中较早提交的解析结果
+        self.compiler.cancel()
+        index, element = located
+        if self.profiler is not None:
+            self.profiler.reset()
+        try:
+            stats = self.reconciler.reconcile_subtree(self.render_tree, index, element)
         except Exception as e:
+            # 控件树可能只更新了一部分，下次改为完整渲染
+            self.render_tree = None
+            self.live_document.update(None)
             self.status_label.config(text=f"错误: {str(e)}", foreground="red")
+            return
+        self.live_document.update(markup_code)
+        self.status_label.config(text=f"实时预览：{stats.summary()}{self.show_profile()}",
+                                 foreground="green")
+
+    def on_render_progress(self, done, total):
+        """分批渲染的进度回调"""
+        self.progress.config(value=done * 100 / max(total, 1))
+        self.status_label.config(text=f"渲染中 {done}/{total}", foreground="blue")
+
+    def on_render_done(self):
+        """渲染完成回调"""
+        reused = self.widget_pool.hits - self.render_hits
+        self.progress.config(value=100)
+        self.status_label.config(text=f"渲染成功（复用控件{reused}个）{self.show_profile()}",
+                                 foreground="green")
+
+    def toggle_profiling(self):
+        """开启或关闭性能分析，开启后从下一次渲染开始统计"""
+        if self.profile_var.get():
+            self.profiler = RenderProfiler()
+            self.profiler.install(self.preview_frame)
+            self.status_label.config(text="性能分析已开启，请重新渲染", foreground="blue")
+        elif self.profiler is not None:
+            self.profiler.uninstall()
+            self.profiler = None
+            self.heat_overlay.clear()
+            # 池中的控件仍通过计数代理调用Tk，丢弃后不再有额外开销
+            self.widget_pool.clear()
+
+    def show_profile(self):
+        """性能分析开启时显示热度叠加层，返回附加在状态栏后的摘要"""
+        if self.profiler is None:
+            return ""
+        stats = self.profiler.finish()
+        self.heat_overlay.show(self.profiler.records)
+        slowest = sorted(stats["tags"].items(), key=lambda item: item[1]["self_ms"], reverse=True)
+        tags = "，".join(f"{tag} {tag_stats['self_ms']:.1f}ms" for tag, tag_stats in slowest[:3])
+        return f"；耗时{stats['total_ms']:.1f}ms，Tk调用{stats['tk_calls']}次（{tags}）"
+
+    def on_render_error(self, e):
+        """解析或渲染出错回调"""
+        if isinstance(e, ParseError):
+            self.status_label.config(text=f"XML解析错误: {str(e)}", foreground="red")
+            if not self.quiet_errors:
+                messagebox.showerror("解析错误", f"XML格式错误:\n{str(e)}")
+            return
+        self.status_label.config(text=f"错误: {str(e)}", foreground="red")
+        if not self.quiet_errors:
             messagebox.showerror("错误", f"渲染失败:\n{str(e)}")
 
-    def render_element(self, element, parent):
-        """递归渲染元素"""
-        tag = element.tag
-        attrs = element.attrib
+    def render_element(self, element, parent, placement=None):
+        """递归渲染元素，返回记录了控件的渲染节点
+
+        placement 为父容器按网格/约束布局算出的位置，见 markup.layout.placements()
+        """
+        profiler = self.profiler
+        if profiler is None:
+            widget = self.create_widget(element, parent, placement)
+        else:
+            token = profiler.begin()
+            widget = self.create_widget(element, parent, placement)
+            profiler.end(token, element.tag, widget, parent)
+        node = RenderNode(element.tag, element.attrib, widget)
+        if widget is None:
+            return node
         
-        # 根据标签类型创建相应的Tkinter控件
-        if tag == "window":
-            # 已经处理过window元素，只渲染其子元素
-            for child in element:
-                self.render_element(child, parent)
-                
-        elif tag == "label":
-            text = attrs.get("text", "")
-            font = attrs.get("font", "")
-            label = ttk.Label(parent, text=text)
-            if font:
-                try:
-                    # 简单解析字体设置，如"Arial 14 bold"
-                    font_parts = font.split()
-                    family = font_parts[0]
-                    size = int(font_parts[1]) if len(font_parts) > 1 else 10
-                    weight = "bold" if "bold" in font_parts else "normal"
-                    slant = "italic" if "italic" in font_parts else "roman"
-                    label.config(font=(family, size, weight, slant))
-                except:
-                    pass
-            label.pack(anchor=tk.W, padx=attrs.get("padx", 0), pady=attrs.get("pady", 5))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = label
-                
-        elif tag == "separator":
-            orient = attrs.get("orient", "horizontal")
-            separator = ttk.Separator(parent, orient=orient)
-            separator.pack(fill=tk.X if orient == "horizontal" else tk.Y, 
-                          padx=attrs.get("padx", 0), pady=attrs.get("pady", 5))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = separator
-                
-        elif tag == "frame":
-            layout = attrs.get("layout", "vertical")
-            frame = ttk.Frame(parent)
-            
-            # 根据布局设置pack方式
-            if layout == "horizontal":
-                frame.pack(fill=tk.X, padx=attrs.get("padx", 0), pady=attrs.get("pady", 0))
-            else:  # vertical
-                frame.pack(fill=tk.X, padx=attrs.get("padx", 0), pady=attrs.get("pady", 0))
-                
-            # 渲染子元素
-            for child in element:
-                self.render_element(child, frame)
-                
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = frame
-                
-        elif tag == "entry":
-            width = attrs.get("width", 20)
-            entry = ttk.Entry(parent, width=width)
-            entry.pack(side=tk.LEFT, padx=attrs.get("padx", 2), pady=attrs.get("pady", 0))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = entry
-                
-        elif tag == "radio":
-            text = attrs.get("text", "")
-            variable = attrs.get("variable", "")
-            value = attrs.get("value", "")
-            
-            # 确保变量存在
-            if variable not in self.variables:
-                self.variables[variable] = tk.StringVar()
-                
-            radio = ttk.Radiobutton(parent, text=text, 
-                                   variable=self.variables[variable], 
-                                   value=value)
-            radio.pack(side=tk.LEFT, padx=attrs.get("padx", 2), pady=attrs.get("pady", 0))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = radio
-                
-        elif tag == "checkbox":
-            text = attrs.get("text", "")
-            variable = attrs.get("variable", "")
-            
-            # 确保变量存在
-            if variable not in self.variables:
-                self.variables[variable] = tk.BooleanVar()
-                
-            checkbox = ttk.Checkbutton(parent, text=text, 
-                                      variable=self.variables[variable])
-            checkbox.pack(side=tk.LEFT, padx=attrs.get("padx", 2), pady=attrs.get("pady", 0))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = checkbox
-                
-        elif tag == "combobox":
-            width = attrs.get("width", 20)
-            values = attrs.get("values", "").split(",")
-            
-            combobox = ttk.Combobox(parent, width=width, values=values)
-            combobox.pack(side=tk.LEFT, padx=attrs.get("padx", 2), pady=attrs.get("pady", 0))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = combobox
-                
-        elif tag == "text":
-            width = attrs.get("width", 50)
-            height = attrs.get("height", 5)
-            text_widget = scrolledtext.ScrolledText(parent, width=width, height=height, wrap=tk.WORD)
-            text_widget.pack(fill=tk.X, padx=attrs.get("padx", 0), pady=attrs.get("pady", 5))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = text_widget
-                
-        elif tag == "button":
-            text = attrs.get("text", "按钮")
-            command = attrs.get("command", "")
-            
-            # 绑定命令
-            btn_command = self.get_command_handler(command)
-            button = ttk.Button(parent, text=text, command=btn_command)
-            button.pack(side=tk.LEFT, padx=attrs.get("padx", 5), pady=attrs.get("pady", 0))
-            if "id" in attrs:
-                self.widgets[attrs["id"]] = button
+        if element.tag in CONTAINER_TAGS:
+            for child, child_placement in zip(element, placements(element)):
+                node.children.append(self.render_element(child, widget, child_placement))
+        elif element.tag in LAZY_TAGS:
+            # 标签页内容在首次选中时再渲染
+            def load():
+                for child in element:
+                    node.children.append(self.render_element(child, widget))
+            parent.defer(widget, load, functools.partial(unload_node, node, self))
+        return node
+
+    def create_widget(self, element, parent, placement=None):
+        """根据标签创建单个控件（不含子元素），未知标签返回None"""
+        if element.tag == "window":
+            # 已经处理过window元素，子元素直接渲染到窗口容器中
+            return parent
+        
+        # 与渲染计划共用同一套属性解释
+        instruction = compile_node(element.tag, element.attrib)
+        if instruction is None:
+            return None
+        if placement is not None:
+            instruction = with_placement(instruction, placement)
+        return build_widget(instruction, parent, self)
 
     def get_command_handler(self, command_name):
-        """获取命令处理函数"""
-        # 这里可以扩展更多命令
-        handlers = {
-            "show_message": self.show_message,
-            "clear_text": self.clear_text
-        }
-        return handlers.get(command_name, self.default_command)
+        """获取命令处理函数（markup.commands.Command）"""
+        return self.commands.get(command_name)
+
+    def on_command_done(self, record):
+        """异步命令结束后在状态栏显示耗时"""
+        if record.kind == "sync":
+            return
+        if record.error is None:
+            self.status_label.config(text=f"命令 {record.name} 完成，用时 {record.elapsed_ms:.0f} ms",
+                                     foreground="green")
+        else:
+            self.status_label.config(text=f"命令 {record.name} 失败：{record.error}", foreground="red")
 
     def show_message(self):
-        """显示信息命令的处理函数"""
+        """显示信息命令的处理函数，表单内容来自 bind 属性绑定的数据模型"""
         try:
-            # 获取姓名
-            name = self.widgets["name_entry"].get() if "name_entry" in self.widgets else "未知"
+            form = self.model.get("form", {})
+            name = form.get("name") or "未知"
             
-            # 获取性别
-            gender = self.variables["gender"].get() if "gender" in self.variables else ""
+            gender = form.get("gender", "")
             gender_text = "男" if gender == "male" else "女" if gender == "female" else "未选择"
             
-            # 获取爱好
-            hobbies = []
-            if "hobby_read" in self.variables and self.variables["hobby_read"].get():
-                hobbies.append("阅读")
-            if "hobby_sport" in self.variables and self.variables["hobby_sport"].get():
-                hobbies.append("运动")
-            if "hobby_code" in self.variables and self.variables["hobby_code"].get():
-                hobbies.append("编程")
+            selected = form.get("hobbies", {})
+            hobbies = [text for key, text in (("read", "阅读"), ("sport", "运动"), ("code", "编程"))
+                       if selected.get(key)]
             hobby_text = ", ".join(hobbies) if hobbies else "未选择"
             
-            # 获取职业
-            job = self.widgets["job"].get() if "job" in self.widgets else "未选择"
+            job = form.get("job") or "未选择"
             
-            # 构建信息文本
+            # 写入模型，绑定到 form.info 的文本框在本轮事件结束后统一刷新
             info = f"姓名：{name}\n性别：{gender_text}\n爱好：{hobby_text}\n职业：{job}"
-            
-            # 显示在文本框中
-            if "info_text" in self.widgets:
-                self.widgets["info_text"].delete("1.0", tk.END)
-                self.widgets["info_text"].insert(tk.INSERT, info)
+            self.model.set("form.info", info)
                 
         except Exception as e:
             messagebox.showerror("错误", f"执行命令失败:\n{str(e)}")
 
     def clear_text(self):
         """清空文本命令的处理函数"""
-        if "info_text" in self.widgets:
-            self.widgets["info_text"].delete("1.0", tk.END)
-        if "name_entry" in self.widgets:
-            self.widgets["name_entry"].delete(0, tk.END)
+        self.model.update({"form.info": "", "form.name": ""})
 
     def default_command(self):
         """默认命令处理函数"""
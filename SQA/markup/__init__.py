@@ -0,0 +1,26 @@
+"""自定义标记语言的公共组件（分词、编译、缓存等），供各演示程序共用"""
+from .tokenizer import START, END, TEXT, tokenize, MarkupTokenizer
+from .plan import (Instruction, RenderPlan, RenderNode, PlanCache, compile_node,
+                   compile_document, compile_markup, parse_markup, execute_plan,
+                   iter_plan, with_placement)
+from .tags import TagSpec, Option, Layout, register_tag, register_widget_class
+from .layout import arrange, placements
+from .binding import Model, Binder
+from .commands import CommandRegistry, TkEventLoop
+from .reconcile import Reconciler, ReconcileStats
+from .diskcache import DiskPlanCache
+from .pool import WidgetPool
+from .virtual import VirtualList
+from .tabs import LazyNotebook
+from .images import ImageCache, ImageView
+from .scheduler import ChunkedRender
+from .components import ComponentLibrary, expand_markup
+from .template import DataTemplate, compile_template, compile_template_markup, is_template
+from .stream import StreamRender, SubtreeBuilder
+from .tclscript import execute_script, iter_script
+# markup.build 是命令行入口（python -m markup.build），不在包中导入，否则 runpy 会发出警告
+from .worker import BackgroundCompiler
+from .highlight import LineCache, SyntaxHighlighter
+from .live import LiveDocument, LivePreview
+from .profile import RenderProfiler, HeatOverlay
+from .node import Node, NodeBuilder, parse_nodes
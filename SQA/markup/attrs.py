@@ -0,0 +1,98 @@
+"""标记属性值的解析
+
+属性值都是字符串，同一文档（以及反复编辑的同一份文档）中相同的字符串大量重复，
+因此每种转换都按属性字符串缓存结果，每个不同的字符串只转换一次。
+转换结果是不可变对象（int、float、元组），可以在多个控件之间共享。
+"""
+import functools
+import weakref
+from tkinter import font as tkfont
+
+# 每种转换缓存的不同属性字符串个数上限
+CACHE_SIZE = 4096
+
+
+def memoized(convert):
+    """按参数缓存转换结果，参数必须可哈希，抛出的异常不缓存"""
+    return functools.lru_cache(maxsize=CACHE_SIZE)(convert)
+
+
+@memoized
+def to_int(value):
+    """整数属性（宽度、高度等），不是整数时抛出 ValueError"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"属性值应为整数: {value!r}") from None
+
+
+@memoized
+def to_float(value):
+    """数值属性（秒数等），不是数值时抛出 ValueError"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"属性值应为数值: {value!r}") from None
+
+
+@memoized
+def parse_pad(value):
+    """padx/pady：一个整数，或 "左 右" 形式的两个整数"""
+    if isinstance(value, int):
+        return value
+    parts = str(value).split()
+    if len(parts) == 2:
+        return (to_int(parts[0]), to_int(parts[1]))
+    return to_int(value)
+
+
+@memoized
+def comma_list(value):
+    """逗号分隔的列表属性"""
+    return tuple(value.split(","))
+
+
+@memoized
+def parse_font(spec):
+    """将 "Arial 14 bold" 形式的字体设置解析为Tk字体元组
+
+    空串表示使用默认字体，返回None；字号不是整数时抛出 ValueError，由调用方决定报错还是忽略。
+    """
+    font_parts = spec.split()
+    if not font_parts:
+        return None
+    try:
+        size = int(font_parts[1]) if len(font_parts) > 1 else 10
+    except ValueError:
+        raise ValueError(f"无法解析的字体: {spec!r}（应为“字体名 字号 [bold] [italic]”）") from None
+    family = font_parts[0]
+    weight = "bold" if "bold" in font_parts else "normal"
+    slant = "italic" if "italic" in font_parts else "roman"
+    return (family, size, weight, slant)
+
+
+# Tk 根窗口 -> {字体元组: Font}，根窗口销毁后整组释放
+_FONTS = weakref.WeakKeyDictionary()
+
+
+def shared_font(font, widget):
+    """返回 widget 所在Tk解释器中与字体元组对应的共享 Font 对象
+
+    相同的字体只创建一个Tk命名字体，所有使用它的控件共用。
+    只能在Tk主线程中调用；渲染计划中保存的仍是字体元组，便于跨线程和序列化。
+    """
+    root = widget._root()
+    fonts = _FONTS.get(root)
+    if fonts is None:
+        fonts = _FONTS[root] = {}
+    shared = fonts.get(font)
+    if shared is None:
+        family, size, weight, slant = font
+        shared = fonts[font] = tkfont.Font(root=root, family=family, size=size,
+                                           weight=weight, slant=slant)
+    return shared
+
+
+def font_count(widget):
+    """widget 所在Tk解释器中已创建的共享字体数"""
+    return len(_FONTS.get(widget._root(), ()))
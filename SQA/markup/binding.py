@@ -0,0 +1,202 @@
+"""数据绑定：控件通过 bind="路径" 属性与可观察的数据模型双向同步
+
+模型以点分路径（如 "form.name"）读写嵌套字典。修改模型时不会立即通知订阅者，
+而是记下变化的路径，在本轮事件处理结束后（after_idle）统一发出一次：
+同一路径的多次修改只通知最后的值，一轮中的全部修改只触发一次界面刷新。
+替换整个子字典时（如 set("user", {...})），订阅其下路径（如 "user.name"）的也会收到通知。
+
+模型和绑定器都只应在Tk主线程中使用；后台线程产生的数据应先交回主线程
+（例如通过 BackgroundCompiler 或 after()）再写入模型。
+"""
+import tkinter as tk
+
+from .tags import BOOLEAN_VAR
+
+
+def _parents(path):
+    """路径本身及其各级父路径，最后是表示整个模型的空路径"""
+    yield path
+    while path:
+        path = path.rpartition(".")[0]
+        yield path
+
+
+class Model:
+    """可观察的数据模型
+
+    schedule 为安排稍后执行回调的函数，通常是某个控件的 after_idle；
+    为None时每次修改都立即通知（不合并）。
+    """
+
+    def __init__(self, data=None, schedule=None):
+        self.data = dict(data or {})
+        self.schedule = schedule
+        self.mutations = 0
+        self.flushes = 0
+        self.notifications = 0
+        # 路径 -> 回调列表；订阅某路径也会收到其下各级子路径的变化
+        self._subscribers = {}
+        self._pending = {}
+        # 本轮中被整体替换的子字典路径，其下各级路径的订阅者也要通知
+        self._replaced = set()
+        self._scheduled = False
+
+    def get(self, path, default=None):
+        value = self.data
+        for key in path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def set(self, path, value):
+        """修改路径上的值，值没有变化时不产生通知"""
+        keys = path.split(".")
+        parent = self.data
+        for key in keys[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                child = parent[key] = {}
+            parent = child
+        last = keys[-1]
+        old = parent.get(last)
+        if last in parent and old == value:
+            return
+        parent[last] = value
+        self.mutations += 1
+        self._pending[path] = value
+        if isinstance(value, dict) or isinstance(old, dict):
+            self._replaced.add(path)
+        if self.schedule is None:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            self.schedule(self.flush)
+
+    def update(self, values):
+        """按 {路径: 值} 批量修改"""
+        for path, value in values.items():
+            self.set(path, value)
+
+    def subscribe(self, path, callback):
+        """订阅路径（空路径表示整个模型），变化时调用 callback(路径, 值)"""
+        self._subscribers.setdefault(path, []).append(callback)
+
+    def unsubscribe(self, path, callback):
+        callbacks = self._subscribers.get(path)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._subscribers[path]
+
+    def flush(self):
+        """立即发出所有尚未通知的变化"""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        replaced, self._replaced = self._replaced, set()
+        if not pending:
+            return
+        self.flushes += 1
+        subscribers = self._subscribers
+        for path, value in pending.items():
+            for prefix in _parents(path):
+                for callback in subscribers.get(prefix, ()):
+                    self.notifications += 1
+                    callback(path, value)
+        if not replaced:
+            return
+        # 子字典被替换时，其下各级路径取模型中的当前值通知（每个路径只通知一次）
+        for sub_path in list(subscribers):
+            if any(sub_path.startswith(path + ".") for path in replaced):
+                value = self.get(sub_path)
+                for callback in subscribers.get(sub_path, ()):
+                    self.notifications += 1
+                    callback(sub_path, value)
+
+
+class Binder:
+    """把模型路径连接到控件
+
+    同一路径的控件共用一个Tk变量，模型变化时每个路径只写一次变量；
+    控件中的输入经变量跟踪写回模型。Text 控件没有变量，直接替换内容。
+    """
+
+    def __init__(self, model, master):
+        self.model = model
+        self.master = master
+        self.updates = 0
+        self._variables = {}
+        # Text 控件 -> 绑定的路径（控件池复用控件时会改绑到别的路径）
+        self._texts = {}
+        # 已向模型订阅的路径
+        self._paths = set()
+        self._updating = False
+
+    def variable(self, path, kind):
+        """返回绑定到路径的Tk变量，第一次使用时按模型中的当前值初始化"""
+        variable = self._variables.get(path)
+        if variable is not None:
+            return variable
+        if kind == BOOLEAN_VAR:
+            variable = tk.BooleanVar(master=self.master)
+        else:
+            variable = tk.StringVar(master=self.master)
+        value = self.model.get(path)
+        if value is not None:
+            variable.set(value)
+        variable.trace_add("write", lambda *_: self._on_write(path, variable))
+        self._variables[path] = variable
+        self._subscribe(path)
+        return variable
+
+    def attach_text(self, path, widget):
+        """把 Text 控件的内容绑定到路径"""
+        self._subscribe(path)
+        self._texts[widget] = path
+        self._set_text(widget, self.model.get(path, ""))
+        widget.bind("<<Modified>>", lambda event: self._on_text_modified(path, widget))
+
+    def _subscribe(self, path):
+        if path not in self._paths:
+            self._paths.add(path)
+            self.model.subscribe(path, self._on_model_change)
+
+    def _on_write(self, path, variable):
+        if not self._updating:
+            self.model.set(path, variable.get())
+
+    def _on_text_modified(self, path, widget):
+        if not widget.edit_modified():
+            return
+        widget.edit_modified(False)
+        if not self._updating and self._texts.get(widget) == path:
+            self.model.set(path, widget.get("1.0", "end-1c"))
+
+    def _on_model_change(self, path, value):
+        self._updating = True
+        try:
+            variable = self._variables.get(path)
+            if variable is not None and value is None:
+                # 路径所在的子字典被替换后不再存在，清空控件
+                value = False if isinstance(variable, tk.BooleanVar) else ""
+            if variable is not None and variable.get() != value:
+                variable.set(value)
+                self.updates += 1
+            for widget, text_path in list(self._texts.items()) if self._texts else ():
+                if text_path != path:
+                    continue
+                if not widget.winfo_exists():
+                    del self._texts[widget]
+                elif widget.get("1.0", "end-1c") != value:
+                    self._set_text(widget, value)
+                    self.updates += 1
+        finally:
+            self._updating = False
+
+    def _set_text(self, widget, value):
+        updating, self._updating = self._updating, True
+        try:
+            widget.delete("1.0", tk.END)
+            widget.insert("1.0", "" if value is None else str(value))
+        finally:
+            self._updating = updating
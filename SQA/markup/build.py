@@ -0,0 +1,279 @@
+"""批量校验和预编译标记文件的命令行工具，不需要图形界面
+
+    python -m markup.build screens/ [-j 8] [--pattern "*.xml"] [--cache DIR]
+
+递归查找目录中的标记文件，在多个进程中并行解析、校验并编译为渲染计划，
+逐个文件输出诊断信息和耗时。校验内容：
+    error    XML格式错误、根元素不是window（组件库文件除外）、未知标签、属性值类型错误、
+             布局约束无法求解、tab 的位置不对、组件定义或 include 错误、
+             for/if 指令或 ${表达式} 写法错误
+    warning  标签不认识的属性（渲染时被忽略）、未知的 layout 取值
+有 error 时退出码为1。处理某个文件时的意外异常（如嵌套过深）作为该文件的 error 报告，
+不影响其他文件。
+
+指定 --cache 时把编译好的计划写入磁盘缓存（见 markup.diskcache），渲染器使用同一目录时
+首次渲染即可命中；使用了 <include> 的文档以文件所在目录为 base_dir。
+数据模板（见 markup.template）的渲染结果依赖数据，只校验和编译，不写入缓存，指令数记为0。
+组件库文件（根元素下只有 component 和 include）只检查组件定义、include 的文件和
+各组件体能否编译。
+
+每个文件独立处理，工作进程之间不共享状态，进程数不超过CPU核数时耗时近似按核数线性下降。
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree.ElementTree import ParseError
+
+from .layout import CHILD_ATTRIBUTES, CONTAINER_ATTRIBUTES, LAYOUT_TAGS, MANAGERS
+from .node import parse_nodes
+from .plan import compile_document
+from .reconcile import WINDOW_ATTRIBUTES
+from .components import LIBRARY
+from .tags import DEFINITION_TAGS, DIRECTIVE_TAGS, TAGS
+from .template import compile_template, compile_value, is_template, parse_directive
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# 一条诊断信息，location 为元素路径，如 window/frame[2]/entry[1]（同名兄弟中的序号）
+Diagnostic = namedtuple('Diagnostic', 'level location message')
+
+# 一个文件的处理结果，耗时单位为毫秒
+FileReport = namedtuple('FileReport', 'path diagnostics instructions parse_ms compile_ms')
+
+# layout 属性除网格、约束外还可以取的值（子元素仍用 pack）
+_PACK_LAYOUTS = frozenset(('horizontal', 'vertical'))
+
+# 工作进程中的磁盘缓存，由进程初始化函数创建
+_cache = None
+
+
+def is_library(root):
+    """是否为组件库文件：根元素不是window，其下只有 component 和 include（供 <include> 使用）"""
+    return root.tag != "window" and all(child.tag in DEFINITION_TAGS for child in root)
+
+
+def validate_library(root, base_dir=None):
+    """检查组件库文件：组件定义、include 的文件和各组件体能否编译，返回诊断信息列表"""
+    try:
+        scope = LIBRARY.scope(root, base_dir)
+    except ValueError as e:
+        return [Diagnostic(ERROR, root.tag, str(e))]
+    diagnostics = []
+    for name in scope.definitions:
+        try:
+            scope.template(name)
+        except ValueError as e:
+            diagnostics.append(Diagnostic(ERROR, f"{root.tag}/{name}", str(e)))
+    return diagnostics
+
+
+def validate(root, components=()):
+    """检查 Node 树，返回诊断信息列表；components 为可以使用的组件名"""
+    if root.tag != "window":
+        return [Diagnostic(ERROR, root.tag, "根元素必须是window")]
+    diagnostics = []
+    for name in root.names:
+        if name not in WINDOW_ATTRIBUTES:
+            diagnostics.append(Diagnostic(WARNING, "window", f"未知属性 {name}"))
+    _validate_children(root, "window", False, components, diagnostics)
+    return diagnostics
+
+
+def _validate_children(element, location, laid_out, components, diagnostics):
+    counts = {}
+    for child in element:
+        counts[child.tag] = counts.get(child.tag, 0) + 1
+        path = f"{location}/{child.tag}[{counts[child.tag]}]"
+        if child.tag == "window":
+            # 嵌套的window只渲染其子元素
+            _validate_children(child, path, laid_out, components, diagnostics)
+            continue
+        if child.tag in DEFINITION_TAGS:
+            if location != "window":
+                diagnostics.append(Diagnostic(ERROR, path, f"<{child.tag}> 只能直接放在根元素下"))
+            continue
+        if child.tag in components:
+            # 组件参数在编译时检查
+            continue
+        if child.tag in DIRECTIVE_TAGS:
+            # 指令的子元素直接放在所在的容器中
+            try:
+                parse_directive(child)
+            except ValueError as e:
+                diagnostics.append(Diagnostic(ERROR, path, str(e)))
+            _validate_children(child, path, laid_out, components, diagnostics)
+            continue
+        spec = TAGS.get(child.tag)
+        if spec is None:
+            diagnostics.append(Diagnostic(ERROR, path, f"未知标签 <{child.tag}>"))
+            continue
+
+        known = spec.attributes
+        if child.tag in LAYOUT_TAGS:
+            known = known | CONTAINER_ATTRIBUTES
+            layout = child.get("layout")
+            if layout is not None and layout not in MANAGERS and layout not in _PACK_LAYOUTS:
+                diagnostics.append(Diagnostic(WARNING, path, f"未知的 layout 取值 {layout!r}"))
+        if laid_out:
+            known = known | CHILD_ATTRIBUTES
+        for name in child.names:
+            if name not in known:
+                diagnostics.append(Diagnostic(WARNING, path, f"<{child.tag}> 不支持属性 {name}"))
+        try:
+            expressions = [value for value in child.values if '${' in value]
+            if expressions:
+                # 含表达式的属性取值要到渲染时才知道，只检查表达式本身
+                for value in expressions:
+                    compile_value(value)
+            else:
+                # 属性类型错误在编译单个元素时即可发现
+                spec.compile(child.attrib, -1)
+        except ValueError as e:
+            diagnostics.append(Diagnostic(ERROR, path, str(e)))
+
+        if spec.container or spec.lazy:
+            child_laid_out = child.tag in LAYOUT_TAGS and child.get("layout") in MANAGERS
+            _validate_children(child, path, child_laid_out, components, diagnostics)
+
+
+def compile_file(path):
+    """解析、校验并编译一个文件，返回 FileReport；在工作进程中执行
+
+    任何异常都作为该文件的诊断信息返回，一个文件出错不会中断整批处理。
+    """
+    try:
+        return _compile_file(path)
+    except Exception as e:
+        # 例如被包含文件的编码或XML错误、嵌套过深时的 RecursionError
+        diagnostics = [Diagnostic(ERROR, "", f"处理文件时出错: {type(e).__name__}: {e}")]
+        return FileReport(path, diagnostics, 0, 0.0, 0.0)
+
+
+def _compile_file(path):
+    diagnostics = []
+    instructions = 0
+    parse_ms = compile_ms = 0.0
+    start = time.perf_counter()
+    try:
+        with open(path, encoding="utf-8") as file:
+            markup_text = file.read()
+        root = parse_nodes(markup_text)
+    except (OSError, UnicodeDecodeError) as e:
+        diagnostics.append(Diagnostic(ERROR, "", f"无法读取文件: {e}"))
+        return FileReport(path, diagnostics, instructions, parse_ms, compile_ms)
+    except ParseError as e:
+        line, column = e.position
+        diagnostics.append(Diagnostic(ERROR, f"{line}:{column}", f"XML格式错误: {e}"))
+        return FileReport(path, diagnostics, instructions, parse_ms, compile_ms)
+    parsed = time.perf_counter()
+    parse_ms = (parsed - start) * 1000
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    if is_library(root):
+        # 组件库只在被包含时使用，不生成渲染计划
+        diagnostics.extend(validate_library(root, base_dir))
+        compile_ms = (time.perf_counter() - parsed) * 1000
+        return FileReport(path, diagnostics, instructions, parse_ms, compile_ms)
+    try:
+        scope = LIBRARY.scope(root, base_dir)
+    except ValueError as e:
+        diagnostics.append(Diagnostic(ERROR, "window", str(e)))
+        scope = LIBRARY.scope()
+    diagnostics.extend(validate(root, scope.definitions))
+    if not any(diagnostic.level == ERROR for diagnostic in diagnostics):
+        try:
+            if is_template(markup_text):
+                # 数据模板的渲染结果依赖数据，只检查能否编译
+                compile_template(root, scope)
+            else:
+                plan = compile_document(root, scope)
+                instructions = len(plan.instructions)
+                if _cache is not None:
+                    # include 相对于文件所在目录，缓存键中需包含该目录
+                    _cache.store(markup_text, plan, base_dir)
+        except ValueError as e:
+            # 约束布局、tab 位置、组件参数和指令的错误在编译整个文档时才能发现
+            diagnostics.append(Diagnostic(ERROR, "window", str(e)))
+    compile_ms = (time.perf_counter() - parsed) * 1000
+    return FileReport(path, diagnostics, instructions, parse_ms, compile_ms)
+
+
+def _init_worker(cache_dir):
+    global _cache
+    if cache_dir is not None:
+        from .diskcache import DiskPlanCache
+        _cache = DiskPlanCache(cache_dir)
+
+
+def find_files(paths, pattern):
+    """展开目录，返回匹配 pattern 的文件路径（按路径排序）；直接给出的文件总是包含在内"""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for directory, _, names in os.walk(path):
+            files.extend(os.path.join(directory, name)
+                         for name in names if fnmatch.fnmatch(name, pattern))
+    return sorted(files)
+
+
+def compile_files(files, jobs=None, cache_dir=None):
+    """并行处理文件，按输入顺序产出 FileReport；jobs 为1时在当前进程中执行"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        _init_worker(cache_dir)
+        yield from map(compile_file, files)
+        return
+    # 每个工作进程一次领取若干文件，减少进程间通信
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cache_dir,)) as executor:
+        yield from executor.map(compile_file, files, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m markup.build",
+                                     description="批量校验并预编译标记文件")
+    parser.add_argument("paths", nargs="+", help="标记文件或目录")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="工作进程数，默认为CPU核数")
+    parser.add_argument("--pattern", default="*.xml", help="目录中匹配的文件名，默认 *.xml")
+    parser.add_argument("--cache", default=None, help="把渲染计划写入该磁盘缓存目录")
+    parser.add_argument("-q", "--quiet", action="store_true", help="只输出有诊断信息的文件和汇总")
+    args = parser.parse_args(argv)
+
+    files = find_files(args.paths, args.pattern)
+    if not files:
+        print("没有找到标记文件", file=sys.stderr)
+        return 1
+
+    errors = warnings = failed = 0
+    busy_ms = 0.0
+    start = time.perf_counter()
+    for report in compile_files(files, args.jobs, args.cache):
+        file_errors = sum(diagnostic.level == ERROR for diagnostic in report.diagnostics)
+        errors += file_errors
+        warnings += len(report.diagnostics) - file_errors
+        failed += file_errors > 0
+        busy_ms += report.parse_ms + report.compile_ms
+        if args.quiet and not report.diagnostics:
+            continue
+        status = "FAIL" if file_errors else "OK"
+        print(f"{status:<4} {report.path}  {report.instructions}条指令  "
+              f"解析{report.parse_ms:.1f}ms 编译{report.compile_ms:.1f}ms")
+        for diagnostic in report.diagnostics:
+            print(f"     {diagnostic.level}: {diagnostic.location}: {diagnostic.message}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"共{len(files)}个文件，失败{failed}个，错误{errors}个，警告{warnings}个；"
+          f"总耗时{elapsed_ms:.0f}ms，各文件累计{busy_ms:.0f}ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
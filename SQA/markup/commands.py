@@ -0,0 +1,187 @@
+"""命令注册表：命令名到处理函数的映射只构建一次，渲染每个按钮时直接查表
+
+处理函数有三种：
+    普通函数                    在Tk主线程中同步执行，适合很快的操作
+    async def                   作为协程在由Tk驱动的 asyncio 事件循环中执行，
+                                可以 await 网络请求等，期间界面保持响应，可以直接操作控件
+    register(..., background=True)
+                                普通函数放到线程池中执行，不能操作Tk控件
+
+异步执行期间，绑定该命令的按钮自动禁用，结束后恢复。每次执行都记录耗时。
+
+    commands = CommandRegistry(root, default=show_not_implemented)
+    commands.register("save", save)            # async def save(): ...
+    commands.register("export", export, background=True)
+    ttk.Button(frame, command=commands.get("save"))
+"""
+import asyncio
+import inspect
+import time
+import weakref
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 一次命令执行的记录
+#   name        命令名
+#   kind        执行方式：sync、async 或 thread
+#   elapsed_ms  耗时（毫秒），异步命令为从点击到完成的时间
+#   error       抛出的异常，成功时为None
+CommandRecord = namedtuple('CommandRecord', 'name kind elapsed_ms error')
+
+SYNC = 'sync'
+ASYNC = 'async'
+THREAD = 'thread'
+
+
+class TkEventLoop:
+    """在Tk主线程中驱动 asyncio 事件循环
+
+    有未完成的任务时，每 poll_ms 毫秒用 after() 运行一轮事件循环（不阻塞），
+    协程因此和Tk回调在同一个线程中执行，可以直接操作控件。
+    """
+
+    def __init__(self, widget, poll_ms=10):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.loop = asyncio.new_event_loop()
+        self._tasks = set()
+        self._poll_job = None
+
+    def create_task(self, coroutine):
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if self._poll_job is None:
+            self._poll_job = self.widget.after_idle(self._poll)
+        return task
+
+    def _poll(self):
+        self._poll_job = None
+        # stop() 排在已就绪的回调之后，run_forever() 只运行一轮
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if self._tasks:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)
+
+    def close(self):
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+        for task in self._tasks:
+            task.cancel()
+        self.loop.close()
+
+
+class Command:
+    """一个已注册的命令，可直接作为按钮的 command 回调"""
+
+    def __init__(self, registry, name, handler, background=False):
+        self.registry = registry
+        self.name = name
+        self.handler = handler
+        if inspect.iscoroutinefunction(handler):
+            self.kind = ASYNC
+        elif background:
+            self.kind = THREAD
+        else:
+            self.kind = SYNC
+        self.running = False
+        self._buttons = weakref.WeakSet()
+
+    def track(self, button):
+        """登记绑定了该命令的按钮，异步执行期间禁用"""
+        self.registry._owners[button] = self
+        self._buttons.add(button)
+
+    def __call__(self, *args):
+        if self.kind == SYNC:
+            start = time.perf_counter()
+            error = None
+            try:
+                return self.handler(*args)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.registry._record(self, start, error)
+
+        if self.running:
+            # 上一次执行尚未结束，忽略重复触发
+            return None
+        self.running = True
+        self._set_enabled(False)
+        return self.registry.event_loop.create_task(self._run(args, time.perf_counter()))
+
+    async def _run(self, args, start):
+        error = None
+        try:
+            if self.kind == ASYNC:
+                await self.handler(*args)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.registry.executor, self.handler, *args)
+        except Exception as e:
+            error = e
+            self.registry.widget._root().report_callback_exception(type(e), e, e.__traceback__)
+        finally:
+            self.running = False
+            self._set_enabled(True)
+            self.registry._record(self, start, error)
+
+    def _set_enabled(self, enabled):
+        owners = self.registry._owners
+        for button in list(self._buttons):
+            # 控件池复用的按钮可能已改绑到其他命令
+            if owners.get(button) is not self or not button.winfo_exists():
+                continue
+            button.state(["!disabled"] if enabled else ["disabled"])
+
+
+class CommandRegistry:
+    """命令名 -> Command，未注册的命令名返回 default 对应的命令
+
+    widget 为任意Tk控件，用于调度事件循环和报告异常。
+    """
+
+    def __init__(self, widget, default=None, max_workers=4, log_size=500):
+        self.widget = widget
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="markup-command")
+        self.event_loop = TkEventLoop(widget)
+        # 最近的执行记录
+        self.log = deque(maxlen=log_size)
+        # 每次执行结束后调用 listener(CommandRecord)
+        self.listeners = []
+        self._commands = {}
+        self._owners = weakref.WeakKeyDictionary()
+        self.default = None if default is None else Command(self, "default", default)
+
+    def register(self, name, handler, background=False):
+        self._commands[name] = Command(self, name, handler, background)
+        return self._commands[name]
+
+    def get(self, name):
+        return self._commands.get(name, self.default)
+
+    def stats(self):
+        """各命令的 {执行次数, 总耗时, 最长耗时, 失败次数}，基于 log 中的记录"""
+        result = {}
+        for record in self.log:
+            stats = result.setdefault(record.name, {"count": 0, "total_ms": 0.0,
+                                                    "max_ms": 0.0, "errors": 0})
+            stats["count"] += 1
+            stats["total_ms"] += record.elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], record.elapsed_ms)
+            stats["errors"] += record.error is not None
+        return result
+
+    def shutdown(self):
+        self.event_loop.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, command, start, error):
+        record = CommandRecord(command.name, command.kind,
+                               (time.perf_counter() - start) * 1000, error)
+        self.log.append(record)
+        for listener in self.listeners:
+            listener(record)
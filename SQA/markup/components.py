@@ -0,0 +1,397 @@
+"""可复用组件：<component> 定义、<include> 引入，在编译时展开
+
+    <window>
+        <include src="common.xml" />
+        <component name="field" params="label, id, width=20">
+            <frame layout="horizontal">
+                <label text="{label}" />
+                <entry id="{id}" width="{width}" />
+            </frame>
+        </component>
+        <field label="姓名：" id="name" />
+        <field label="邮箱：" id="email" width="30" />
+    </window>
+
+component 和 include 只能直接放在根元素下。params 中列出参数名，"名=默认值"
+表示可选参数；组件体的属性值中用 {参数名} 引用参数。使用组件时以组件名作标签，
+参数作属性；实例上的网格/约束布局属性（row、col、left 等）转给组件体的顶层元素。
+组件体中可以使用其他组件，循环引用时报错。被包含的文件以任意标签为根，
+其下只能有 component 和 include，路径相对于所在文件（文档本身相对于 base_dir）。
+
+每个组件只编译一次，得到指令模板：不引用参数的元素直接编译好，实例化时只替换
+父控件下标；引用参数的元素在实例化时代入参数后用标签的编译函数重新编译。
+模板按组件名缓存在组件库中，并记录所用各组件定义的指纹；被包含的文件按修改时间
+缓存，文件变化后只有定义发生变化的组件（及使用它们的组件）重新编译。
+"""
+import os
+import re
+import threading
+
+from .attrs import comma_list
+from .layout import CHILD_ATTRIBUTES, CONTAINER_ATTRIBUTES, LAYOUT_TAGS, PACK, arrange
+from .node import Node, parse_nodes
+from .plan import Instruction, _layout_children, _shared, parse_markup, with_placement
+from .tags import DEFINITION_TAGS, TAGS
+
+# ${...} 是数据模板的表达式（见 markup.template），不是参数
+_PARAM_RE = re.compile(r'(?<!\$)\{(\w+)\}')
+
+
+def substitute(value, values):
+    """把 value 中的 {参数名} 替换为 values 中的值，未知的参数保持原样"""
+    if '{' not in value:
+        return value
+    return _PARAM_RE.sub(lambda match: values.get(match.group(1), match.group()), value)
+
+
+def _is_dynamic(node):
+    return any('{' in value and _PARAM_RE.search(value) for value in node.values)
+
+
+def _uses_params(attrs, names):
+    """attrs 中 names 所列的属性是否引用了参数"""
+    return any(name in attrs and _PARAM_RE.search(attrs[name]) for name in names)
+
+
+def _fingerprint(node):
+    """节点子树的结构指纹，定义内容相同的组件指纹相等"""
+    return (node.tag, node.names, node.values, tuple(map(_fingerprint, node.children)))
+
+
+def _substitute_node(node, values):
+    children = tuple(_substitute_node(child, values) for child in node.children)
+    return Node(node.tag, node.names, tuple(substitute(value, values) for value in node.values),
+                children or node.children, node.text)
+
+
+def _with_attrs(node, extra):
+    """返回加上（或覆盖）extra 中属性的节点"""
+    attrs = dict(node.items())
+    attrs.update(extra)
+    return Node(node.tag, tuple(attrs), tuple(attrs.values()), node.children, node.text)
+
+
+class Definition:
+    """一个 <component> 定义"""
+
+    __slots__ = ('name', 'params', 'body', 'fingerprint')
+
+    def __init__(self, node):
+        name = node.get("name")
+        if not name:
+            raise ValueError("component 缺少 name 属性")
+        if name in TAGS or name in DEFINITION_TAGS or name == "window":
+            raise ValueError(f"组件名 {name} 与内置标签重名")
+        self.name = name
+        # 参数名 -> 默认值，必填参数为None
+        self.params = {}
+        for item in comma_list(node.get("params", "")):
+            param, has_default, default = item.partition("=")
+            if param.strip():
+                self.params[param.strip()] = default.strip() if has_default else None
+        self.body = node.children
+        self.fingerprint = _fingerprint(node)
+
+        used = {param for child in self.body for element in child.iter()
+                for value in element.values for param in _PARAM_RE.findall(value)}
+        unknown = used - set(self.params)
+        if unknown:
+            raise ValueError(f"组件 {name} 使用了未声明的参数: {', '.join(sorted(unknown))}")
+
+    def bind(self, attrs):
+        """按实例的属性得到 {参数名: 值}"""
+        for name in attrs:
+            if name not in self.params and name not in CHILD_ATTRIBUTES:
+                raise ValueError(f"组件 {self.name} 没有参数 {name}")
+        values = {}
+        for name, default in self.params.items():
+            value = attrs.get(name, default)
+            if value is None:
+                raise ValueError(f"组件 {self.name} 缺少参数 {name}")
+            values[name] = value
+        return values
+
+
+class Template:
+    """组件编译后的指令模板
+
+    instructions 中顶层元素的 parent 为-1，其余为模板内的下标；
+    dynamic 为 {下标: (TagSpec, 含占位符的属性)}，这些位置上是只有结构信息的占位指令；
+    placed 为 {下标: (布局管理器, 位置)}，即已算好位置的动态元素，编译后直接放置；
+    relayout 为布局属性引用了参数、实例化后需要重新计算子元素位置的容器；
+    deps 为 {组件名: 定义指纹}，包括组件本身和展开过的全部组件。
+    """
+
+    __slots__ = ('definition', 'instructions', 'dynamic', 'placed', 'relayout', 'deps')
+
+    def __init__(self, definition, instructions, dynamic, placed, relayout, deps):
+        self.definition = definition
+        self.instructions = instructions
+        self.dynamic = dynamic
+        self.placed = placed
+        self.relayout = relayout
+        self.deps = deps
+
+    def valid(self, definitions):
+        for name, fingerprint in self.deps.items():
+            definition = definitions.get(name)
+            if definition is None or definition.fingerprint != fingerprint:
+                return False
+        return True
+
+
+def _compile_template(nodes):
+    """编译展开后的组件体，返回 (指令, dynamic, placed, relayout)"""
+    instructions = []
+    dynamic = {}
+    placed = {}
+    relayout = []
+    pool = {}
+
+    def visit(children, parent, container):
+        for child in children:
+            if child.tag == "window":
+                visit(child.children, parent, "window")
+                continue
+            if container is not None and (child.tag == "tab") != (container == "tabs"):
+                raise ValueError("tab 只能直接放在 tabs 中，tabs 中也只能放 tab")
+            spec = TAGS.get(child.tag)
+            if spec is None:
+                continue
+            attrs = child.attrib
+            index = len(instructions)
+            if _is_dynamic(child):
+                dynamic[index] = (spec, attrs)
+                instruction = Instruction(child.tag, spec.widget, {}, {}, parent, None, None, None,
+                                          attrs, 0, PACK, None)
+            else:
+                instruction = spec.compile(attrs, parent)
+            instructions.append(instruction)
+            if spec.container or spec.lazy:
+                visit(child.children, index, child.tag)
+            instructions[index] = instruction._replace(
+                kwargs=_shared(pool, instruction.kwargs),
+                pack=_shared(pool, instruction.pack),
+                attrs=_shared(pool, dict(instruction.attrs)),
+                size=len(instructions) - index - 1,
+            )
+            if child.tag in LAYOUT_TAGS:
+                layout(index, attrs)
+
+    def layout(index, attrs):
+        children = [position for position in range(index + 1, len(instructions))
+                    if instructions[position].parent == index]
+        if _uses_params(attrs, CONTAINER_ATTRIBUTES) or any(
+                _uses_params(instructions[position].attrs, CHILD_ATTRIBUTES) for position in children):
+            relayout.append(index)
+            return
+        manager, positions = arrange(attrs, [instructions[position].attrs for position in children])
+        if positions is None:
+            return
+        for position, placement in zip(children, positions):
+            if position in dynamic:
+                # 动态元素的间距在实例化时才知道，只记下位置
+                placed[position] = (manager, placement)
+            else:
+                child = with_placement(instructions[position], (manager, placement))
+                instructions[position] = child._replace(pack=_shared(pool, child.pack))
+
+    visit(nodes, -1, None)
+    return instructions, dynamic, placed, relayout
+
+
+class Scope:
+    """一个文档可见的组件定义，由 ComponentLibrary.scope() 创建，只在一个线程中使用"""
+
+    def __init__(self, library, base_dir=None):
+        self.library = library
+        self.base_dir = base_dir or os.getcwd()
+        self.definitions = {}
+        # 被包含的文件 -> 修改时间，供渲染计划缓存判断是否过期
+        self.sources = {}
+        self._templates = {}
+
+    def __contains__(self, tag):
+        return tag in self.definitions
+
+    def __bool__(self):
+        return bool(self.definitions)
+
+    def define(self, node, base_dir=None, stack=()):
+        """登记 <component> 定义或处理 <include>"""
+        if node.tag == "component":
+            definition = Definition(node)
+            self.definitions[definition.name] = definition
+            self._templates.clear()
+        elif node.tag == "include":
+            self.include(node.get("src"), base_dir, stack)
+
+    def include(self, src, base_dir=None, stack=()):
+        if not src:
+            raise ValueError("include 缺少 src 属性")
+        path = os.path.normpath(os.path.join(base_dir or self.base_dir, src))
+        if path in stack:
+            raise ValueError("循环包含: " + " -> ".join(stack + (path,)))
+        mtime, items = self.library.load(path)
+        self.sources[path] = mtime
+        directory = os.path.dirname(path)
+        for item in items:
+            if isinstance(item, Definition):
+                self.definitions[item.name] = item
+                self._templates.clear()
+            else:
+                self.include(item, directory, stack + (path,))
+
+    def template(self, name):
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.library.template(self, name)
+        return template
+
+    def expand(self, nodes, stack=(), deps=None):
+        """把组件实例展开为内置标签的节点，返回节点列表"""
+        result = []
+        for node in nodes:
+            definition = self.definitions.get(node.tag)
+            if definition is None:
+                if node.children:
+                    node = Node(node.tag, node.names, node.values,
+                                tuple(self.expand(node.children, stack, deps)), node.text)
+                result.append(node)
+                continue
+            if node.tag in stack:
+                raise ValueError("组件循环引用: " + " -> ".join(stack + (node.tag,)))
+            if deps is not None:
+                deps[node.tag] = definition.fingerprint
+            attrs = node.attrib
+            values = definition.bind(attrs)
+            placement = {name: value for name, value in attrs.items() if name in CHILD_ATTRIBUTES}
+            body = []
+            for child in definition.body:
+                child = _substitute_node(child, values)
+                body.append(_with_attrs(child, placement) if placement else child)
+            result.extend(self.expand(body, stack + (node.tag,), deps))
+        return result
+
+    def expand_document(self, root):
+        """返回展开了全部组件实例、去掉定义的文档树，供按元素树渲染的路径使用"""
+        children = [child for child in root if child.tag not in DEFINITION_TAGS]
+        return Node(root.tag, root.names, root.values, tuple(self.expand(children)), root.text)
+
+    def instantiate(self, node, parent, parent_tag, instructions, pool):
+        """把组件实例的指令追加到 instructions 中，顶层元素的父控件为 parent（标签为 parent_tag）"""
+        template = self.template(node.tag)
+        attrs = node.attrib
+        values = template.definition.bind(attrs)
+        placement = {name: value for name, value in attrs.items() if name in CHILD_ATTRIBUTES}
+        offset = len(instructions)
+        dynamic = template.dynamic
+        placed = template.placed
+        for index, instruction in enumerate(template.instructions):
+            top = instruction.parent < 0
+            if top and (instruction.tag == "tab") != (parent_tag == "tabs"):
+                raise ValueError("tab 只能直接放在 tabs 中，tabs 中也只能放 tab")
+            target = parent if top else instruction.parent + offset
+            if index in dynamic:
+                spec, raw = dynamic[index]
+                element_attrs = {name: substitute(value, values) for name, value in raw.items()}
+                if top and placement:
+                    element_attrs.update(placement)
+                compiled = spec.compile(element_attrs, target)
+                if index in placed:
+                    compiled = with_placement(compiled, placed[index])
+                instruction = compiled._replace(
+                    kwargs=_shared(pool, compiled.kwargs),
+                    pack=_shared(pool, compiled.pack),
+                    attrs=_shared(pool, element_attrs),
+                    size=instruction.size,
+                )
+            elif top and placement:
+                instruction = instruction._replace(parent=target, attrs=dict(instruction.attrs, **placement))
+            else:
+                instruction = instruction._replace(parent=target)
+            instructions.append(instruction)
+        for index in template.relayout:
+            position = index + offset
+            _layout_children(instructions, position, instructions[position].attrs, pool)
+
+
+class ComponentLibrary:
+    """组件模板和被包含文件的缓存，可在多个线程中共用"""
+
+    def __init__(self):
+        self.loads = 0
+        self.builds = 0
+        self.hits = 0
+        # 文件路径 -> (修改时间, [Definition 或被包含的 src, ...])
+        self._files = {}
+        # 组件名 -> Template
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def scope(self, root=None, base_dir=None):
+        """创建文档的作用域，登记 root 下的组件定义和 include"""
+        scope = Scope(self, base_dir)
+        if root is not None:
+            for child in root:
+                if child.tag in DEFINITION_TAGS:
+                    scope.define(child)
+        return scope
+
+    def load(self, path):
+        """读取被包含的文件，修改时间未变时直接返回缓存"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            raise ValueError(f"无法读取被包含的文件 {path}: {e}") from None
+        with self._lock:
+            cached = self._files.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        with open(path, encoding="utf-8") as file:
+            root = parse_nodes(file.read())
+        items = []
+        for child in root:
+            if child.tag == "component":
+                items.append(Definition(child))
+            elif child.tag == "include":
+                items.append(child.get("src"))
+            else:
+                raise ValueError(f"{path}: 被包含的文件中只能有 component 和 include，不能有 <{child.tag}>")
+        with self._lock:
+            self._files[path] = (mtime, items)
+            self.loads += 1
+        return mtime, items
+
+    def template(self, scope, name):
+        """组件的指令模板，所用组件的定义都未变化时复用缓存"""
+        with self._lock:
+            template = self._templates.get(name)
+        if template is not None and template.valid(scope.definitions):
+            self.hits += 1
+            return template
+        definition = scope.definitions[name]
+        deps = {name: definition.fingerprint}
+        nodes = scope.expand(definition.body, (name,), deps)
+        template = Template(definition, *_compile_template(nodes), deps)
+        with self._lock:
+            self._templates[name] = template
+            self.builds += 1
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._templates.clear()
+
+
+# 默认的组件库，compile_document() 未指定作用域时使用
+LIBRARY = ComponentLibrary()
+
+
+def expand_markup(markup_text, base_dir=None, library=LIBRARY):
+    """解析标记文本并展开组件，供按元素树渲染（增量渲染）的路径使用"""
+    root = parse_markup(markup_text)
+    if not any(child.tag in DEFINITION_TAGS for child in root):
+        return root
+    return library.scope(root, base_dir).expand_document(root)
@@ -0,0 +1,119 @@
+"""渲染计划的磁盘缓存，让进程重启后无需重新解析标记
+
+每个缓存文件以“缓存键 + 编译器版本”命名（键为标记文本的哈希，使用了 <include>
+的文档还包含 base_dir，见 plan_key()），内容为一个很短的文件头加上
+marshal 序列化的指令元组。marshal 只包含内置类型，读取时几乎不产生额外对象。
+编译器版本或 marshal 版本变化后，旧文件在读取时被识别为过期并删除。
+使用了 <include> 的计划还记录被包含文件的修改时间，这些文件变化后缓存同样过期。
+"""
+import marshal
+import os
+
+from .plan import PLAN_VERSION, Instruction, RenderPlan, compile_markup, plan_key
+
+# 文件头：魔数、编译器版本、marshal 版本
+_MAGIC = b"SQAP"
+_HEADER = _MAGIC + bytes((PLAN_VERSION, marshal.version))
+_SUFFIX = ".plan"
+
+
+def default_cache_dir():
+    """默认缓存目录，可通过环境变量 MARKUP_CACHE_DIR 指定"""
+    return os.environ.get("MARKUP_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "sqa-markup"
+    )
+
+
+class DiskPlanCache:
+    """保存在目录中的渲染计划缓存"""
+
+    def __init__(self, directory=None, max_entries=1000):
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.prune()
+
+    def path(self, markup_text, base_dir=None):
+        """标记文本对应的缓存文件路径"""
+        return os.path.join(self.directory, f"{plan_key(markup_text, base_dir)}-v{PLAN_VERSION}{_SUFFIX}")
+
+    def load(self, markup_text, base_dir=None):
+        """读取缓存的渲染计划，不存在或已过期时返回None"""
+        path = self.path(markup_text, base_dir)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if not data.startswith(_HEADER):
+            self._remove(path)
+            return None
+        try:
+            attrs, instructions, sources = marshal.loads(data[len(_HEADER):])
+        except (EOFError, ValueError, TypeError):
+            self._remove(path)
+            return None
+        plan = RenderPlan(attrs, list(map(Instruction._make, instructions)), sources)
+        if sources and plan.stale():
+            self._remove(path)
+            return None
+        return plan
+
+    def store(self, markup_text, plan, base_dir=None):
+        """写入渲染计划，先写临时文件再替换，避免读到写了一半的文件"""
+        path = self.path(markup_text, base_dir)
+        data = _HEADER + marshal.dumps(
+            (plan.attrs, [tuple(instruction) for instruction in plan.instructions], plan.sources)
+        )
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+
+    def get(self, markup_text, base_dir=None):
+        """返回渲染计划，未命中时编译并写入磁盘，include 的相对路径相对于 base_dir"""
+        plan = self.load(markup_text, base_dir)
+        if plan is not None:
+            self.hits += 1
+            return plan
+        self.misses += 1
+        plan = compile_markup(markup_text, base_dir)
+        self.store(markup_text, plan, base_dir)
+        return plan
+
+    def prune(self):
+        """删除其他编译器版本的文件，并按修改时间只保留最近的 max_entries 个"""
+        current = f"-v{PLAN_VERSION}{_SUFFIX}"
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(_SUFFIX):
+                continue
+            if not name.endswith(current):
+                self._remove(path)
+                continue
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            self._remove(path)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,446 @@
+"""代码编辑器的增量语法高亮和标签折叠
+
+按行做词法分析，并缓存每行的行首状态（是否处于标签、属性值、注释之中）、
+记号和开闭标签事件。编辑后只重新分析改动的行；某行的行末状态与下一行缓存的
+行首状态相同时停止向后传播，因此输入一个字符通常只分析一行，与文件长度无关。
+
+着色先处理可见区域，其余行在空闲时分批完成：文件刚载入、可见区域之前的行
+尚未分析时，可见行先按“行首不在任何标签中”临时着色，后台分析到达时再更正。
+
+SyntaxHighlighter 通过替换 Text 控件的Tcl命令拦截 insert/delete/replace，
+从而知道每次修改涉及的行，键盘输入、粘贴和程序调用都会经过这里。
+
+    highlighter = SyntaxHighlighter(code_editor)
+    code_editor.bind("<Control-Button-1>", ...)   # 调用 highlighter.toggle_fold()
+"""
+import re
+import time
+
+# 行首状态
+TEXT = 0          # 标签之外
+TAG = 1           # 标签内、标签名之后
+DOUBLE = 2        # 双引号属性值中
+SINGLE = 3        # 单引号属性值中
+COMMENT = 4       # <!-- --> 中
+DECLARATION = 5   # <? ?>、<! > 中
+
+# 记号类型，同时是 Text 控件中的tag名
+TAG_NAME = 'hl_tag'
+ATTRIBUTE = 'hl_attr'
+VALUE = 'hl_value'
+COMMENT_TEXT = 'hl_comment'
+KINDS = (TAG_NAME, ATTRIBUTE, VALUE, COMMENT_TEXT)
+
+STYLES = {
+    TAG_NAME: {"foreground": "#1f4ea3"},
+    ATTRIBUTE: {"foreground": "#8a3f9e"},
+    VALUE: {"foreground": "#2b7a2b"},
+    COMMENT_TEXT: {"foreground": "#8c8c8c"},
+}
+
+# 折叠后标题行的样式
+FOLD_HEADER = 'hl_fold_header'
+FOLD_HEADER_STYLE = {"background": "#e8eef7"}
+
+# 开闭标签事件：开始标签 +1，结束标签或自闭合 -1
+OPEN = 1
+CLOSE = -1
+
+# 多行记号的状态 -> (结束符, 记号类型, 结束后的状态)
+_SPANS = {
+    DOUBLE: ('"', VALUE, TAG),
+    SINGLE: ("'", VALUE, TAG),
+    COMMENT: ('-->', COMMENT_TEXT, TEXT),
+    DECLARATION: ('>', COMMENT_TEXT, TEXT),
+}
+
+_NAME_RE = re.compile(r'[\w:.-]+')
+
+# 从 Text 控件一次读取的行数
+_BLOCK = 256
+
+
+def lex_line(line, state):
+    """分析一行，返回 (记号, 行末状态, 开闭事件)
+
+    记号为扁平元组 (类型, 起始列, 结束列, 类型, ...)，事件为 OPEN/CLOSE 的元组。
+    """
+    tokens = []
+    events = []
+    position = 0
+    start = 0
+    length = len(line)
+    while position < length:
+        if state == TEXT:
+            lt = line.find('<', position)
+            if lt < 0:
+                break
+            if line.startswith('<!--', lt):
+                state, start, position = COMMENT, lt, lt + 4
+            elif line.startswith('<!', lt) or line.startswith('<?', lt):
+                state, start, position = DECLARATION, lt, lt + 2
+            else:
+                closing = line.startswith('</', lt)
+                position = lt + 2 if closing else lt + 1
+                match = _NAME_RE.match(line, position)
+                if match is not None:
+                    position = match.end()
+                tokens += (TAG_NAME, lt, position)
+                events.append(CLOSE if closing else OPEN)
+                state = TAG
+        elif state == TAG:
+            char = line[position]
+            if char == '>':
+                tokens += (TAG_NAME, position, position + 1)
+                position += 1
+                state = TEXT
+            elif char == '/' and line.startswith('/>', position):
+                tokens += (TAG_NAME, position, position + 2)
+                position += 2
+                events.append(CLOSE)
+                state = TEXT
+            elif char == '<':
+                # 上一个标签没有闭合，从这里开始新的标签
+                state = TEXT
+            elif char == '"':
+                state, start, position = DOUBLE, position, position + 1
+            elif char == "'":
+                state, start, position = SINGLE, position, position + 1
+            else:
+                match = _NAME_RE.match(line, position)
+                if match is None:
+                    position += 1
+                else:
+                    tokens += (ATTRIBUTE, position, match.end())
+                    position = match.end()
+        else:
+            terminator, kind, after = _SPANS[state]
+            end = line.find(terminator, position)
+            if after == TAG:
+                # 属性值中不能出现 "<"，遇到时视为引号没有闭合，从 "<" 处恢复，
+                # 未闭合的引号因此不会把状态一直传播到文件末尾
+                lt = line.find('<', position, None if end < 0 else end)
+                if lt >= 0:
+                    tokens += (kind, start, lt)
+                    state, position = TEXT, lt
+                    continue
+            if end < 0:
+                # 记号延续到下一行
+                tokens += (kind, start, length)
+                break
+            position = end + len(terminator)
+            tokens += (kind, start, position)
+            state = after
+    return tuple(tokens), state, tuple(events)
+
+
+class _Lines:
+    """按块读取行文本，get_lines(起始行, 结束行) 返回 [起始行, 结束行) 的文本列表"""
+
+    def __init__(self, get_lines, count):
+        self.get_lines = get_lines
+        self.count = count
+        self.start = 0
+        self.lines = ()
+
+    def __getitem__(self, index):
+        offset = index - self.start
+        if not 0 <= offset < len(self.lines):
+            self.start = index
+            self.lines = self.get_lines(index, min(index + _BLOCK, self.count))
+            offset = 0
+        return self.lines[offset]
+
+
+class LineCache:
+    """逐行词法分析结果的缓存，不依赖Tk
+
+    从第0行起连续分析过的 size 行保存在 tokens/events 中，其中为None的是修改后
+    尚未重新分析的行；states[i] 为第 i 行的行首状态（共 size+1 项）。
+    """
+
+    def __init__(self):
+        self.states = [TEXT]
+        self.tokens = []
+        self.events = []
+        self.dirty = set()
+        # 累计分析的行数
+        self.lexed = 0
+
+    @property
+    def size(self):
+        return len(self.tokens)
+
+    @property
+    def pending(self):
+        """是否还有修改过、尚未重新分析的行"""
+        return bool(self.dirty)
+
+    def reset(self):
+        self.__init__()
+
+    def edit(self, first, removed, added):
+        """第 first 行起的 removed+1 行被替换成了 added+1 行"""
+        size = len(self.tokens)
+        if first >= size:
+            return
+        end = first + removed + 1
+        if end > size:
+            # 修改延伸到尚未分析的部分，从 first 行起全部重新分析
+            del self.tokens[first:]
+            del self.events[first:]
+            del self.states[first + 1:]
+            self.dirty = {line for line in self.dirty if line < first}
+            return
+        self.tokens[first:end] = [None] * (added + 1)
+        self.events[first:end] = [None] * (added + 1)
+        self.states[first + 1:end] = [None] * added
+        delta = added - removed
+        self.dirty = {line if line < first else line + delta
+                      for line in self.dirty if line < first or line >= end}
+        self.dirty.add(first)
+
+    def relex(self, get_lines, count, until=None, deadline=None):
+        """重新分析修改过的行，再从已分析的末尾向后分析到 until 行（默认为末尾）
+
+        count 为总行数；deadline 为 time.perf_counter() 的时刻，到时未完成的部分
+        留到下次。返回分析过的行区间 [(起始, 结束), ...]，用于重新着色。
+        """
+        lines = _Lines(get_lines, count)
+        ranges = []
+        for line in sorted(self.dirty):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return ranges
+            self.dirty.discard(line)
+            if ranges and line < ranges[-1][1]:
+                # 已在前一行的传播中重新分析过
+                continue
+            ranges.append((line, self._propagate(line, lines, deadline)))
+
+        until = count if until is None else min(until, count)
+        tokens, events, states = self.tokens, self.events, self.states
+        start = len(tokens)
+        state = states[-1]
+        for line in range(start, until):
+            if deadline is not None and line > start and time.perf_counter() >= deadline:
+                until = line
+                break
+            line_tokens, state, line_events = lex_line(lines[line], state)
+            tokens.append(line_tokens)
+            events.append(line_events)
+            states.append(state)
+        self.lexed += max(0, until - start)
+        if until > start:
+            ranges.append((start, until))
+        return ranges
+
+    def _propagate(self, line, lines, deadline):
+        """从 line 行起重新分析，行末状态与下一行的行首状态一致时停止，返回结束行号"""
+        tokens, events, states = self.tokens, self.events, self.states
+        size = len(tokens)
+        first = line
+        while line < size:
+            if line > first and deadline is not None and time.perf_counter() >= deadline:
+                self.dirty.add(line)
+                break
+            tokens[line], state, events[line] = lex_line(lines[line], states[line])
+            self.lexed += 1
+            line += 1
+            if line < size and tokens[line] is not None and states[line] == state:
+                break
+            states[line] = state
+        return line
+
+    def matching_line(self, line, ensure):
+        """第 line 行第一个开始标签对应的结束标签所在行，不存在或在同一行时返回None
+
+        ensure(n) 需保证前 n 行已分析。
+        """
+        ensure(line + 1)
+        events = self.events[line]
+        if OPEN not in events:
+            return None
+        events = events[events.index(OPEN):]
+        depth = 0
+        current = line
+        while True:
+            for event in events:
+                depth += event
+                if depth == 0:
+                    return current if current > line else None
+            current += 1
+            if not ensure(current + 1):
+                return None
+            events = self.events[current]
+
+
+class SyntaxHighlighter:
+    """为 Text 控件提供增量语法高亮和标签折叠
+
+    budget_ms 为每批分析和着色的时间上限，超出的部分在后续空闲时继续。
+    """
+
+    def __init__(self, widget, budget_ms=8, styles=None):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.cache = LineCache()
+        # 修改和着色的统计
+        self.edits = 0
+        self.painted = 0
+        self._job = None
+        self._folds = 0
+        self._provisional = None
+        for kind, style in (styles or STYLES).items():
+            widget.tag_configure(kind, **style)
+        widget.tag_configure(FOLD_HEADER, **FOLD_HEADER_STYLE)
+
+        # 把控件命令改名，用同名的Python命令代替，拦截修改文本的子命令
+        self._name = widget._w
+        self._original = self._name + "_highlight"
+        widget.tk.call("rename", self._name, self._original)
+        widget.tk.createcommand(self._name, self._dispatch)
+        if widget._tclCommands is None:
+            widget._tclCommands = []
+        # 控件销毁时由 tkinter 删除该命令
+        widget._tclCommands.append(self._name)
+        self.refresh()
+
+    def _call(self, *args):
+        return self.widget.tk.call(self._original, *args)
+
+    def _dispatch(self, *args):
+        command = args[0] if args else ""
+        if command in ("insert", "delete", "replace"):
+            return self._modify(args)
+        result = self._call(*args)
+        if command == "yview" and len(args) > 1:
+            # 滚动后可见区域可能尚未着色
+            self._schedule(0)
+        elif command == "edit" and len(args) > 1 and args[1] in ("undo", "redo"):
+            # 撤销/重做不经过 insert/delete 子命令，全部重新分析
+            self.refresh()
+        return result
+
+    def _modify(self, args):
+        """执行修改，并把涉及的行范围告知缓存"""
+        command = args[0]
+        if command == "insert":
+            indices = [args[1]]
+        elif command == "delete":
+            indices = list(args[1:]) if len(args) > 2 else [args[1], f"{args[1]}+1c"]
+        else:
+            indices = list(args[1:3])
+        rows = [self._line(index) for index in indices]
+        before = self._line("end")
+        result = self._call(*args)
+        after = self._line("end")
+        # 行号从1开始；插入到 "end" 时实际位于原来的最后一行
+        first = min(min(rows), before - 1)
+        removed = max(0, min(max(rows), before - 1) - first)
+        self.cache.edit(first - 1, removed, removed + after - before)
+        self.edits += 1
+        self._provisional = None
+        self._update()
+        return result
+
+    def _line(self, index):
+        return int(self._call("index", index).split(".")[0])
+
+    def line_count(self):
+        return self._line("end-1c")
+
+    def visible_lines(self):
+        """可见区域的行区间 [起始, 结束)，从0开始计数"""
+        top = self._line("@0,0") - 1
+        bottom = self._line(f"@0,{self.widget.winfo_height()}")
+        return top, bottom
+
+    def refresh(self):
+        """丢弃缓存，重新分析全部内容（先着色可见区域）"""
+        self.cache.reset()
+        self._provisional = None
+        self._update()
+
+    def _get_lines(self, first, last):
+        if last <= first:
+            return []
+        return self._call("get", f"{first + 1}.0", f"{last}.end").split("\n")
+
+    def _update(self):
+        """在时间预算内分析并着色，先处理可见区域，剩余部分安排到空闲时"""
+        self._job = None
+        count = self.line_count()
+        top, bottom = self.visible_lines()
+        deadline = time.perf_counter() + self.budget
+        cache = self.cache
+        if top > cache.size and self._provisional != (top, bottom):
+            # 可见区域之前还有大量未分析的行，先临时着色
+            self._provisional = (top, bottom)
+            state = TEXT
+            rows = []
+            for line in self._get_lines(top, min(bottom, count)):
+                tokens, state, _ = lex_line(line, state)
+                rows.append(tokens)
+            self._paint(top, rows)
+        for first, last in cache.relex(self._get_lines, count, deadline=deadline):
+            self._paint(first, cache.tokens[first:last])
+        if cache.pending or cache.size < count:
+            self._schedule(1)
+
+    def _schedule(self, delay):
+        if self._job is None:
+            self._job = self.widget.after(delay, self._update)
+
+    def _paint(self, first, rows):
+        """按记号为 first 行起的各行着色，每种记号只调用一次 tag remove 和 tag add"""
+        if not rows:
+            return
+        ranges = {kind: [] for kind in KINDS}
+        for row, tokens in enumerate(rows, first + 1):
+            for index in range(0, len(tokens), 3):
+                ranges[tokens[index]] += (f"{row}.{tokens[index + 1]}", f"{row}.{tokens[index + 2]}")
+        start, end = f"{first + 1}.0", f"{first + len(rows)}.end"
+        for kind in KINDS:
+            self._call("tag", "remove", kind, start, end)
+            if ranges[kind]:
+                self._call("tag", "add", kind, *ranges[kind])
+        self.painted += len(rows)
+
+    def _ensure(self, lines):
+        """保证前 lines 行已分析，行数不足时返回False"""
+        count = self.line_count()
+        if lines > count:
+            return False
+        cache = self.cache
+        if cache.pending or cache.size < lines:
+            for first, last in cache.relex(self._get_lines, count, until=lines):
+                self._paint(first, cache.tokens[first:last])
+        return True
+
+    def toggle_fold(self, index="insert"):
+        """折叠或展开 index 所在行的标签子树，返回该行是否可以折叠"""
+        line = self._line(index)
+        header_end = self._call("index", f"{line}.end")
+        splitlist = self.widget.tk.splitlist
+        for name in splitlist(self._call("tag", "names", header_end)):
+            name = str(name)
+            if name.startswith("hl_fold_") and str(splitlist(self._call("tag", "ranges", name))[0]) == header_end:
+                self._call("tag", "delete", name)
+                self._call("tag", "remove", FOLD_HEADER, f"{line}.0", header_end)
+                return True
+        end = self.cache.matching_line(line - 1, self._ensure)
+        if end is None:
+            return False
+        # 隐藏标题行行尾到结束标签所在行行首之间的内容
+        self._folds += 1
+        name = f"hl_fold_{self._folds}"
+        self._call("tag", "configure", name, "-elide", 1)
+        self._call("tag", "add", name, header_end, f"{end + 1}.0")
+        self._call("tag", "add", FOLD_HEADER, f"{line}.0", header_end)
+        return True
+
+    def unfold_all(self):
+        for name in self.widget.tk.splitlist(self._call("tag", "names")):
+            if str(name).startswith("hl_fold_"):
+                self._call("tag", "delete", name)
+        self._call("tag", "remove", FOLD_HEADER, "1.0", "end")
@@ -0,0 +1,304 @@
+"""<image> 标签：图片在后台线程中解码、缩放，解码结果按文件和尺寸缓存共用
+
+    <image src="icons/save.png" width="32" height="32" />
+
+width、height 为显示的像素尺寸，图片按比例缩放到不超过该尺寸（只给一个时按该边缩放，
+都不给时按原尺寸显示）。解码完成前显示与目标尺寸相同的占位图，布局不会跳动。
+
+安装了 Pillow 时，读取、解码和缩放都在工作线程中完成，主线程只把解码好的像素
+交给Tk（不透明图片用PPM，透明图片用不压缩的PNG）；没有 Pillow 时工作线程只读取文件，
+由Tk在主线程中解码PNG、GIF、PPM，缩小按整数倍抽样，不放大。
+
+解码得到的 PhotoImage 放在按内存上限淘汰的LRU缓存中，键为
+(绝对路径, 修改时间, 显示尺寸)：同一图片在多个控件、多次渲染中只解码一次，
+文件修改后自动换用新的内容。内存按每像素4字节估算。
+"""
+import io
+import os
+import queue
+import time
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Tk照片图像每像素占用的字节数（RGBA）
+BYTES_PER_PIXEL = 4
+
+
+def _fit(width, height, max_width, max_height):
+    """按比例缩放 (width, height)，使其不超过给定的宽高（0表示不限制）"""
+    scale = 1.0
+    if max_width:
+        scale = max_width / width
+    if max_height:
+        scale = min(scale, max_height / height) if max_width else max_height / height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def decode(path, width=0, height=0):
+    """在工作线程中读取图片，返回 (格式, 数据, 目标尺寸)
+
+    格式为None时数据是原始文件内容，由 to_photo() 交给Tk解码后按目标尺寸抽样。
+    """
+    if Image is None:
+        with open(path, "rb") as file:
+            return None, file.read(), (width, height)
+    with Image.open(path) as image:
+        size = _fit(image.width, image.height, width, height) if width or height else image.size
+        if image.format == "JPEG":
+            # JPEG 可以在解码时直接缩小，省去大部分工作
+            image.draft("RGB", size)
+        transparent = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if transparent else "RGB")
+        if image.size != size:
+            image = image.resize(size, Image.LANCZOS)
+        if transparent:
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", compress_level=0)
+            return "png", buffer.getvalue(), None
+        header = f"P6 {image.width} {image.height} 255\n".encode("ascii")
+        return "ppm", header + image.tobytes(), None
+
+
+def to_photo(master, decoded):
+    """在主线程中把 decode() 的结果变成 PhotoImage"""
+    kind, data, box = decoded
+    if kind is not None:
+        return tk.PhotoImage(master=master, format=kind, data=data)
+    photo = tk.PhotoImage(master=master, data=data)
+    width, height = box
+    if width or height:
+        target = _fit(photo.width(), photo.height(), width, height)
+        factor = max(-(-photo.width() // target[0]), -(-photo.height() // target[1]))
+        if factor > 1:
+            photo = photo.subsample(factor)
+    return photo
+
+
+class ImageCache:
+    """解码后图片的LRU缓存，按估算的内存占用淘汰
+
+    request() 只应在Tk主线程中调用，解码在 workers 个工作线程中进行，
+    解码结果在主线程中用 after() 取回，每次最多用 budget_ms 毫秒创建 PhotoImage。
+    """
+
+    def __init__(self, max_bytes=64 << 20, workers=2, poll_ms=15, budget_ms=8):
+        self.max_bytes = max_bytes
+        self.poll_ms = poll_ms
+        self.budget = budget_ms / 1000
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decoded = 0
+        self.failed = 0
+        # 键 -> (PhotoImage, 字节数)，末尾为最近使用的
+        self._images = OrderedDict()
+        # (路径, 宽, 高) -> 当前的键，文件修改后用来移除旧内容
+        self._current = {}
+        # 键 -> 等待解码结果的回调列表
+        self._pending = {}
+        # (宽, 高) -> 占位图
+        self._placeholders = {}
+        self._results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="markup-image")
+        self._root = None
+        self._poll_job = None
+
+    def key(self, path, width=0, height=0):
+        """缓存键，文件不存在时抛出 OSError"""
+        path = os.path.abspath(path)
+        return path, os.stat(path).st_mtime_ns, width, height
+
+    def request(self, widget, path, width, height, callback):
+        """取得图片：已缓存时直接返回 PhotoImage；否则返回None，
+
+        在后台解码，完成后在主线程中调用 callback(PhotoImage, None)，出错时 callback(None, 异常)。
+        文件不存在时直接抛出 OSError。
+        """
+        key = self.key(path, width, height)
+        entry = self._images.get(key)
+        if entry is not None:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            # 同一图片正在解码，不重复提交
+            waiting.append(callback)
+            return None
+        self._pending[key] = [callback]
+        if self._root is None:
+            self._root = widget._root()
+        results = self._results
+
+        def job():
+            try:
+                results.put((key, decode(key[0], width, height), None))
+            except Exception as e:
+                results.put((key, None, e))
+
+        self._executor.submit(job)
+        if self._poll_job is None:
+            self._poll_job = self._root.after(self.poll_ms, self._poll)
+        return None
+
+    def placeholder(self, widget, width, height):
+        """目标尺寸的空白占位图，同一尺寸共用一个"""
+        photo = self._placeholders.get((width, height))
+        if photo is None:
+            photo = self._placeholders[(width, height)] = tk.PhotoImage(
+                master=widget, width=width, height=height)
+        return photo
+
+    def stats(self):
+        return {
+            "images": len(self._images),
+            "memory": self.memory,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "decoded": self.decoded,
+            "failed": self.failed,
+            "pending": len(self._pending),
+        }
+
+    def clear(self):
+        """清空缓存；正在显示的图片由控件持有，不受影响"""
+        self._images.clear()
+        self._current.clear()
+        self.memory = 0
+
+    def shutdown(self):
+        if self._poll_job is not None:
+            self._root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    def _store(self, key, photo):
+        size = photo.width() * photo.height() * BYTES_PER_PIXEL
+        if size > self.max_bytes:
+            # 比整个缓存还大的图片只给请求它的控件使用
+            return
+        path, _, width, height = key
+        old = self._current.get((path, width, height))
+        if old is not None and old != key and old in self._images:
+            # 文件已修改，旧内容不会再被请求
+            self.memory -= self._images.pop(old)[1]
+        self._current[path, width, height] = key
+        self._images[key] = (photo, size)
+        self.memory += size
+        while self.memory > self.max_bytes:
+            _, (_, evicted) = self._images.popitem(last=False)
+            self.memory -= evicted
+            self.evictions += 1
+
+    def _poll(self):
+        self._poll_job = None
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                key, decoded, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self._pending.pop(key, ())
+            photo = None
+            if error is None:
+                try:
+                    photo = to_photo(self._root, decoded)
+                except tk.TclError as e:
+                    error = e
+            if photo is not None:
+                self.decoded += 1
+                self._store(key, photo)
+            else:
+                self.failed += 1
+            for callback in callbacks:
+                callback(photo, error)
+        if self._pending:
+            # 还有结果未取回时尽快再来，否则等待新的解码结果
+            busy = not self._results.empty()
+            self._poll_job = self._root.after(1 if busy else self.poll_ms, self._poll)
+
+
+# 默认的图片缓存，ImageView 未指定 cache 时使用
+IMAGE_CACHE = ImageCache()
+
+
+class ImageView(ttk.Label):
+    """显示图片文件的标签，图片解码完成前显示占位图
+
+    width、height 为像素尺寸（0表示按图片尺寸），与 ttk.Label 以字符计的宽度不同。
+    """
+
+    def __init__(self, master=None, src="", width=0, height=0, cache=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.cache = cache or IMAGE_CACHE
+        self.src = src
+        self.size = (int(width or 0), int(height or 0))
+        self.photo = None
+        self._load()
+
+    def configure(self, cnf=None, **kwargs):
+        """支持 src、width、height"""
+        if cnf is None and not kwargs:
+            return super().configure()
+        reload = False
+        if "src" in kwargs:
+            src = kwargs.pop("src")
+            reload = src != self.src
+            self.src = src
+        if "width" in kwargs or "height" in kwargs:
+            size = (int(kwargs.pop("width", self.size[0]) or 0), int(kwargs.pop("height", self.size[1]) or 0))
+            reload = reload or size != self.size
+            self.size = size
+        if cnf or kwargs:
+            super().configure(cnf, **kwargs)
+        if reload:
+            self._load()
+
+    config = configure
+
+    def _load(self):
+        src = self.src
+        if not src:
+            self._show(None, "")
+            return
+        width, height = self.size
+        try:
+            photo = self.cache.request(self, src, width, height,
+                                       lambda photo, error: self._loaded(src, photo, error))
+        except OSError:
+            self._show(None, f"[{os.path.basename(src)}]")
+            return
+        if photo is not None:
+            self._show(photo, "")
+        elif width and height:
+            # 占位图与目标尺寸相同，解码完成后布局不变
+            self._show(self.cache.placeholder(self, width, height), "…")
+        else:
+            self._show(None, "…")
+
+    def _loaded(self, src, photo, error):
+        if src != self.src or not self.winfo_exists():
+            # 控件已销毁，或在解码期间换了图片
+            return
+        if photo is None:
+            self._show(None, f"[{os.path.basename(src)}]")
+        else:
+            self._show(photo, "")
+
+    def _show(self, photo, text):
+        # 控件持有正在显示的 PhotoImage，缓存淘汰后图片仍然有效
+        self.photo = photo
+        super().configure(image=photo or "", text=text, compound=tk.CENTER)
@@ -0,0 +1,298 @@
+"""frame 的网格布局和约束布局
+
+默认情况下子控件按各自标签的 pack() 参数依次排列。frame 设置 layout 属性后，
+在 Python 中一次算出全部子元素的位置，再用 grid() 或 place() 放置，
+表单等复杂界面不再需要为每一行嵌套一层 frame。
+
+网格布局 layout="grid"：
+    frame 属性  cols        自动排列时的列数，默认2
+                colweights  逗号分隔的各列权重，如 "0,1"（窗口变宽时第2列拉伸）
+                rowweights  各行权重
+    子元素属性  row, col    所在行列，省略时按顺序放入下一个空位
+                span        跨列数      rowspan  跨行数
+                sticky      对齐方向，默认 "ew"
+
+约束布局 layout="constraint"：子元素用 left、right、top、bottom 和
+place_width、place_height（width、height 已是控件自身的参数）描述边界。
+取值是若干项的和，每项为像素数、容器尺寸的百分比，或同一 frame 中另一个
+子元素（按 id）的 left/right/top/bottom/width/height，
+例如 left="name.right+8"、place_width="50%-12"。
+同一方向上给出两个量即可确定第三个；只给一条边时控件保持自身大小。
+place() 不会撑开容器，约束布局的 frame 需要用 width、height 指定大小。
+"""
+import re
+
+from .attrs import comma_list, memoized, to_int
+from .tags import TAGS
+
+# 布局管理器，名称即控件上对应方法的名字
+PACK = "pack"
+GRID = "grid"
+PLACE = "place"
+
+# 支持 layout 属性的容器标签
+LAYOUT_TAGS = frozenset(('frame',))
+
+# layout 属性 -> 子元素使用的布局管理器，其余取值（horizontal/vertical）仍用 pack
+MANAGERS = {"grid": GRID, "constraint": PLACE}
+
+# 容器上控制布局方式的属性
+CONTAINER_ATTRIBUTES = frozenset(('layout', 'cols', 'colweights', 'rowweights'))
+
+# 子元素上只影响位置的属性，变化时可以原地重新放置，不必重建控件
+CHILD_ATTRIBUTES = frozenset(('row', 'col', 'span', 'rowspan', 'sticky',
+                              'left', 'right', 'top', 'bottom', 'place_width', 'place_height'))
+
+DEFAULT_COLUMNS = 2
+DEFAULT_STICKY = "ew"
+
+_EDGES = ('left', 'right', 'top', 'bottom', 'width', 'height')
+# 一项：可选的符号，加上数字（可带%）或 id.边界
+_TERM_RE = re.compile(r"\s*([+-]?)\s*(?:(\d+(?:\.\d+)?)(%?)|([\w-]+)\.("
+                      + "|".join(_EDGES) + r"))\s*")
+
+
+def manager_of(attrs):
+    """容器的子元素使用的布局管理器"""
+    return MANAGERS.get(attrs.get("layout"), PACK)
+
+
+def arrange(attrs, children):
+    """一次算出容器中全部子元素的位置
+
+    children 为各子元素的属性字典，返回 (布局管理器, 位置参数列表)；
+    pack 布局返回 (PACK, None)，子元素沿用各自的 pack() 参数。
+    """
+    manager = manager_of(attrs)
+    if manager == GRID:
+        return manager, _arrange_grid(attrs, children)
+    if manager == PLACE:
+        return manager, _arrange_constraints(children)
+    return manager, None
+
+
+def placements(element):
+    """与 element 的各子元素一一对应的 (布局管理器, 位置)
+
+    pack 布局时均为None；未注册的标签不创建控件，不参与排列，对应项也为None。
+    """
+    children = list(element)
+    result = [None] * len(children)
+    if element.tag not in LAYOUT_TAGS:
+        return result
+    laid_out = [index for index, child in enumerate(children) if child.tag in TAGS]
+    manager, positions = arrange(element.attrib, [children[index].attrib for index in laid_out])
+    if positions is not None:
+        for index, position in zip(laid_out, positions):
+            result[index] = (manager, position)
+    return result
+
+
+def geometry(manager, position, pack):
+    """合并容器算出的位置与子元素自身的间距，得到 grid()/place() 参数"""
+    if manager == GRID:
+        return dict(position, padx=pack.get("padx", 0), pady=pack.get("pady", 0))
+    return position
+
+
+def configure_container(widget, attrs):
+    """按网格布局的行列权重配置容器，返回Tk调用次数"""
+    if attrs.get("layout") != "grid":
+        return 0
+    calls = 0
+    for configure, name in ((widget.columnconfigure, "colweights"),
+                            (widget.rowconfigure, "rowweights")):
+        weights = attrs.get(name)
+        if weights:
+            for index, weight in enumerate(comma_list(weights)):
+                configure(index, weight=to_int(weight))
+                calls += 1
+    return calls
+
+
+def reset_container(widget):
+    """清除容器上的行列权重（复用控件时避免沿用上次的配置）"""
+    columns, rows = widget.grid_size()
+    for index in range(columns):
+        widget.columnconfigure(index, weight=0)
+    for index in range(rows):
+        widget.rowconfigure(index, weight=0)
+
+
+def forget(widget):
+    """取消控件的布局，不论它由哪个布局管理器管理"""
+    manager = widget.winfo_manager()
+    if manager == GRID:
+        widget.grid_forget()
+    elif manager == PLACE:
+        widget.place_forget()
+    else:
+        widget.pack_forget()
+
+
+# ---- 网格布局 ----
+
+def _arrange_grid(attrs, children):
+    columns = max(1, to_int(attrs.get("cols", DEFAULT_COLUMNS)))
+    occupied = set()
+    row = column = 0
+    positions = []
+    for child in children:
+        span = min(columns, max(1, to_int(child.get("span", 1))))
+        rowspan = max(1, to_int(child.get("rowspan", 1)))
+        if "row" in child or "col" in child:
+            row = to_int(child.get("row", row))
+            column = to_int(child.get("col", column))
+        else:
+            # 从当前位置起找下一个放得下的空位
+            while not _fits(occupied, row, column, span, columns):
+                column += 1
+                if column + span > columns:
+                    row, column = row + 1, 0
+        for r in range(row, row + rowspan):
+            for c in range(column, column + span):
+                occupied.add((r, c))
+
+        position = {"row": row, "column": column,
+                    "sticky": child.get("sticky", DEFAULT_STICKY)}
+        if span > 1:
+            position["columnspan"] = span
+        if rowspan > 1:
+            position["rowspan"] = rowspan
+        positions.append(position)
+
+        column += span
+        if column >= columns:
+            row, column = row + 1, 0
+    return positions
+
+
+def _fits(occupied, row, column, span, columns):
+    if column + span > columns:
+        return False
+    return all((row, c) not in occupied for c in range(column, column + span))
+
+
+# ---- 约束布局 ----
+# 取值表示为 (像素, 容器尺寸的比例)，对应 place() 的 x/relx、width/relwidth 等参数
+
+@memoized
+def parse_expression(text):
+    """将约束表达式解析为项的元组：(符号, 像素, 比例) 或 (符号, id, 边界)"""
+    terms = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TERM_RE.match(text, position)
+        if match is None or (terms and not match.group(1)):
+            raise ValueError(f"无法解析的约束: {text!r}")
+        sign = -1 if match.group(1) == "-" else 1
+        number, percent, name, edge = match.group(2, 3, 4, 5)
+        if number is None:
+            terms.append((sign, name, edge))
+        elif percent:
+            terms.append((sign, 0, float(number) / 100))
+        else:
+            terms.append((sign, float(number), 0))
+        position = match.end()
+    if not terms:
+        raise ValueError(f"约束为空: {text!r}")
+    return tuple(terms)
+
+
+# 各方向的边界 -> 子元素上对应的属性名
+_ATTRIBUTES = {
+    ("left", "right", "width"): ("left", "right", "place_width"),
+    ("top", "bottom", "height"): ("top", "bottom", "place_height"),
+}
+
+
+class _Constraints:
+    """按需求解各子元素的边界，引用其他子元素时递归求解并检测循环"""
+
+    def __init__(self, children):
+        self.children = children
+        self.ids = {child["id"]: index for index, child in enumerate(children) if child.get("id")}
+        self.solved = {}
+        self.solving = set()
+
+    def edges(self, index):
+        """返回子元素的 {边界: (像素, 比例)}，自身大小决定的边界不在其中"""
+        edges = self.solved.get(index)
+        if edges is not None:
+            return edges
+        if index in self.solving:
+            raise ValueError("约束中存在循环引用")
+        self.solving.add(index)
+        child = self.children[index]
+        edges = {}
+        for axis in (("left", "right", "width"), ("top", "bottom", "height")):
+            values = {edge: self.value(child[name])
+                      for edge, name in zip(axis, _ATTRIBUTES[axis]) if name in child}
+            edges.update(_solve_axis(values, *axis))
+        self.solving.discard(index)
+        self.solved[index] = edges
+        return edges
+
+    def value(self, text):
+        pixels = ratio = 0
+        for term in parse_expression(text):
+            sign = term[0]
+            if isinstance(term[1], str):
+                _, name, edge = term
+                if name not in self.ids:
+                    raise ValueError(f"约束引用了不存在的id: {name}")
+                edges = self.edges(self.ids[name])
+                if edge not in edges:
+                    raise ValueError(f"{name}.{edge} 由控件自身大小决定，不能被引用")
+                term_pixels, term_ratio = edges[edge]
+            else:
+                _, term_pixels, term_ratio = term
+            pixels += sign * term_pixels
+            ratio += sign * term_ratio
+        return pixels, ratio
+
+
+def _solve_axis(values, start, end, size):
+    """一个方向上由任意两个量求第三个；只有一条边时另一条边未知"""
+    def minus(a, b):
+        return a[0] - b[0], a[1] - b[1]
+
+    def plus(a, b):
+        return a[0] + b[0], a[1] + b[1]
+
+    if start in values and end in values:
+        values[size] = minus(values[end], values[start])
+    elif start in values and size in values:
+        values[end] = plus(values[start], values[size])
+    elif end in values and size in values:
+        values[start] = minus(values[end], values[size])
+    elif start not in values and end not in values:
+        values[start] = (0, 0)
+    return values
+
+
+def _number(value):
+    return int(value) if value == int(value) else value
+
+
+def _arrange_constraints(children):
+    constraints = _Constraints(children)
+    positions = []
+    for index in range(len(children)):
+        edges = constraints.edges(index)
+        # 只给出右边或下边时，以控件的右边或下边对齐
+        anchor = ("s" if "top" not in edges else "n") + ("e" if "left" not in edges else "w")
+        position = {"anchor": anchor}
+        for edge, fallback, pixels_name, ratio_name in (
+                ("left", "right", "x", "relx"), ("top", "bottom", "y", "rely"),
+                ("width", None, "width", "relwidth"), ("height", None, "height", "relheight")):
+            value = edges.get(edge) or (edges.get(fallback) if fallback else None)
+            if value is None:
+                continue
+            pixels, ratio = value
+            position[pixels_name] = _number(pixels)
+            if ratio:
+                position[ratio_name] = ratio
+        positions.append(position)
+    return positions
@@ -0,0 +1,149 @@
+"""实时预览：编辑器内容变化后防抖，只重新解析和渲染发生变化的顶层子树
+
+LivePreview 监听编辑器的 <<Modified>> 事件，停止输入 delay_ms 毫秒后回调；
+LiveDocument 记录上次渲染的文本中各顶层子元素的位置，据此找出一次编辑
+只落在哪个顶层子元素内，只解析这一段文本。
+"""
+import re
+
+from .node import parse_nodes
+
+# 注释、声明和标签；属性值中不能出现 ">"，与分词器的限制相同
+_TAG_RE = re.compile(r'<!--.*?-->|<[?!][^>]*>|<(/?)(\w+)[^>]*?(/?)>', re.S)
+
+
+def toplevel_spans(text):
+    """返回根元素各直接子元素在 text 中的 (起始, 结束, 标签名)"""
+    spans = []
+    depth = 0
+    start = 0
+    name = None
+    for match in _TAG_RE.finditer(text):
+        closing, tag, self_closing = match.groups()
+        if closing is None:
+            # 注释或声明
+            continue
+        if closing:
+            depth -= 1
+            if depth == 1:
+                spans.append((start, match.end(), name))
+        else:
+            if depth == 1:
+                start = match.start()
+                name = tag
+            if self_closing:
+                if depth == 1:
+                    spans.append((start, match.end(), name))
+            else:
+                depth += 1
+    return spans
+
+
+def _element_end(fragment):
+    """返回 fragment 开头的元素结束的位置，元素不完整时返回None"""
+    depth = 0
+    for match in _TAG_RE.finditer(fragment):
+        closing, _, self_closing = match.groups()
+        if closing is None:
+            continue
+        if closing:
+            depth -= 1
+        elif not self_closing:
+            depth += 1
+        if depth == 0:
+            return match.end()
+    return None
+
+
+def _changed_range(old_text, new_text):
+    """返回旧文本中发生变化的区间 (起始, 结束) 和长度变化量"""
+    limit = min(len(old_text), len(new_text))
+    prefix = 0
+    while prefix < limit and old_text[prefix] == new_text[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_text[-1 - suffix] == new_text[-1 - suffix]:
+        suffix += 1
+    return prefix, len(old_text) - suffix, len(new_text) - len(old_text)
+
+
+class LiveDocument:
+    """上次成功渲染的文本及其顶层子元素区间"""
+
+    def __init__(self):
+        self.text = None
+        self.spans = []
+        self.tags = []
+
+    def update(self, text):
+        """记录渲染成功的文本，text 为None时下次编辑总是整体渲染"""
+        self.text = text
+        self.spans = toplevel_spans(text) if text else []
+        self.tags = [tag for _, _, tag in self.spans]
+
+    def locate(self, new_text, node):
+        """找出编辑所在的顶层子元素，返回 (下标, 新的子元素)
+
+        编辑跨越多个子元素、涉及根元素、碰到子元素的边界（可能是在两个子元素之间
+        插入或删除元素），或渲染树与文本对应不上时返回None；
+        子元素文本不完整时抛出 ParseError。
+        """
+        if self.text is None or node is None:
+            return None
+        # 渲染树的顶层节点与文本中的顶层元素需一一对应（未知标签、嵌套window不满足）
+        if [child.tag for child in node.children] != self.tags:
+            return None
+
+        start, end, delta = _changed_range(self.text, new_text)
+        for index, (span_start, span_end, _) in enumerate(self.spans):
+            # 编辑须严格落在子元素内部：从边界开始或结束的编辑可能增删了相邻元素
+            if span_start < start and end < span_end:
+                fragment = new_text[span_start:span_end + delta]
+                element_end = _element_end(fragment)
+                if element_end is not None and fragment[element_end:].strip():
+                    # 编辑在子元素之后又插入了元素
+                    return None
+                element = parse_nodes(fragment)
+                if element.tag != self.tags[index]:
+                    return None
+                return index, element
+            if span_start >= start:
+                break
+        return None
+
+
+class LivePreview:
+    """编辑器内容变化后防抖回调 on_change()"""
+
+    def __init__(self, editor, on_change, delay_ms=25):
+        self.editor = editor
+        self.on_change = on_change
+        self.delay_ms = delay_ms
+        self.enabled = False
+        self._job = None
+        editor.bind("<<Modified>>", self._on_modified, add="+")
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.cancel()
+
+    def cancel(self):
+        if self._job is not None:
+            self.editor.after_cancel(self._job)
+            self._job = None
+
+    def _on_modified(self, event=None):
+        # 重置修改标志本身也会触发一次 <<Modified>>
+        if not self.editor.edit_modified():
+            return
+        self.editor.edit_modified(False)
+        if not self.enabled:
+            return
+        self.cancel()
+        self._job = self.editor.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._job = None
+        self.on_change()
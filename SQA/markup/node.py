@@ -0,0 +1,140 @@
+"""紧凑的文档模型，代替 xml.etree.ElementTree.Element
+
+每个节点只有几个 __slots__ 字段：
+    tag       标签名（已驻留）
+    children  子节点元组，叶子节点共用同一个空元组
+    text      标签之间的文本，没有时为None
+属性拆成“属性名元组 + 属性值元组”两部分保存，属性名相同的节点共用同一个
+属性名元组，同一文档中相同的属性值也只保存一份。
+
+节点提供渲染器用到的 Element 接口：tag、attrib、get()、遍历和 len()，
+其中 attrib 每次访问都会新建字典，只适合在渲染时临时使用。
+
+内存约为 Element 树的三分之一，代价是解析变慢：expat 的每个事件都要回调 Python
+中的 NodeBuilder，parse_nodes 比 ET.fromstring 慢约1.4~1.55倍（见 benchmarks/bench_memory.py）。
+"""
+import sys
+import xml.etree.ElementTree as ET
+
+_EMPTY = ()
+
+# 属性名元组 -> 共享的同一个元组，所有文档共用
+_SHAPES = {(): ()}
+
+
+class Node:
+    """一个标记元素"""
+
+    __slots__ = ('tag', 'names', 'values', 'children', 'text')
+
+    def __init__(self, tag, names=_EMPTY, values=_EMPTY, children=_EMPTY, text=None):
+        self.tag = tag
+        self.names = names
+        self.values = values
+        self.children = children
+        self.text = text
+
+    @property
+    def attrib(self):
+        return dict(zip(self.names, self.values))
+
+    def get(self, name, default=None):
+        names = self.names
+        if name in names:
+            return self.values[names.index(name)]
+        return default
+
+    def items(self):
+        return zip(self.names, self.values)
+
+    def iter(self):
+        """按先序遍历子树中的全部节点（含自身）"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+    def __getitem__(self, index):
+        return self.children[index]
+
+    def __repr__(self):
+        return f"<Node {self.tag!r} at {id(self):#x}>"
+
+
+class NodeBuilder:
+    """构造 Node 树，可作为 ET.XMLParser 的 target，也可以直接调用"""
+
+    def __init__(self):
+        self.root = None
+        self._stack = []
+        self._data = []
+        # 同一文档中相同的属性值只保存一份
+        self._values = {}
+
+    @property
+    def current(self):
+        """当前未闭合的最内层节点，没有时为None"""
+        return self._stack[-1][0] if self._stack else None
+
+    def start(self, tag, attrib):
+        self._flush()
+        if attrib:
+            names = tuple(attrib)
+            shared = _SHAPES.get(names)
+            if shared is None:
+                shared = _SHAPES[names] = tuple(map(sys.intern, names))
+            names = shared
+            values = tuple(attrib.values())
+            values = tuple(map(self._values.setdefault, values, values))
+        else:
+            names = values = _EMPTY
+        node = Node(sys.intern(tag), names, values)
+        if self._stack:
+            self._stack[-1][1].append(node)
+        elif self.root is None:
+            self.root = node
+        self._stack.append((node, []))
+        return node
+
+    def end(self, tag):
+        self._flush()
+        node, children = self._stack.pop()
+        if children:
+            node.children = tuple(children)
+        return node
+
+    def data(self, text):
+        self._data.append(text)
+
+    def close(self):
+        # 未闭合的节点（只在直接调用时出现）也需要收尾
+        while self._stack:
+            self.end(None)
+        return self.root
+
+    def _flush(self):
+        """把累积的文本设为当前节点的 text，只保留去掉首尾空白后非空的文本"""
+        if self._data:
+            text = ''.join(self._data).strip()
+            self._data = []
+            if text and self._stack:
+                self._stack[-1][0].text = text
+
+
+# 分块送入解析器，长文档在后台线程解析期间Tk主线程仍有机会拿到GIL
+PARSE_CHUNK_SIZE = 64 * 1024
+
+
+def parse_nodes(markup_text):
+    """解析XML文本为 Node 树，格式错误时抛出 ParseError"""
+    parser = ET.XMLParser(target=NodeBuilder())
+    for start in range(0, len(markup_text), PARSE_CHUNK_SIZE):
+        parser.feed(markup_text[start:start + PARSE_CHUNK_SIZE])
+    return parser.close()
@@ -0,0 +1,379 @@
+"""渲染计划：将解析后的标记树编译为扁平、预先解析好属性的控件构造指令列表
+
+同一份标记文本只需编译一次，之后的渲染直接按指令创建控件，
+不再遍历元素树，也不再重复解释 font、values 等属性。
+"""
+import functools
+import hashlib
+import os
+import tkinter as tk
+from collections import OrderedDict
+
+from .attrs import shared_font, to_int
+from .layout import LAYOUT_TAGS, PACK, arrange, configure_container, geometry
+from .node import parse_nodes
+from .pool import outer_widget
+from .tags import (BIND_CONTENT, BOOLEAN_VAR, CONTAINER_TAGS, DEFINITION_TAGS, LAZY_TAGS, STRING_VAR, TAGS,
+                   WIDGET_CLASSES, Instruction)
+
+# 编译器版本，compile_node 的输出格式或含义变化时加一，使磁盘缓存失效
+PLAN_VERSION = 8
+
+class RenderPlan:
+    """编译后的文档：根元素属性和按先序排列的构造指令
+
+    sources 为编译时读取的被包含文件 ((路径, 修改时间), ...)，任何一个变化后计划即过期。
+    """
+
+    __slots__ = ('attrs', 'instructions', 'sources')
+
+    def __init__(self, attrs, instructions, sources=()):
+        self.attrs = attrs
+        self.instructions = instructions
+        self.sources = sources
+
+    def stale(self):
+        """被包含的文件是否已修改或删除"""
+        return sources_changed(self.sources)
+
+
+def plan_key(markup_text, base_dir=None):
+    """渲染计划的缓存键
+
+    使用了 <include> 的文档还取决于 base_dir：文本相同、目录不同时包含的是不同的文件，
+    因此键中加入解析后的绝对路径（未指定时为当前目录）。
+    """
+    data = markup_text.encode("utf-8")
+    if b"<include" in data:
+        data += b"\0" + os.path.realpath(base_dir or os.getcwd()).encode("utf-8", "surrogateescape")
+    return hashlib.sha1(data).hexdigest()
+
+
+def sources_changed(sources):
+    """((路径, 修改时间), ...) 中是否有文件已修改或删除"""
+    for path, mtime in sources:
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+class RenderNode:
+    """记录一个已渲染的元素及其控件，供下次渲染比对"""
+
+    __slots__ = ('tag', 'attrs', 'widget', 'children')
+
+    def __init__(self, tag, attrs, widget):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.widget = widget
+        self.children = []
+
+    def count(self):
+        """子树中的节点数"""
+        return 1 + sum(child.count() for child in self.children)
+
+
+def compile_node(tag, attrs, parent=-1):
+    """按标签注册表将单个元素编译为构造指令，window 和未注册的标签返回None"""
+    spec = TAGS.get(tag)
+    if spec is None:
+        return None
+    return spec.compile(attrs, parent)
+
+
+def _shared(pool, options):
+    """返回与 options 内容相同的共享字典，使相同的参数在计划中只保存一份
+
+    计划中的字典只读，共享后 marshal 序列化时也只写入一次。
+    """
+    key = tuple((name, tuple(value) if isinstance(value, list) else value)
+                for name, value in options.items())
+    return pool.setdefault(key, options)
+
+
+def compile_document(root, components=None, base_dir=None):
+    """将以window为根的元素树编译为渲染计划
+
+    components 为组件作用域（见 markup.components），未指定时按根元素下的
+    component、include 创建；include 的相对路径相对于 base_dir，默认为当前目录。
+    """
+    instructions = []
+    pool = {}
+    if components is None and any(child.tag in DEFINITION_TAGS for child in root):
+        from .components import LIBRARY
+        components = LIBRARY.scope(root, base_dir)
+
+    def visit(element, parent):
+        for child in element:
+            if child.tag == "window":
+                # 嵌套的window只渲染其子元素
+                visit(child, parent)
+                continue
+            if components is not None and child.tag in components:
+                # 组件实例按缓存的模板展开，顶层元素同样检查 tab 的位置
+                components.instantiate(child, parent, element.tag, instructions, pool)
+                continue
+            if (child.tag == "tab") != (element.tag == "tabs"):
+                raise ValueError("tab 只能直接放在 tabs 中，tabs 中也只能放 tab")
+            spec = TAGS.get(child.tag)
+            if spec is None:
+                continue
+            instruction = spec.compile(child.attrib, parent)
+            index = len(instructions)
+            instructions.append(None)
+            if child.tag in CONTAINER_TAGS or child.tag in LAZY_TAGS:
+                visit(child, index)
+                if child.tag in LAYOUT_TAGS:
+                    _layout_children(instructions, index, child.attrib, pool)
+            instructions[index] = instruction._replace(
+                kwargs=_shared(pool, instruction.kwargs),
+                pack=_shared(pool, instruction.pack),
+                attrs=_shared(pool, dict(instruction.attrs)),
+                size=len(instructions) - index - 1,
+            )
+
+    visit(root, -1)
+    sources = tuple(components.sources.items()) if components is not None else ()
+    return RenderPlan(dict(root.attrib), instructions, sources)
+
+
+def _layout_children(instructions, index, attrs, pool):
+    """按容器的 layout 属性一次算出其直接子元素的位置，写回子元素的指令"""
+    children = [position for position in range(index + 1, len(instructions))
+                if instructions[position].parent == index]
+    manager, positions = arrange(attrs, [instructions[position].attrs for position in children])
+    if positions is None:
+        return
+    for position, placement in zip(children, positions):
+        child = instructions[position]
+        instructions[position] = child._replace(pack=_shared(pool, geometry(manager, placement, child.pack)),
+                                                manager=manager)
+
+
+def with_placement(instruction, placement):
+    """按父容器算出的 (布局管理器, 位置) 替换指令的布局参数"""
+    manager, position = placement
+    return instruction._replace(pack=geometry(manager, position, instruction.pack),
+                                manager=manager)
+
+
+def parse_markup(markup_text):
+    """解析标记文本为 Node 树并检查根元素，格式错误时抛出 ParseError 或 ValueError"""
+    root_element = parse_nodes(markup_text)
+    if root_element.tag != "window":
+        raise ValueError("根元素必须是window")
+    return root_element
+
+
+def compile_markup(markup_text, base_dir=None):
+    """解析并编译标记文本，include 的相对路径相对于 base_dir"""
+    return compile_document(parse_markup(markup_text), base_dir=base_dir)
+
+
+def build_widget(instruction, parent, renderer, pool=None, host=None):
+    """按指令创建并布局一个控件
+
+    instruction.manager 为 pack 以外的布局管理器时，用 grid()/place() 放置。
+    renderer 需要提供 widgets、variables、data_sources 和 get_command_handler()，
+    有 bind 属性时还需要 binder（markup.binding.Binder）。
+    指定 pool 时从控件池中取控件，控件以 host 为父控件创建，再放入 parent 中布局。
+    """
+    kwargs = instruction.kwargs
+    if instruction.variable is not None:
+        name, kind = instruction.variable
+        variables = renderer.variables
+        # 确保变量存在
+        if name not in variables:
+            variables[name] = tk.BooleanVar() if kind == BOOLEAN_VAR else tk.StringVar()
+        kwargs = dict(kwargs, variable=variables[name])
+    handler = None
+    if instruction.command is not None:
+        handler = renderer.get_command_handler(instruction.command)
+        kwargs = dict(kwargs, command=handler)
+    if "source" in kwargs:
+        kwargs = dict(kwargs, source=renderer.data_sources.get(kwargs["source"], ()))
+    if "font" in kwargs:
+        # 计划中保存字体元组，创建控件时换成共享的 Font 对象
+        kwargs = dict(kwargs, font=shared_font(kwargs["font"], parent))
+    bind = instruction.bind
+    if bind is not None and bind[2] != BIND_CONTENT:
+        path, kind, option = bind
+        kwargs = dict(kwargs, **{option: renderer.binder.variable(path, kind)})
+
+    if pool is None:
+        widget = WIDGET_CLASSES[instruction.widget](parent, **kwargs)
+    else:
+        widget = pool.acquire(instruction.widget, host, kwargs)
+
+    if instruction.tag == "tab":
+        # 标签页由所在的 Notebook 管理布局
+        parent.add(outer_widget(widget), **instruction.pack)
+    elif instruction.manager == PACK:
+        if pool is None:
+            widget.pack(**instruction.pack)
+        else:
+            widget.pack(in_=parent, **instruction.pack)
+    else:
+        # 网格/约束布局的位置已在编译时算好
+        place = getattr(widget, instruction.manager)
+        if pool is None:
+            place(**instruction.pack)
+        else:
+            place(in_=parent, **instruction.pack)
+    if bind is not None and bind[2] == BIND_CONTENT:
+        renderer.binder.attach_text(bind[0], widget)
+    if hasattr(handler, "track"):
+        # 命令注册表中的命令（markup.commands.Command）在异步执行期间禁用按钮
+        handler.track(widget)
+    if instruction.tag in LAYOUT_TAGS:
+        configure_container(widget, instruction.attrs)
+    if instruction.id:
+        renderer.widgets[instruction.id] = widget
+    return widget
+
+
+def execute_plan(plan, container, renderer, pool=None, host=None, profiler=None):
+    """在容器中按顺序执行渲染计划，返回根渲染节点"""
+    root, steps = iter_plan(plan, container, renderer, pool, host, profiler)
+    for _ in steps:
+        pass
+    return root
+
+
+def iter_plan(plan, container, renderer, pool=None, host=None, profiler=None):
+    """返回 (根渲染节点, 步骤迭代器)，每迭代一步创建一个控件，用于分批渲染
+
+    指定 profiler（见 markup.profile）时记录每个控件的创建耗时。
+    """
+    root = RenderNode("window", plan.attrs, container)
+    nodes = [None] * len(plan.instructions)
+    steps = _execute_steps(plan.instructions, 0, len(plan.instructions), root, nodes,
+                           renderer, pool, host, profiler)
+    return root, steps
+
+
+def _execute_range(*args):
+    """一次执行完一段指令"""
+    for _ in _execute_steps(*args):
+        pass
+
+
+def _execute_steps(instructions, start, end, root, nodes, renderer, pool, host, profiler):
+    """逐条执行 instructions[start:end]，延迟标签的子树登记到所在的 Notebook 上"""
+    index = start
+    while index < end:
+        instruction = instructions[index]
+        parent = root if instruction.parent < 0 else nodes[instruction.parent]
+        if profiler is None:
+            widget = build_widget(instruction, parent.widget, renderer, pool, host)
+        else:
+            token = profiler.begin()
+            widget = build_widget(instruction, parent.widget, renderer, pool, host)
+            profiler.end(token, instruction.tag, widget, parent.widget)
+        node = RenderNode(instruction.tag, instruction.attrs, widget)
+        parent.children.append(node)
+        nodes[index] = node
+        yield index
+
+        index += 1
+        if instruction.tag in LAZY_TAGS:
+            # 跳过子树，首次选中该标签页时再执行
+            subtree_end = index + instruction.size
+            load = functools.partial(_execute_range, instructions, index, subtree_end,
+                                     root, nodes, renderer, pool, host, profiler)
+            unload = functools.partial(unload_node, node, renderer, pool)
+            parent.widget.defer(widget, load, unload)
+            index = subtree_end
+
+
+def forget_ids(node, widgets):
+    """从 id 映射中移除节点子树（含节点本身）登记的控件"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        node_id = current.attrs.get("id")
+        if node_id and widgets.get(node_id) is current.widget:
+            del widgets[node_id]
+        stack.extend(current.children)
+
+
+def unload_node(node, renderer, pool=None):
+    """销毁（或归还到控件池）节点的全部后代控件，保留节点本身"""
+    for child in node.children:
+        forget_ids(child, renderer.widgets)
+    if pool is not None:
+        pool.release_tree(node)
+    else:
+        for child in node.children:
+            if child.widget is not None:
+                outer_widget(child.widget).destroy()
+    node.children = []
+
+
+def widget_options(tag, attrs, names, renderer):
+    """计算增量渲染时可以原地 configure() 的控件选项"""
+    if tag == "window":
+        kwargs = {"width": to_int(attrs.get("width", 400)),
+                  "height": to_int(attrs.get("height", 300))}
+    else:
+        kwargs = compile_node(tag, attrs).kwargs
+
+    options = {}
+    for name in names:
+        if name == "command":
+            options["command"] = renderer.get_command_handler(attrs.get("command", ""))
+        elif name in kwargs:
+            options[name] = kwargs[name]
+        elif name == "font":
+            # 去掉font属性时恢复默认字体
+            options["font"] = ""
+    return options
+
+
+class PlanCache:
+    """以标记文本哈希为键的渲染计划LRU缓存，使用了 <include> 的文档还以 base_dir 为键
+
+    指定 disk_cache 时，内存未命中会先查磁盘缓存，再解析编译。
+    compile 为未命中时的编译函数，默认为 compile_markup；也可以缓存
+    DataTemplate 等其他编译结果（此时不应指定 disk_cache）。
+    缓存本身不加锁，同一时间只应在一个线程中使用。
+    """
+
+    def __init__(self, maxsize=64, disk_cache=None, compile=None):
+        self.maxsize = maxsize
+        self.disk_cache = disk_cache
+        self.compile = compile or compile_markup
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+
+    @staticmethod
+    def key(markup_text, base_dir=None):
+        return plan_key(markup_text, base_dir)
+
+    def get(self, markup_text, base_dir=None):
+        """返回标记文本对应的渲染计划，未命中时解析并编译，include 的相对路径相对于 base_dir"""
+        key = self.key(markup_text, base_dir)
+        plan = self._plans.get(key)
+        if plan is not None and plan.sources and plan.stale():
+            plan = None
+        if plan is not None:
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+        self.misses += 1
+        if self.disk_cache is not None:
+            plan = self.disk_cache.get(markup_text, base_dir)
+        else:
+            plan = self.compile(markup_text, base_dir)
+        self._plans[key] = plan
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        self._plans.clear()
@@ -0,0 +1,139 @@
+"""控件回收池：重复渲染时复用已创建的控件，而不是销毁后重新创建
+
+Tk 控件的父控件在创建后不能更改，因此池中的控件统一以一个长期存在的
+宿主控件为父控件创建，渲染时通过 pack(in_=容器)（或 grid()/place()）放入实际的容器中。
+容器必须是宿主控件本身或其后代。
+"""
+import tkinter as tk
+import weakref
+from collections import OrderedDict
+from tkinter import scrolledtext, ttk
+
+from .layout import forget, reset_container
+from .tabs import LazyNotebook
+
+# 淘汰策略：LRU 淘汰空闲最久的控件；DROP 直接销毁新归还的控件
+LRU = 'lru'
+DROP = 'drop'
+
+
+def outer_widget(widget):
+    """返回实际参与布局的控件（ScrolledText 由外层Frame布局）"""
+    if isinstance(widget, scrolledtext.ScrolledText):
+        return widget.frame
+    return widget
+
+
+def _reset(widget):
+    """清除控件中用户输入的内容
+
+    绑定到数据模型的控件先解除绑定，清除内容时不能改动模型中的值。
+    """
+    if isinstance(widget, scrolledtext.ScrolledText):
+        widget.unbind("<<Modified>>")
+        widget.delete("1.0", tk.END)
+    elif isinstance(widget, (ttk.Combobox, ttk.Entry)):
+        if str(widget.cget("textvariable")):
+            widget.configure(textvariable="")
+        if isinstance(widget, ttk.Combobox):
+            widget.set("")
+        else:
+            widget.delete(0, tk.END)
+    elif isinstance(widget, LazyNotebook):
+        widget.clear_pages()
+    elif isinstance(widget, ttk.Frame):
+        # 作为网格容器时设置过的行列权重
+        reset_container(widget)
+
+
+class WidgetPool:
+    """按控件类型（和构造参数名）分组的控件池"""
+
+    def __init__(self, widget_classes, caps=None, default_cap=256, policy=LRU):
+        self.widget_classes = widget_classes
+        self.caps = dict(caps or {})
+        self.default_cap = default_cap
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 参数签名 -> 空闲控件列表（末尾为最近归还的）
+        self._idle = {}
+        # 控件类名 -> 按归还顺序排列的空闲控件
+        self._idle_order = {}
+        # 控件 -> 参数签名，包括正在使用的控件；增量渲染等直接销毁的控件不经过池，
+        # 用弱引用避免池一直持有它们
+        self._keys = weakref.WeakKeyDictionary()
+
+    def acquire(self, class_name, host, kwargs):
+        """取出一个已按 kwargs 配置好的控件，池中没有时新建"""
+        key = (class_name, tuple(sorted(kwargs)))
+        idle = self._idle.get(key)
+        if idle:
+            widget = idle.pop()
+            del self._idle_order[class_name][widget]
+            widget.configure(**kwargs)
+            # 复用的控件创建得较早，需提到同级控件的最上层，避免被容器遮挡
+            outer_widget(widget).lift()
+            self.hits += 1
+            return widget
+
+        widget = self.widget_classes[class_name](host, **kwargs)
+        self._keys[widget] = key
+        self.misses += 1
+        return widget
+
+    def release(self, widget):
+        """归还控件：取消布局并清除内容，超过上限时按策略淘汰"""
+        key = self._keys.get(widget)
+        if key is None:
+            # 不是池中创建的控件
+            outer_widget(widget).destroy()
+            return
+
+        class_name = key[0]
+        order = self._idle_order.setdefault(class_name, OrderedDict())
+        if len(order) >= self.caps.get(class_name, self.default_cap):
+            if self.policy == DROP or not order:
+                self._destroy(widget)
+                return
+            oldest, oldest_key = order.popitem(last=False)
+            self._idle[oldest_key].remove(oldest)
+            self._destroy(oldest)
+
+        forget(outer_widget(widget))
+        _reset(widget)
+        self._idle.setdefault(key, []).append(widget)
+        order[widget] = key
+
+    def release_tree(self, node):
+        """归还渲染节点下的全部控件（不包括根容器）"""
+        stack = list(node.children)
+        while stack:
+            current = stack.pop()
+            stack.extend(current.children)
+            if current.widget is not None:
+                self.release(current.widget)
+
+    def clear(self):
+        """销毁全部空闲控件"""
+        for idle in self._idle.values():
+            for widget in idle:
+                self._destroy(widget, count=False)
+        self._idle.clear()
+        self._idle_order.clear()
+
+    def stats(self):
+        """命中、未命中、淘汰次数和各类型的空闲控件数"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "idle": {name: len(order) for name, order in self._idle_order.items()},
+        }
+
+    def _destroy(self, widget, count=True):
+        self._keys.pop(widget, None)
+        outer_widget(widget).destroy()
+        if count:
+            self.evictions += 1
@@ -0,0 +1,226 @@
+"""渲染性能分析：按元素和标签类型统计耗时、创建的控件数和Tk调用次数
+
+默认不启用；渲染代码只在 profiler 不为None时调用 begin()/end()，
+关闭时的额外开销只有一次判断。Tk调用次数通过替换控件的 tk 对象统计，
+只对 install() 之后新创建的控件生效。
+
+    profiler = RenderProfiler(on_stats=print)
+    profiler.install(preview_frame)
+    ... 渲染 ...
+    profiler.finish()
+"""
+import time
+import tkinter as tk
+
+from .pool import outer_widget
+
+# 创建控件的Tk命令（ttk::* 之外的）
+_WIDGET_COMMANDS = frozenset((
+    'frame', 'label', 'button', 'entry', 'text', 'canvas', 'scrollbar',
+    'checkbutton', 'radiobutton', 'listbox', 'toplevel', 'labelframe',
+))
+
+
+class _CountingTk:
+    """转发全部调用的 tkapp 代理，统计 call() 次数和其中创建控件的次数"""
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.calls = 0
+        self.widgets = 0
+
+    def call(self, *args):
+        self.calls += 1
+        # 创建控件时全部参数以一个元组传入：(命令, 路径, 选项...)
+        words = args[0] if len(args) == 1 and isinstance(args[0], tuple) else args
+        if (len(words) > 1 and isinstance(words[0], str) and str(words[1]).startswith('.')
+                and (words[0].startswith('ttk::') or words[0] in _WIDGET_COMMANDS)):
+            self.widgets += 1
+        return self._tkapp.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+class ElementRecord:
+    """一个元素的渲染记录，total_ms 包括全部后代"""
+
+    __slots__ = ('tag', 'widget', 'parent', 'self_ms', 'total_ms', 'widgets', 'tk_calls')
+
+    def __init__(self, tag, widget, parent, self_ms, widgets, tk_calls):
+        self.tag = tag
+        self.widget = widget
+        self.parent = parent
+        self.self_ms = self_ms
+        self.total_ms = self_ms
+        self.widgets = widgets
+        self.tk_calls = tk_calls
+
+
+class TagStats:
+    """同一类标签的汇总"""
+
+    __slots__ = ('count', 'self_ms', 'widgets', 'tk_calls')
+
+    def __init__(self):
+        self.count = 0
+        self.self_ms = 0.0
+        self.widgets = 0
+        self.tk_calls = 0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "self_ms": round(self.self_ms, 3),
+            "avg_ms": round(self.self_ms / self.count, 4) if self.count else 0.0,
+            "widgets": self.widgets,
+            "tk_calls": self.tk_calls,
+        }
+
+
+class RenderProfiler:
+    """记录一次渲染中每个元素的耗时，finish() 时汇总并通知回调"""
+
+    def __init__(self, on_stats=None):
+        self.records = []
+        self.tags = {}
+        self._listeners = [on_stats] if on_stats else []
+        self._by_widget = {}
+        self._counter = None
+        self._installed = None
+
+    def add_listener(self, callback):
+        """注册 callback(stats)，每次 finish() 时调用"""
+        self._listeners.append(callback)
+
+    def install(self, widget):
+        """统计此后在 widget 下新创建的控件发出的Tk调用"""
+        if self._installed is not None:
+            return
+        self._counter = _CountingTk(widget.tk)
+        widget.tk = self._counter
+        self._installed = widget
+
+    def uninstall(self):
+        if self._installed is not None:
+            self._installed.tk = self._counter._tkapp
+            self._installed = None
+
+    def reset(self):
+        """开始新一次渲染的统计"""
+        self.records = []
+        self.tags = {}
+        self._by_widget = {}
+
+    def begin(self):
+        """在创建一个元素的控件之前调用，返回传给 end() 的标记"""
+        counter = self._counter
+        if counter is None:
+            return (time.perf_counter(), 0, 0)
+        return (time.perf_counter(), counter.calls, counter.widgets)
+
+    def end(self, token, tag, widget, parent):
+        """控件创建完成后调用；parent 为元素所在的容器控件"""
+        elapsed = (time.perf_counter() - token[0]) * 1000
+        counter = self._counter
+        if counter is None:
+            calls = 0
+            widgets = 0 if widget is None or widget is parent else 1
+        else:
+            calls = counter.calls - token[1]
+            widgets = counter.widgets - token[2]
+        if widget is None or widget is parent:
+            # 未知标签或window：只计入标签汇总
+            record = None
+        else:
+            record = ElementRecord(tag, widget, self._by_widget.get(str(parent)),
+                                   elapsed, widgets, calls)
+            self.records.append(record)
+            self._by_widget[str(widget)] = record
+
+        stats = self.tags.get(tag)
+        if stats is None:
+            stats = self.tags[tag] = TagStats()
+        stats.count += 1
+        stats.self_ms += elapsed
+        stats.widgets += widgets
+        stats.tk_calls += calls
+        return record
+
+    def finish(self, slowest=10):
+        """计算子树耗时，返回统计字典并通知回调"""
+        # 记录按先序创建，逆序累加即可得到子树耗时
+        for record in self.records:
+            record.total_ms = record.self_ms
+        for record in reversed(self.records):
+            if record.parent is not None:
+                record.parent.total_ms += record.total_ms
+
+        stats = self.stats(slowest)
+        for callback in self._listeners:
+            callback(stats)
+        return stats
+
+    def stats(self, slowest=10):
+        roots = [record for record in self.records if record.parent is None]
+        ranked = sorted(self.records, key=lambda r: r.total_ms, reverse=True)[:slowest]
+        return {
+            "total_ms": round(sum(record.total_ms for record in roots), 3),
+            "elements": len(self.records),
+            "widgets": sum(record.widgets for record in self.records),
+            "tk_calls": sum(record.tk_calls for record in self.records),
+            "tags": {tag: tag_stats.as_dict() for tag, tag_stats in self.tags.items()},
+            "slowest": [{"tag": record.tag, "widget": str(record.widget),
+                         "total_ms": round(record.total_ms, 3),
+                         "self_ms": round(record.self_ms, 3)} for record in ranked],
+        }
+
+
+def heat_color(ratio):
+    """0 到 1 的比例映射为从绿到黄再到红的颜色"""
+    ratio = min(max(ratio, 0.0), 1.0)
+    if ratio < 0.5:
+        red, green = int(510 * ratio), 200
+    else:
+        red, green = 255, int(200 * (2 - 2 * ratio))
+    return f"#{red:02x}{green:02x}30"
+
+
+class HeatOverlay:
+    """在预览区中给最慢的子树加上按耗时着色的边框和耗时标签
+
+    叠加层控件以 host 为父控件创建，用 place(in_=控件) 覆盖在被测控件上，
+    被测控件必须是 host 的后代。
+    """
+
+    def __init__(self, host, border=2):
+        self.host = host
+        self.border = border
+        self._items = []
+
+    def show(self, records, limit=15):
+        self.clear()
+        ranked = sorted(records, key=lambda r: r.total_ms, reverse=True)[:limit]
+        if not ranked:
+            return
+        slowest = ranked[0].total_ms or 1.0
+        border = self.border
+        for record in ranked:
+            target = outer_widget(record.widget)
+            color = heat_color(record.total_ms / slowest)
+            for options in ({"relwidth": 1, "height": border},
+                            {"relwidth": 1, "height": border, "rely": 1, "y": -border},
+                            {"relheight": 1, "width": border},
+                            {"relheight": 1, "width": border, "relx": 1, "x": -border}):
+                edge = tk.Frame(self.host, background=color)
+                edge.place(in_=target, **options)
+                self._items.append(edge)
+            label = tk.Label(self.host, text=f"{record.tag} {record.total_ms:.1f}ms",
+                             background=color, font=("TkDefaultFont", 7))
+            label.place(in_=target, relx=1, x=-border, y=border, anchor=tk.NE)
+            self._items.append(label)
+
+    def clear(self):
+        for item in self._items:
+            item.destroy()
+        self._items = []
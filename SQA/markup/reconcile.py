@@ -0,0 +1,210 @@
+"""增量渲染：将新的标记树与上次渲染的控件树比对，只更新发生变化的部分
+
+渲染器需要提供：
+    render_element(element, parent, placement=None) -> RenderNode
+                                                      递归创建控件并返回渲染节点，
+                                                      placement 见 markup.layout.placements()
+    get_command_handler(name)                         命令名到处理函数
+    widgets                                           id 到控件的映射
+"""
+from .attrs import shared_font
+from .layout import CHILD_ATTRIBUTES, geometry, placements
+from .plan import CONTAINER_TAGS, compile_node, forget_ids, widget_options
+from .pool import outer_widget
+from .tags import configurable_attributes
+
+# window 可以原地更新的属性；其余标签的见各自 TagSpec.configurable，
+# 其他属性变化时重建该控件
+WINDOW_ATTRIBUTES = frozenset(('title', 'width', 'height'))
+
+# 子树可能尚未渲染（延迟加载），整体比对不可靠，有变化时总是重建
+OPAQUE_TAGS = ('tabs',)
+
+# 完整重建时每个控件大约需要的Tk调用次数（创建 + pack）
+CALLS_PER_WIDGET = 2
+
+
+class ReconcileStats:
+    """一次增量渲染的统计"""
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.reused = 0
+        self.destroyed = 0
+        self.tk_calls = 0
+        self.full_calls = 0
+
+    @property
+    def saved_calls(self):
+        """相比完整重建节省的Tk调用次数（估算）"""
+        return max(0, self.full_calls - self.tk_calls)
+
+    def summary(self):
+        return (f"新建{self.created} 更新{self.updated} 复用{self.reused} "
+                f"删除{self.destroyed}，节省约{self.saved_calls}次Tk调用")
+
+
+def _keys(items, tag_of, id_of):
+    """为同级节点生成比对键：有id时按id，否则按同类标签中的位置
+
+    同级中重复的id只有第一个按id，其余按位置，保证键互不相同，每个旧节点都能被匹配或删除。
+    """
+    counters = {}
+    seen = set()
+    keys = []
+    for item in items:
+        node_id = id_of(item)
+        if node_id and node_id not in seen:
+            seen.add(node_id)
+            keys.append(('id', node_id))
+        else:
+            tag = tag_of(item)
+            index = counters.get(tag, 0)
+            counters[tag] = index + 1
+            keys.append((tag, index))
+    return keys
+
+
+class Reconciler:
+    """比对新旧标记树，只创建、销毁或 configure() 发生变化的控件"""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+    def reconcile(self, node, element):
+        """用新的根元素更新已渲染的根节点，返回统计信息"""
+        stats = ReconcileStats()
+        # 完整重建需要销毁全部旧控件并重新创建全部新控件（根容器本身保留）
+        stats.full_calls = node.count() - 1 + (self._element_count(element) - 1) * CALLS_PER_WIDGET
+        self._update(node, element, stats)
+        self._reconcile_children(node, element, stats)
+        return stats
+
+    def reconcile_subtree(self, node, index, element):
+        """只用新元素更新 node 的第 index 个子节点，其余子节点不做比对"""
+        stats = ReconcileStats()
+        old = node.children[index]
+        stats.full_calls = old.count() + self._element_count(element) * CALLS_PER_WIDGET
+        if old.tag == element.tag and self._update(old, element, stats):
+            if element.tag in CONTAINER_TAGS:
+                self._reconcile_children(old, element, stats)
+            return stats
+
+        self._unmount(old, stats)
+        node.children[index] = self._mount(element, node.widget, stats)
+        self._restore_order(node.widget, node.children, stats)
+        return stats
+
+    def _element_count(self, element):
+        return 1 + sum(self._element_count(child) for child in element)
+
+    def _reconcile_children(self, node, element, stats):
+        old_nodes = dict(zip(
+            _keys(node.children, lambda n: n.tag, lambda n: n.attrs.get('id')),
+            node.children,
+        ))
+        children = list(element)
+        new_keys = _keys(children, lambda e: e.tag, lambda e: e.get('id'))
+        # 网格/约束布局中子元素的位置互相依赖，整体重新计算
+        child_placements = placements(element)
+
+        new_nodes = []
+        for key, child, placement in zip(new_keys, children, child_placements):
+            old = old_nodes.pop(key, None)
+            if old is not None and old.tag == child.tag and self._update(old, child, stats):
+                if child.tag in CONTAINER_TAGS:
+                    self._reconcile_children(old, child, stats)
+                if placement is not None and old.widget is not None:
+                    self._place(old, child, node.widget, placement, stats)
+                new_nodes.append(old)
+                continue
+            if old is not None:
+                self._unmount(old, stats)
+            new_nodes.append(self._mount(child, node.widget, stats, placement))
+
+        for old in old_nodes.values():
+            self._unmount(old, stats)
+
+        node.children = new_nodes
+        if not any(child_placements):
+            self._restore_order(node.widget, new_nodes, stats)
+
+    def _update(self, node, element, stats):
+        """尝试原地更新节点，属性变化无法 configure() 时返回False"""
+        attrs = element.attrib
+        if node.tag in OPAQUE_TAGS:
+            return False
+        if attrs == node.attrs:
+            stats.reused += 1
+            return True
+
+        changed = {name for name in set(attrs) | set(node.attrs)
+                   if attrs.get(name) != node.attrs.get(name)}
+        if node.tag == 'window':
+            allowed = WINDOW_ATTRIBUTES
+        else:
+            # 位置属性由所在容器重新放置
+            allowed = configurable_attributes(node.tag) | CHILD_ATTRIBUTES
+        if not changed <= allowed:
+            return False
+
+        options = widget_options(node.tag, attrs, changed, self.renderer)
+        if options.get("font"):
+            options["font"] = shared_font(options["font"], node.widget)
+        if options:
+            node.widget.configure(**options)
+            stats.tk_calls += 1
+            if hasattr(options.get("command"), "track"):
+                options["command"].track(node.widget)
+        node.attrs = dict(attrs)
+        stats.updated += 1
+        return True
+
+    def _place(self, node, element, container, placement, stats):
+        """按新算出的位置重新放置保留下来的控件"""
+        manager, position = placement
+        pack = compile_node(element.tag, element.attrib).pack
+        options = geometry(manager, position, pack)
+        getattr(outer_widget(node.widget), manager)(in_=container, **options)
+        stats.tk_calls += 1
+
+    def _mount(self, element, parent, stats, placement=None):
+        new_node = self.renderer.render_element(element, parent, placement)
+        created = new_node.count()
+        stats.created += created
+        stats.tk_calls += created * CALLS_PER_WIDGET
+        return new_node
+
+    def _unmount(self, node, stats):
+        forget_ids(node, self.renderer.widgets)
+        count = node.count()
+        if node.widget is not None:
+            outer_widget(node.widget).destroy()
+        stats.destroyed += count
+        stats.tk_calls += count
+
+    def _restore_order(self, container, nodes, stats):
+        """新建或移动的控件会排在末尾，必要时重新调整pack顺序
+
+        只调整由 pack 管理的子控件，grid()/place() 放置的控件没有先后顺序。
+        """
+        if not any(n.widget is not None for n in nodes):
+            return
+        current = [str(w) for w in container.pack_slaves()]
+        stats.tk_calls += 1
+        packed = set(current)
+        expected = [w for w in (outer_widget(n.widget) for n in nodes if n.widget is not None)
+                    if str(w) in packed]
+        if not expected or current == [str(w) for w in expected]:
+            return
+
+        first = 0
+        while first < min(len(current), len(expected)) and str(expected[first]) == current[first]:
+            first += 1
+        for index in range(first, len(expected)):
+            if index == 0:
+                expected[0].pack_configure(before=current[0])
+            else:
+                expected[index].pack_configure(after=expected[index - 1])
+            stats.tk_calls += 1
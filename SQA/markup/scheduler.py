@@ -0,0 +1,68 @@
+"""分批渲染：把渲染步骤切成多个时间片，在Tk事件循环的回调中逐批执行
+
+每批最多执行 budget_ms 毫秒，批次之间把控制权交还事件循环，
+界面在渲染大文档时仍能响应输入、显示进度。
+"""
+import time
+
+
+class ChunkedRender:
+    """在 widget 的事件循环上分批消费一个渲染步骤迭代器"""
+
+    def __init__(self, widget, budget_ms=12, on_progress=None, on_done=None, on_error=None):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self._steps = None
+        self._total = 0
+        self._done = 0
+        self._job = None
+
+    @property
+    def running(self):
+        return self._steps is not None
+
+    def start(self, steps, total):
+        """开始消费 steps（每执行一步产出一次），正在进行的渲染会被取消"""
+        self.cancel()
+        self._steps = iter(steps)
+        self._total = total
+        self._done = 0
+        self._job = self.widget.after_idle(self._run_batch)
+
+    def cancel(self):
+        """取消尚未执行的批次，已创建的控件保持原样"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self._steps = None
+
+    def _run_batch(self):
+        self._job = None
+        steps = self._steps
+        deadline = time.perf_counter() + self.budget
+        try:
+            for _ in steps:
+                self._done += 1
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                self._steps = None
+                if self.on_progress:
+                    self.on_progress(self._total, self._total)
+                if self.on_done:
+                    self.on_done()
+                return
+        except Exception as e:
+            self._steps = None
+            if self.on_error:
+                self.on_error(e)
+                return
+            raise
+
+        if self.on_progress:
+            self.on_progress(self._done, self._total)
+        # 留出1毫秒处理输入和重绘，再执行下一批
+        self._job = self.widget.after(1, self._run_batch)
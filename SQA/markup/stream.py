@@ -0,0 +1,228 @@
+"""流式渲染：边读取标记文件边渲染，适合生成的超大报表
+
+后台线程分块读取文件送入增量XML解析器，根元素的每个直接子元素在结束标签
+到达时立即编译为一个渲染计划片段，随后从文档树中移除；主线程用 after() 取出片段，
+在时间预算内逐个创建控件。片段队列有长度上限，界面跟不上时解析线程会等待，
+内存中只保留少量尚未渲染的子树，与文件大小无关。
+
+根元素下的 component、include 在解析线程中登记到组件作用域，只对其后的子树生效。
+
+解析到一半出现格式错误时，已渲染的内容保留，错误通过 on_error 报告。
+"""
+import os
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from .components import LIBRARY
+from .node import PARSE_CHUNK_SIZE, Node, NodeBuilder
+from .plan import compile_document, iter_plan
+from .tags import DEFINITION_TAGS
+
+# 解析线程放入队列的消息
+ROOT = 'root'
+FRAGMENT = 'fragment'
+DONE = 'done'
+ERROR = 'error'
+
+
+class SubtreeBuilder(NodeBuilder):
+    """把根元素的每个直接子元素在闭合时交给 on_subtree，不再挂到根节点上
+
+    根元素开始时调用 on_root(根节点)，此时根节点只有属性。
+    """
+
+    def __init__(self, on_root, on_subtree):
+        super().__init__()
+        self.on_root = on_root
+        self.on_subtree = on_subtree
+
+    def start(self, tag, attrib):
+        node = super().start(tag, attrib)
+        if len(self._stack) == 1:
+            self.on_root(node)
+        return node
+
+    def end(self, tag):
+        node = super().end(tag)
+        if len(self._stack) == 1:
+            # 从根节点的子节点列表中移除，处理完即可释放
+            self._stack[0][1].pop()
+            # 属性值去重只在子树内进行，字典不随文件增长
+            self._values = {}
+            self.on_subtree(node)
+        return node
+
+
+def compile_fragment(node, components=None):
+    """把一个顶层子树编译为只含该子树的渲染计划，components 为组件作用域"""
+    return compile_document(Node("window", children=(node,)), components)
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class StreamRender:
+    """在后台线程中流式解析标记文件，在 widget 的事件循环上逐个渲染顶层子树
+
+    on_root(属性字典) 在根元素开始时调用，返回放置控件的容器；
+    on_progress(已读字节数, 文件大小)、on_done()、on_error(异常) 均在主线程中调用。
+    """
+
+    def __init__(self, widget, budget_ms=12, poll_ms=15, max_pending=16,
+                 chunk_size=PARSE_CHUNK_SIZE, on_root=None, on_progress=None,
+                 on_done=None, on_error=None):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.poll_ms = poll_ms
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.on_root = on_root
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.size = 0
+        self.bytes_read = 0
+        self.subtrees = 0
+        self.widgets = 0
+        self._renderer = None
+        self._container = None
+        self._items = None
+        self._stop = None
+        self._steps = None
+        self._job = None
+
+    @property
+    def running(self):
+        return self._items is not None
+
+    def start(self, path, renderer):
+        """开始流式渲染文件，正在进行的渲染会被取消
+
+        renderer 与 build_widget() 的要求相同。
+        """
+        self.cancel()
+        self.size = os.path.getsize(path)
+        self.bytes_read = 0
+        self.subtrees = 0
+        self.widgets = 0
+        self._renderer = renderer
+        self._container = None
+        self._items = queue.Queue(maxsize=self.max_pending)
+        self._stop = threading.Event()
+        threading.Thread(target=self._parse, args=(path, self._items, self._stop),
+                         name="markup-stream", daemon=True).start()
+        self._job = self.widget.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """停止解析线程和尚未执行的渲染，已创建的控件保持原样"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        if self._stop is not None:
+            self._stop.set()
+        self._items = None
+        self._stop = None
+        self._steps = None
+        self._container = None
+
+    # ---- 解析线程 ----
+
+    def _parse(self, path, items, stop):
+        def put(item):
+            # 队列满时等待主线程取走片段，期间检查是否已取消
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            raise _Cancelled()
+
+        def on_root(node):
+            if node.tag != "window":
+                raise ValueError("根元素必须是window")
+            put((ROOT, node.attrib))
+
+        def on_subtree(node):
+            if node.tag in DEFINITION_TAGS:
+                scope.define(node)
+            else:
+                put((FRAGMENT, compile_fragment(node, scope), position[0]))
+
+        position = [0]
+        scope = LIBRARY.scope(base_dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            parser = ET.XMLParser(target=SubtreeBuilder(on_root, on_subtree))
+            with open(path, "rb") as file:
+                while True:
+                    chunk = file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    position[0] += len(chunk)
+                    parser.feed(chunk)
+                    if stop.is_set():
+                        return
+            parser.close()
+            put((DONE,))
+        except _Cancelled:
+            pass
+        except Exception as e:
+            try:
+                put((ERROR, e))
+            except _Cancelled:
+                pass
+
+    # ---- 主线程 ----
+
+    def _poll(self):
+        self._job = None
+        items = self._items
+        deadline = time.perf_counter() + self.budget
+        try:
+            while True:
+                if self._steps is not None:
+                    for _ in self._steps:
+                        self.widgets += 1
+                        if time.perf_counter() >= deadline:
+                            break
+                    else:
+                        self._steps = None
+                if time.perf_counter() >= deadline:
+                    break
+                try:
+                    item = items.get_nowait()
+                except queue.Empty:
+                    break
+                kind = item[0]
+                if kind == ROOT:
+                    self._container = self.on_root(item[1])
+                elif kind == FRAGMENT:
+                    _, plan, self.bytes_read = item
+                    self.subtrees += 1
+                    # 不保留片段的渲染节点，控件创建完后片段即可释放
+                    _, self._steps = iter_plan(plan, self._container, self._renderer)
+                elif kind == DONE:
+                    self.cancel()
+                    self.bytes_read = self.size
+                    if self.on_progress:
+                        self.on_progress(self.size, self.size)
+                    if self.on_done:
+                        self.on_done()
+                    return
+                else:
+                    raise item[1]
+        except Exception as e:
+            self.cancel()
+            if self.on_error:
+                self.on_error(e)
+                return
+            raise
+
+        if self.on_progress:
+            self.on_progress(self.bytes_read, self.size)
+        # 还有待执行的工作时只留出1毫秒处理输入和重绘
+        busy = self._steps is not None or not items.empty()
+        self._job = self.widget.after(1 if busy else self.poll_ms, self._poll)
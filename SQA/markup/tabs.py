@@ -0,0 +1,100 @@
+"""延迟渲染的标签页容器
+
+标签页的内容在第一次被选中时才渲染；设置 unload_after（秒）后，
+长时间未使用的非当前标签页会被卸载，再次选中时重新渲染。
+"""
+import time
+from tkinter import ttk
+
+
+class _Page:
+    """一个延迟加载的标签页"""
+
+    __slots__ = ('load', 'unload', 'loaded', 'last_used')
+
+    def __init__(self, load, unload):
+        self.load = load
+        self.unload = unload
+        self.loaded = False
+        self.last_used = 0.0
+
+
+class LazyNotebook(ttk.Notebook):
+    """标签页内容按需渲染的 ttk.Notebook"""
+
+    def __init__(self, master=None, unload_after=0, **kwargs):
+        super().__init__(master, **kwargs)
+        self.unload_after = float(unload_after)
+        self._pages = {}
+        self._current = None
+        self._timer = None
+        self.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    def configure(self, cnf=None, **kwargs):
+        if "unload_after" in kwargs:
+            self.unload_after = float(kwargs.pop("unload_after"))
+            if cnf is None and not kwargs:
+                return None
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def defer(self, page, load, unload=None):
+        """登记标签页的渲染函数，页面为当前页时立即渲染"""
+        self._pages[str(page)] = _Page(load, unload)
+        if self.select() == str(page):
+            self._on_tab_changed()
+
+    def clear_pages(self):
+        """移除全部标签页，供控件池复用前调用"""
+        self._cancel_timer()
+        for tab in self.tabs():
+            self.forget(tab)
+        self._pages.clear()
+        self._current = None
+
+    def loaded_count(self):
+        """已渲染的标签页数"""
+        return sum(1 for page in self._pages.values() if page.loaded)
+
+    def destroy(self):
+        self._cancel_timer()
+        super().destroy()
+
+    def _on_tab_changed(self, event=None):
+        now = time.monotonic()
+        previous = self._pages.get(self._current)
+        if previous is not None:
+            previous.last_used = now
+
+        self._current = self.select()
+        page = self._pages.get(self._current)
+        if page is not None:
+            page.last_used = now
+            if not page.loaded:
+                page.loaded = True
+                page.load()
+        self._schedule_unload()
+
+    def _schedule_unload(self):
+        if self.unload_after <= 0 or self._timer is not None:
+            return
+        if any(page.loaded and page.unload for path, page in self._pages.items()
+               if path != self._current):
+            self._timer = self.after(int(self.unload_after * 500), self._unload_idle)
+
+    def _unload_idle(self):
+        """卸载超过 unload_after 秒未使用的标签页"""
+        self._timer = None
+        now = time.monotonic()
+        for path, page in self._pages.items():
+            if (path != self._current and page.loaded and page.unload
+                    and now - page.last_used >= self.unload_after):
+                page.unload()
+                page.loaded = False
+        self._schedule_unload()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self.after_cancel(self._timer)
+            self._timer = None
@@ -0,0 +1,318 @@
+"""标签注册表：每个标签只声明一次控件类、属性、默认值和布局方式
+
+编译时按标签名在 TAGS 中查表（O(1)），不再逐个比较标签名。
+第三方标签不需要修改渲染器，注册控件类和标签声明即可：
+
+    register_widget_class("Scale", ttk.Scale)
+    register_tag(TagSpec("slider", "Scale",
+                         options=(Option("from_", "min", 0, to_float),
+                                  Option("to", "max", 100, to_float)),
+                         layout=INLINE, configurable=("min", "max")))
+"""
+import tkinter as tk
+from collections import namedtuple
+from tkinter import scrolledtext, ttk
+
+from .attrs import comma_list, parse_font, parse_pad, to_float, to_int
+from .images import ImageView
+from .tabs import LazyNotebook
+from .virtual import VirtualList
+
+# 控件类名到Tkinter类的映射，指令中只保存类名
+WIDGET_CLASSES = {
+    'Frame': ttk.Frame,
+    'Label': ttk.Label,
+    'Button': ttk.Button,
+    'Entry': ttk.Entry,
+    'Checkbutton': ttk.Checkbutton,
+    'Radiobutton': ttk.Radiobutton,
+    'Combobox': ttk.Combobox,
+    'Separator': ttk.Separator,
+    'ScrolledText': scrolledtext.ScrolledText,
+    'VirtualList': VirtualList,
+    'LazyNotebook': LazyNotebook,
+    'ImageView': ImageView,
+}
+
+# 变量类型
+STRING_VAR = 'string'
+BOOLEAN_VAR = 'boolean'
+
+# bind 属性绑定的是控件内容本身（Text 没有可用的Tk变量）
+BIND_CONTENT = 'content'
+
+# 会渲染子元素的容器标签，注册标签时自动更新
+CONTAINER_TAGS = {'window'}
+
+# 子元素延迟到首次显示时才渲染的标签，注册标签时自动更新
+LAZY_TAGS = set()
+
+# 定义可复用组件的标签，只能直接放在根元素下，本身不渲染（见 markup.components）
+DEFINITION_TAGS = frozenset(('component', 'include'))
+
+# 数据模板的指令标签，本身不创建控件（见 markup.template）
+DIRECTIVE_TAGS = frozenset(('for', 'if', 'else'))
+
+# 标签名 -> TagSpec
+TAGS = {}
+
+# 一条控件构造指令
+#   tag       标记标签名
+#   widget    控件类名，见 WIDGET_CLASSES
+#   kwargs    构造参数；其中的 source 为数据源名，构造时替换为渲染器 data_sources 中的序列
+#   pack      布局参数：pack()/grid()/place() 的参数（见 manager），tab 为 Notebook.add() 参数
+#   parent    父控件在计划中的下标，-1 表示根容器
+#   id        控件id，没有时为None
+#   variable  (变量名, 变量类型)，没有时为None
+#   command   命令名，没有时为None
+#   attrs     原始属性，供增量渲染比对
+#   size      紧随其后的后代指令数
+#   manager   布局管理器 "pack"、"grid" 或 "place"，由父容器的 layout 属性决定
+#   bind      (模型路径, 变量类型, 构造参数名或 BIND_CONTENT)，没有 bind 属性时为None
+Instruction = namedtuple(
+    'Instruction', 'tag widget kwargs pack parent id variable command attrs size manager bind'
+)
+
+
+class Option:
+    """一个构造参数：从属性 attr（默认与参数同名）读取，缺省时取 default，再经 convert 转换
+
+    fixed 为True时不读属性，总是使用 default；convert 返回None时不传该参数。
+    """
+
+    __slots__ = ('name', 'attr', 'default', 'convert')
+
+    def __init__(self, name, attr=None, default="", convert=None, fixed=False):
+        self.name = name
+        self.attr = None if fixed else (attr or name)
+        self.default = default
+        self.convert = convert
+
+
+class Layout:
+    """布局方式：固定的 pack() 参数，加上可由属性覆盖的 padx、pady 默认值
+
+    padx、pady 属性在编译时经 parse_pad 转换为整数。
+    """
+
+    __slots__ = ('fixed', 'padx', 'pady')
+
+    def __init__(self, fixed, padx=0, pady=0):
+        self.fixed = fixed
+        self.padx = padx
+        self.pady = pady
+
+
+# 常用布局
+BLOCK = Layout({"fill": tk.X})
+INLINE = Layout({"side": tk.LEFT}, padx=2)
+EXPAND = Layout({"fill": tk.BOTH, "expand": True}, pady=5)
+
+
+class TagSpec:
+    """一个标签的声明
+
+    tag           标签名
+    widget        控件类名，见 WIDGET_CLASSES
+    options       Option 元组，按顺序生成构造参数（需转换的参数排在后面）
+    layout        Layout，为None时没有 pack() 参数
+    variable      绑定变量的类型（STRING_VAR / BOOLEAN_VAR），变量名取自 variable 属性
+    command       有 command 属性时为缺省命令名，否则为None
+    bind          支持 bind 属性时为接收Tk变量的构造参数名（或 BIND_CONTENT），否则为None
+    container     是否渲染子元素
+    lazy          子元素是否延迟到首次显示时才渲染
+    configurable  增量渲染时可以通过 configure() 原地更新的属性
+    build         可选的 build(attrs, kwargs, pack) -> (kwargs, pack)，处理无法声明的特殊情况
+    extra         build 中读取的其他属性名
+
+    compile(attrs, parent) 返回该元素的 Instruction；
+    attributes 为该标签认识的全部属性名，供校验使用。
+    """
+
+    __slots__ = ('tag', 'widget', 'options', 'layout', 'variable', 'command', 'bind',
+                 'container', 'lazy', 'configurable', 'build', 'attributes', 'compile')
+
+    def __init__(self, tag, widget, options=(), layout=None, variable=None, command=None,
+                 bind=None, container=False, lazy=False, configurable=(), build=None, extra=()):
+        self.tag = tag
+        self.widget = widget
+        self.options = tuple(options)
+        self.layout = layout
+        self.variable = variable
+        self.command = command
+        self.bind = bind
+        self.container = container
+        self.lazy = lazy
+        self.configurable = frozenset(configurable)
+        self.build = build
+
+        attributes = {'id', *extra}
+        attributes.update(option.attr for option in self.options if option.attr is not None)
+        if layout is not None:
+            attributes.update(('padx', 'pady'))
+        if variable:
+            attributes.add('variable')
+        if command is not None:
+            attributes.add('command')
+        if bind is not None:
+            attributes.add('bind')
+        self.attributes = frozenset(attributes)
+        self.compile = _make_compiler(self)
+
+
+def _make_compiler(spec):
+    """为标签生成编译函数 compile(attrs, parent) -> Instruction
+
+    选项在生成时按是否需要转换分好组，编译每个元素时只按组取值和转换。
+    """
+    tag = spec.tag
+    widget = spec.widget
+    # 不读取属性的构造参数
+    constants = {option.name: option.default for option in spec.options if option.attr is None}
+    # (构造参数名, 属性名, 默认值)
+    plain = tuple((option.name, option.attr, option.default)
+                  for option in spec.options if option.attr is not None and option.convert is None)
+    # (构造参数名, 属性名, 默认值, 转换函数)，转换结果为None时不设置该参数
+    converted = tuple((option.name, option.attr, option.default, option.convert)
+                      for option in spec.options if option.attr is not None and option.convert is not None)
+    layout = spec.layout
+    if layout is not None:
+        fixed, padx, pady = layout.fixed, layout.padx, layout.pady
+    build = spec.build
+    variable_kind = spec.variable
+    default_command = spec.command
+    bind_target = spec.bind
+    bind_kind = spec.variable or STRING_VAR
+
+    def compile(attrs, parent):
+        get = attrs.get
+        kwargs = constants.copy()
+        for name, attr, default in plain:
+            kwargs[name] = get(attr, default)
+        for name, attr, default, convert in converted:
+            value = convert(get(attr, default))
+            if value is not None:
+                kwargs[name] = value
+
+        if layout is None:
+            pack = {}
+        else:
+            pack = {**fixed, 'padx': parse_pad(get('padx', padx)), 'pady': parse_pad(get('pady', pady))}
+        if build is not None:
+            kwargs, pack = build(attrs, kwargs, pack)
+
+        variable = (get('variable', ''), variable_kind) if variable_kind else None
+        command = get('command', default_command) if default_command is not None else None
+        bind = None
+        if bind_target is not None:
+            path = get('bind')
+            if path:
+                bind = (path, bind_kind, bind_target)
+        return Instruction(tag, widget, kwargs, pack, parent, get('id'), variable, command,
+                           attrs, 0, 'pack', bind)
+
+    return compile
+
+
+def register_widget_class(name, widget_class):
+    """注册自定义控件类，供 TagSpec.widget 引用"""
+    WIDGET_CLASSES[name] = widget_class
+
+
+def register_tag(spec):
+    """注册（或替换）一个标签"""
+    if spec.widget not in WIDGET_CLASSES:
+        raise ValueError(f"未注册的控件类: {spec.widget}")
+    TAGS[spec.tag] = spec
+    CONTAINER_TAGS.discard(spec.tag)
+    LAZY_TAGS.discard(spec.tag)
+    if spec.container:
+        CONTAINER_TAGS.add(spec.tag)
+    if spec.lazy:
+        LAZY_TAGS.add(spec.tag)
+
+
+def configurable_attributes(tag):
+    """增量渲染时可以原地更新的属性，未注册的标签返回空集合"""
+    spec = TAGS.get(tag)
+    return spec.configurable if spec is not None else frozenset()
+
+
+# ---- 内置标签 ----
+
+def _separator(attrs, kwargs, pack):
+    # 分隔线按方向填充
+    fill = tk.X if kwargs["orient"] == "horizontal" else tk.Y
+    return kwargs, dict(fill=fill, **pack)
+
+
+def _tab(attrs, kwargs, pack):
+    # 标签页由所在的 Notebook 管理布局，pack 参数用于 Notebook.add()
+    return kwargs, {"text": attrs.get("title", "标签页")}
+
+
+_LIST_OPTIONS = (
+    Option("source"),
+    Option("row_height", default=24, convert=to_int),
+    Option("height", default=240, convert=to_int),
+    Option("overscan", default=4, convert=to_int),
+)
+
+_TABLE_OPTIONS = _LIST_OPTIONS + (
+    Option("columns", convert=comma_list),
+    Option("column_width", default=12, convert=to_int),
+)
+
+for _spec in (
+    TagSpec("label", "Label",
+            options=(Option("text"), Option("font", convert=parse_font)),
+            layout=Layout({"anchor": tk.W}, pady=5), bind="textvariable",
+            configurable=("text", "font")),
+    TagSpec("separator", "Separator",
+            options=(Option("orient", default="horizontal"),),
+            layout=Layout({}, pady=5), build=_separator),
+    # 约束布局（place）不会撑开容器，需要用 width、height 指定frame的大小
+    TagSpec("frame", "Frame",
+            options=(Option("width", default=0, convert=to_int),
+                     Option("height", default=0, convert=to_int)),
+            layout=BLOCK, container=True, configurable=("width", "height")),
+    TagSpec("entry", "Entry",
+            options=(Option("width", default=20, convert=to_int),),
+            layout=INLINE, bind="textvariable", configurable=("width",)),
+    TagSpec("radio", "Radiobutton",
+            options=(Option("text"), Option("value")),
+            layout=INLINE, variable=STRING_VAR, bind="variable", configurable=("text",)),
+    TagSpec("checkbox", "Checkbutton",
+            options=(Option("text"),),
+            layout=INLINE, variable=BOOLEAN_VAR, bind="variable", configurable=("text",)),
+    TagSpec("combobox", "Combobox",
+            options=(Option("width", default=20, convert=to_int),
+                     Option("values", convert=comma_list)),
+            layout=INLINE, bind="textvariable", configurable=("width", "values")),
+    TagSpec("text", "ScrolledText",
+            options=(Option("width", default=50, convert=to_int),
+                     Option("height", default=5, convert=to_int),
+                     Option("wrap", default=tk.WORD, fixed=True)),
+            layout=Layout({"fill": tk.X}, pady=5), bind=BIND_CONTENT,
+            configurable=("width", "height")),
+    TagSpec("button", "Button",
+            options=(Option("text", default="按钮"),),
+            layout=Layout({"side": tk.LEFT}, padx=5), command="",
+            configurable=("text", "command")),
+    # 虚拟列表/表格，只为可见行创建控件
+    TagSpec("list", "VirtualList", options=_LIST_OPTIONS, layout=EXPAND),
+    TagSpec("table", "VirtualList", options=_TABLE_OPTIONS, layout=EXPAND),
+    # 标签页容器，各标签页的内容在首次选中时才渲染
+    TagSpec("tabs", "LazyNotebook",
+            options=(Option("unload_after", default=0, convert=to_float),),
+            layout=EXPAND, container=True),
+    TagSpec("tab", "Frame", options=(Option("padding", default=5),), lazy=True, build=_tab,
+            extra=("title",)),
+    # 图片，后台解码，width、height 为像素尺寸
+    TagSpec("image", "ImageView",
+            options=(Option("src"),
+                     Option("width", default=0, convert=to_int),
+                     Option("height", default=0, convert=to_int)),
+            layout=Layout({"anchor": tk.W}, pady=5), configurable=("src", "width", "height")),
+):
+    register_tag(_spec)
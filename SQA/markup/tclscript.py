@@ -0,0 +1,228 @@
+"""Tcl脚本渲染后端：把渲染计划中的一个顶层子树翻译成一段Tcl脚本，一次 tk.eval 创建
+
+逐个控件渲染时，每个控件至少要经过构造、布局两次 Python→Tcl 调用。这里把
+控件创建、选项和布局全部写进同一段脚本，每个顶层子树只调用一次解释器。
+脚本创建的控件没有对应的Python对象；只为有 id 或 command 的元素（以及它们的祖先）
+事后补建包装对象，不产生额外的Tcl调用。
+
+ttk 基本控件之外的控件类（ScrolledText、VirtualList、LazyNotebook 等由Python组合而成）
+无法用脚本创建，遇到时先执行已生成的脚本，再按原来的方式逐个创建该子树。
+
+脚本后端不经过控件池，也不返回渲染节点树，不能与增量渲染同时使用。
+"""
+import itertools
+import re
+import tkinter as tk
+
+from .attrs import comma_list, shared_font, to_int
+from .layout import LAYOUT_TAGS, PACK
+from .plan import RenderNode, _execute_range
+from .tags import BIND_CONTENT, BOOLEAN_VAR, WIDGET_CLASSES
+
+# 控件类名 -> 创建该控件的Tcl命令
+SCRIPT_COMMANDS = {
+    'Frame': 'ttk::frame',
+    'Label': 'ttk::label',
+    'Button': 'ttk::button',
+    'Entry': 'ttk::entry',
+    'Checkbutton': 'ttk::checkbutton',
+    'Radiobutton': 'ttk::radiobutton',
+    'Combobox': 'ttk::combobox',
+    'Separator': 'ttk::separator',
+}
+
+_SAFE_RE = re.compile(r'[\w.:#%+-]+\Z', re.ASCII)
+_SPECIAL_RE = re.compile(r'[\\\[\]{}"$;\s]')
+_ESCAPES = {"\n": "\\n", "\t": "\\t", "\r": "\\r"}
+
+# 每段脚本的控件名前缀不同，同一容器中多次渲染不会重名
+_serial = itertools.count(1)
+
+
+def quote(value):
+    """把Python值写成一个Tcl单词，脚本中不会发生任何替换"""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (tuple, list)):
+        return "[list " + " ".join(map(quote, value)) + "]" if value else "{}"
+    value = str(value)
+    if _SAFE_RE.match(value):
+        return value
+    if not value:
+        return "{}"
+    return _SPECIAL_RE.sub(lambda match: _ESCAPES.get(match.group(), "\\" + match.group()), value)
+
+
+def _options(options):
+    return "".join(f" -{name.rstrip('_')} {quote(value)}" for name, value in options.items())
+
+
+def _wrap(widget_class, master, name, command):
+    """为脚本创建的控件补建Python对象，与 BaseWidget._setup 登记的字段相同"""
+    widget = widget_class.__new__(widget_class)
+    widget.master = master
+    widget.tk = master.tk
+    widget._name = name
+    widget._w = f"{master._w}.{name}" if master._w != "." else f".{name}"
+    widget.children = {}
+    master.children[name] = widget
+    widget.widgetName = command
+    return widget
+
+
+class _Script:
+    """为一个容器累积Tcl脚本，并记录脚本执行后需要补建Python对象的元素"""
+
+    def __init__(self, instructions, container, renderer):
+        self.instructions = instructions
+        self.container = container
+        self.renderer = renderer
+        self.lines = []
+        self.evals = 0
+        self.prefix = f"m{next(_serial)}_"
+        # 指令下标 -> Tcl路径 / Python对象
+        self.paths = {}
+        self.widgets = {-1: container}
+        # (指令下标, 命令处理函数)，脚本执行后补建对象
+        self.pending = []
+        # 处理函数 -> 已注册的Tcl命令名
+        self.commands = {}
+
+    def subtree(self, index):
+        """生成以 index 为根的子树，返回子树之后的下标"""
+        end = index + self.instructions[index].size + 1
+        while index < end:
+            index = self.emit(index)
+        return end
+
+    def emit(self, index):
+        instruction = self.instructions[index]
+        command = SCRIPT_COMMANDS.get(instruction.widget)
+        if command is None or instruction.tag == "tab":
+            return self.fallback(index)
+        parent = self.container._w if instruction.parent < 0 else self.paths[instruction.parent]
+        name = f"{self.prefix}{index}"
+        path = f"{parent}.{name}" if parent != "." else f".{name}"
+        self.paths[index] = path
+
+        options, handler = self.resolve(instruction)
+        lines = self.lines
+        lines.append(f"{command} {path}{_options(options)}")
+        if instruction.manager == PACK:
+            lines.append(f"pack {path}{_options(instruction.pack)}")
+        else:
+            lines.append(f"{instruction.manager} {path}{_options(instruction.pack)}")
+        if instruction.tag in LAYOUT_TAGS and instruction.attrs.get("layout") == "grid":
+            self.weights(path, instruction.attrs)
+        if instruction.id or handler is not None:
+            self.pending.append((index, handler))
+        return index + 1
+
+    def resolve(self, instruction):
+        """与 build_widget 相同地解析变量、命令、字体和绑定，Tcl对象换成名字"""
+        renderer = self.renderer
+        options = dict(instruction.kwargs)
+        if instruction.variable is not None:
+            name, kind = instruction.variable
+            variables = renderer.variables
+            if name not in variables:
+                variables[name] = tk.BooleanVar() if kind == BOOLEAN_VAR else tk.StringVar()
+            options["variable"] = str(variables[name])
+        handler = None
+        if instruction.command is not None:
+            handler = renderer.get_command_handler(instruction.command)
+            if handler is not None:
+                options["command"] = self.register(handler)
+        if "font" in options:
+            options["font"] = str(shared_font(options["font"], self.container))
+        bind = instruction.bind
+        if bind is not None and bind[2] != BIND_CONTENT:
+            path, kind, option = bind
+            options[option] = str(renderer.binder.variable(path, kind))
+        # 值为None的选项与 tkinter 一样不传
+        return {name: value for name, value in options.items() if value is not None}, handler
+
+    def register(self, handler):
+        name = self.commands.get(handler)
+        if name is None:
+            # 命令登记在容器上，容器销毁时一并删除
+            name = self.commands[handler] = self.container._register(handler)
+        return name
+
+    def weights(self, path, attrs):
+        for command, name in (("columnconfigure", "colweights"), ("rowconfigure", "rowweights")):
+            weights = attrs.get(name)
+            if weights:
+                for index, weight in enumerate(comma_list(weights)):
+                    self.lines.append(f"grid {command} {path} {index} -weight {to_int(weight)}")
+
+    def fallback(self, index):
+        """无法用脚本创建的子树：先执行已有脚本，再逐个创建"""
+        self.flush()
+        instruction = self.instructions[index]
+        end = index + instruction.size + 1
+        root = RenderNode("window", {}, self.container)
+        nodes = [None] * len(self.instructions)
+        if instruction.parent >= 0:
+            parent = self.instructions[instruction.parent]
+            nodes[instruction.parent] = RenderNode(parent.tag, {}, self.widget(instruction.parent))
+        _execute_range(self.instructions, index, end, root, nodes, self.renderer, None, None, None)
+        return end
+
+    def widget(self, index):
+        """脚本创建的控件的Python对象，祖先也一并补建"""
+        widget = self.widgets.get(index)
+        if widget is None:
+            instruction = self.instructions[index]
+            master = self.widget(instruction.parent)
+            name = self.paths[index].rpartition(".")[2]
+            widget = self.widgets[index] = _wrap(WIDGET_CLASSES[instruction.widget], master, name,
+                                                 SCRIPT_COMMANDS[instruction.widget])
+        return widget
+
+    def flush(self):
+        """执行累积的脚本，为需要的元素补建Python对象"""
+        if self.lines:
+            self.container.tk.eval("\n".join(self.lines))
+            self.lines = []
+            self.evals += 1
+        renderer = self.renderer
+        for index, handler in self.pending:
+            widget = self.widget(index)
+            instruction = self.instructions[index]
+            if instruction.id:
+                renderer.widgets[instruction.id] = widget
+            if hasattr(handler, "track"):
+                handler.track(widget)
+        self.pending = []
+
+
+def iter_script(plan, container, renderer):
+    """返回 (步骤数, 步骤迭代器)，每一步用一次 tk.eval 创建一个顶层子树
+
+    renderer 与 build_widget() 的要求相同。
+    """
+    instructions = plan.instructions
+    tops = [index for index, instruction in enumerate(instructions) if instruction.parent < 0]
+    return len(tops), _script_steps(instructions, tops, container, renderer)
+
+
+def _script_steps(instructions, tops, container, renderer):
+    script = _Script(instructions, container, renderer)
+    for top in tops:
+        script.subtree(top)
+        script.flush()
+        yield top
+
+
+def execute_script(plan, container, renderer):
+    """一次执行完渲染计划，返回调用 tk.eval 的次数"""
+    instructions = plan.instructions
+    script = _Script(instructions, container, renderer)
+    for index, instruction in enumerate(instructions):
+        if instruction.parent < 0:
+            script.subtree(index)
+            script.flush()
+    return script.evals
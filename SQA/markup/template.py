@@ -0,0 +1,427 @@
+"""数据模板：<for>、<if> 指令和 ${表达式} 属性，编译一次，按数据直接生成渲染计划
+
+    <window title="${title}">
+        <frame layout="grid" cols="2">
+            <for each="row in rows" index="i">
+                <label text="${row.name}：" row="${i}" col="0" />
+                <entry id="field_${i}" width="${row.width or 20}" row="${i}" col="1" />
+            </for>
+        </frame>
+        <if test="len(rows) == 0">
+            <label text="没有数据" />
+        </if>
+        <else>
+            <label text="共${len(rows)}行" />
+        </else>
+    </window>
+
+for 对序列中的每一项渲染其子元素，index 指定保存下标（从0开始）的变量名；
+if 在 test 为真时渲染其子元素，紧跟其后的 else 在为假时渲染。两者本身不创建控件，
+子元素直接放在所在的容器中。属性值中的 ${表达式} 换成表达式的值，
+True/False 写作 1/0，None 写作空串，列表写作逗号分隔的字符串。
+
+表达式只支持一个安全的子集：常量、变量名、成员访问（a.b，对字典即 a["b"]）、下标、
+算术、比较、and/or/not、条件表达式，以及 len、str、int 等少数函数；不能访问以下划线开头的成员。
+变量名取自渲染时传入的数据字典顶层和外层 for 的循环变量，未定义的名字和不存在的成员值为None。
+
+模板编译时每个表达式变成一个闭包；不含指令和表达式的子树预先编译为指令，
+渲染时只复制指令并换上父控件下标。与在Python中拼接标记字符串再解析、编译相比，
+省去了字符串拼接、XML解析和逐个元素的树遍历。
+"""
+import ast
+import operator
+import re
+
+from .layout import LAYOUT_TAGS
+from .node import Node
+from .plan import RenderPlan, _layout_children, _shared, compile_document, parse_markup, sources_changed
+from .tags import DEFINITION_TAGS, DIRECTIVE_TAGS, TAGS
+
+_VALUE_RE = re.compile(r'\$\{([^}]*)\}')
+# 含指令或表达式的标记文本
+_TEMPLATE_RE = re.compile(r'\$\{|<(?:for|if)[\s/>]')
+
+# 表达式中可以调用的函数
+FUNCTIONS = {
+    'len': len, 'str': str, 'int': int, 'float': float, 'abs': abs,
+    'round': round, 'min': min, 'max': max, 'sum': sum,
+}
+
+_BINARY = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+}
+_COMPARE = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Is: operator.is_, ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b, ast.NotIn: lambda a, b: a not in b,
+}
+_UNARY = {ast.Not: operator.not_, ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def is_template(markup_text):
+    """标记文本是否含有 for/if 指令或 ${表达式}，即渲染结果是否依赖数据"""
+    return _TEMPLATE_RE.search(markup_text) is not None
+
+
+def _member(value, name):
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def compile_expression(text):
+    """把表达式编译为闭包 f(作用域字典) -> 值，不支持的语法抛出 ValueError"""
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"表达式语法错误: {text!r}") from None
+    return _compile(tree.body, text)
+
+
+def _compile(node, text):
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda scope: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda scope: scope.get(name)
+
+    if isinstance(node, ast.Attribute):
+        if node.attr.startswith("_"):
+            raise ValueError(f"表达式不能访问以下划线开头的成员: {text!r}")
+        target = _compile(node.value, text)
+        name = node.attr
+        return lambda scope: _member(target(scope), name)
+
+    if isinstance(node, ast.Subscript):
+        target = _compile(node.value, text)
+        key = _compile(node.slice, text)
+
+        def subscript(scope):
+            try:
+                return target(scope)[key(scope)]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return subscript
+
+    if isinstance(node, ast.BoolOp):
+        values = [_compile(value, text) for value in node.values]
+        if isinstance(node.op, ast.And):
+            def all_of(scope):
+                result = None
+                for value in values:
+                    result = value(scope)
+                    if not result:
+                        return result
+                return result
+            return all_of
+
+        def any_of(scope):
+            result = None
+            for value in values:
+                result = value(scope)
+                if result:
+                    return result
+            return result
+        return any_of
+
+    if isinstance(node, ast.Compare):
+        left = _compile(node.left, text)
+        comparisons = [(_operator(_COMPARE, op, text), _compile(right, text))
+                       for op, right in zip(node.ops, node.comparators)]
+        if len(comparisons) == 1:
+            compare, right = comparisons[0]
+            return lambda scope: compare(left(scope), right(scope))
+
+        def chain(scope):
+            value = left(scope)
+            for compare, right in comparisons:
+                other = right(scope)
+                if not compare(value, other):
+                    return False
+                value = other
+            return True
+        return chain
+
+    if isinstance(node, ast.BinOp):
+        apply = _operator(_BINARY, node.op, text)
+        left = _compile(node.left, text)
+        right = _compile(node.right, text)
+        return lambda scope: apply(left(scope), right(scope))
+
+    if isinstance(node, ast.UnaryOp):
+        apply = _operator(_UNARY, node.op, text)
+        operand = _compile(node.operand, text)
+        return lambda scope: apply(operand(scope))
+
+    if isinstance(node, ast.IfExp):
+        test = _compile(node.test, text)
+        body = _compile(node.body, text)
+        orelse = _compile(node.orelse, text)
+        return lambda scope: body(scope) if test(scope) else orelse(scope)
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise ValueError(f"表达式只能调用 {', '.join(FUNCTIONS)}: {text!r}")
+        function = FUNCTIONS[node.func.id]
+        args = [_compile(arg, text) for arg in node.args]
+        return lambda scope: function(*[arg(scope) for arg in args])
+
+    if isinstance(node, (ast.Tuple, ast.List)):
+        items = [_compile(item, text) for item in node.elts]
+        return lambda scope: tuple(item(scope) for item in items)
+
+    raise ValueError(f"表达式不支持 {type(node).__name__}: {text!r}")
+
+
+def _operator(table, op, text):
+    apply = table.get(type(op))
+    if apply is None:
+        raise ValueError(f"表达式不支持运算 {type(op).__name__}: {text!r}")
+    return apply
+
+
+def _text(value):
+    """表达式的值写成属性字符串"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if value is None:
+        return ""
+    if isinstance(value, (tuple, list)):
+        return ",".join(map(_text, value))
+    return str(value)
+
+
+def compile_value(value):
+    """把含 ${表达式} 的属性值编译为闭包 f(作用域) -> 字符串"""
+    parts = _VALUE_RE.split(value)
+    if len(parts) == 3 and not parts[0] and not parts[2]:
+        expression = compile_expression(parts[1])
+        return lambda scope: _text(expression(scope))
+    # 奇数下标为表达式，偶数下标为原样的文本
+    for literal in parts[::2]:
+        if '${' in literal:
+            raise ValueError(f"未闭合的 ${{: {value!r}")
+    pieces = [compile_expression(part) if position % 2 else part
+              for position, part in enumerate(parts) if part or position % 2]
+
+    def join(scope):
+        return "".join(piece if isinstance(piece, str) else _text(piece(scope)) for piece in pieces)
+    return join
+
+
+# 只影响指令中 id、变量、命令、数据绑定字段，不影响构造参数的属性
+_INSTANCE_ATTRIBUTES = frozenset(('id', 'variable', 'command', 'bind'))
+_PACK_ATTRIBUTES = frozenset(('padx', 'pady'))
+
+
+def _is_static(node):
+    """子树中既没有指令也没有表达式"""
+    if node.tag in DIRECTIVE_TAGS or any('${' in value for value in node.values):
+        return False
+    return all(map(_is_static, node.children))
+
+
+def _required(node, name):
+    value = node.get(name)
+    if not value:
+        raise ValueError(f"<{node.tag}> 缺少 {name} 属性")
+    return value
+
+
+class DataTemplate:
+    """编译好的数据模板，render(data) 得到渲染计划
+
+    sources 与 RenderPlan 相同，为组件 include 的文件，供缓存判断是否过期。
+    """
+
+    __slots__ = ('attrs', 'emitters', 'sources')
+
+    def __init__(self, attrs, emitters, sources=()):
+        self.attrs = attrs
+        self.emitters = emitters
+        self.sources = sources
+
+    def stale(self):
+        return sources_changed(self.sources)
+
+    def render(self, data=None):
+        """按数据字典生成渲染计划，data 在生成过程中只读"""
+        scope = dict(data or {})
+        instructions = []
+        pool = {}
+        for emit in self.emitters:
+            emit(scope, -1, instructions, pool)
+        attrs = {name: value(scope) if callable(value) else value for name, value in self.attrs.items()}
+        return RenderPlan(attrs, instructions, self.sources)
+
+
+def compile_template(root, components=None, base_dir=None):
+    """将以window为根、含指令和表达式的元素树编译为 DataTemplate
+
+    components、base_dir 与 compile_document() 相同；组件实例先在元素树上展开。
+    """
+    sources = ()
+    if components is None and any(child.tag in DEFINITION_TAGS for child in root):
+        from .components import LIBRARY
+        components = LIBRARY.scope(root, base_dir)
+    if components is not None:
+        root = components.expand_document(root)
+        sources = tuple(components.sources.items())
+    attrs = {name: compile_value(value) if '${' in value else value for name, value in root.items()}
+    return DataTemplate(attrs, _compile_children(root.children, root.tag), sources)
+
+
+def compile_template_markup(markup_text, base_dir=None):
+    """解析并编译数据模板"""
+    return compile_template(parse_markup(markup_text), base_dir=base_dir)
+
+
+def _compile_children(children, parent_tag):
+    """编译一组兄弟元素，返回发射函数列表，每个函数为 emit(作用域, 父下标, 指令列表, pool)"""
+    emitters = []
+    static = []
+    previous = None
+    for child in children:
+        if _is_static(child):
+            # 连续的静态元素合成一段预先编译的指令
+            static.append(child)
+            previous = None
+            continue
+        if static:
+            emitters.append(_static_block(static, parent_tag))
+            static = []
+        if child.tag == "else":
+            if previous is None:
+                raise ValueError("else 只能紧跟在 if 之后")
+            previous.append(_compile_children(child.children, parent_tag))
+            previous = None
+            continue
+        if child.tag == "if":
+            branches = [parse_directive(child), _compile_children(child.children, parent_tag)]
+            emitters.append(_if_block(branches))
+            previous = branches
+            continue
+        previous = None
+        if child.tag == "for":
+            emitters.append(_for_block(child, parent_tag))
+        elif child.tag == "window":
+            # 嵌套的window只渲染其子元素
+            emitters.extend(_compile_children(child.children, "window"))
+        elif child.tag in TAGS:
+            emitters.append(_element(child, parent_tag))
+    if static:
+        emitters.append(_static_block(static, parent_tag))
+    return emitters
+
+
+def _static_block(nodes, parent_tag):
+    block = compile_document(Node(parent_tag, children=tuple(nodes))).instructions
+
+    def emit(scope, parent, instructions, pool):
+        offset = len(instructions)
+        instructions.extend(
+            instruction._replace(parent=parent if instruction.parent < 0 else instruction.parent + offset)
+            for instruction in block
+        )
+    return emit
+
+
+def _if_block(branches):
+    # branches 为 [条件, 子元素]，后面可能还有 else 的子元素
+    def emit(scope, parent, instructions, pool):
+        if branches[0](scope):
+            children = branches[1]
+        elif len(branches) == 3:
+            children = branches[2]
+        else:
+            return
+        for child in children:
+            child(scope, parent, instructions, pool)
+    return emit
+
+
+def parse_directive(node):
+    """检查并编译指令的属性：for 返回 (循环变量, 序列表达式, 下标变量)，if 返回条件表达式"""
+    if node.tag == "if":
+        return compile_expression(_required(node, "test"))
+    if node.tag != "for":
+        return None
+    target, _, source = _required(node, "each").partition(" in ")
+    target = target.strip()
+    if not target.isidentifier() or not source.strip():
+        raise ValueError(f"for 的 each 属性应为 \"变量 in 表达式\": {node.get('each')!r}")
+    index = node.get("index")
+    if index is not None and not index.isidentifier():
+        raise ValueError(f"for 的 index 属性应为变量名: {index!r}")
+    return target, compile_expression(source), index
+
+
+def _for_block(node, parent_tag):
+    target, items, index = parse_directive(node)
+    body = _compile_children(node.children, parent_tag)
+
+    def emit(scope, parent, instructions, pool):
+        # 循环变量只在循环体内可见
+        local = dict(scope)
+        for position, item in enumerate(items(scope) or ()):
+            local[target] = item
+            if index is not None:
+                local[index] = position
+            for child in body:
+                child(local, parent, instructions, pool)
+    return emit
+
+
+def _element(node, parent_tag):
+    if (node.tag == "tab") != (parent_tag == "tabs"):
+        raise ValueError("tab 只能直接放在 tabs 中，tabs 中也只能放 tab")
+    spec = TAGS[node.tag]
+    constant = {}
+    values = []
+    for name, value in node.items():
+        if '${' in value:
+            values.append((name, compile_value(value)))
+        else:
+            constant[name] = value
+    children = _compile_children(node.children, node.tag) if spec.container or spec.lazy else ()
+    layout = node.tag in LAYOUT_TAGS
+
+    # 表达式只出现在 id、bind 等不影响构造参数的属性（以及布局位置）中时，
+    # 构造参数和 pack() 参数对每一行都相同，预先算好后直接共用；
+    # pack() 参数只取决于 padx、pady（有 build 时可能取决于任何属性）
+    dynamic = {name for name, _ in values if name in spec.attributes}
+    fixed = fixed_pack = None
+    if not dynamic - _INSTANCE_ATTRIBUTES:
+        fixed = spec.compile(constant, -1)
+        fixed_pack = fixed.pack
+    elif spec.build is None and not dynamic & _PACK_ATTRIBUTES:
+        fixed_pack = spec.compile(constant, -1).pack
+
+    def emit(scope, parent, instructions, pool):
+        attrs = dict(constant)
+        for name, value in values:
+            attrs[name] = value(scope)
+        instruction = spec.compile(attrs, parent)
+        index = len(instructions)
+        if not children and fixed_pack is not None:
+            instructions.append(instruction._replace(
+                kwargs=fixed.kwargs if fixed is not None else _shared(pool, instruction.kwargs),
+                pack=fixed_pack,
+            ))
+            return
+        instructions.append(None)
+        for child in children:
+            child(scope, index, instructions, pool)
+        if layout:
+            _layout_children(instructions, index, attrs, pool)
+        instructions[index] = instruction._replace(
+            kwargs=fixed.kwargs if fixed is not None else _shared(pool, instruction.kwargs),
+            pack=fixed_pack if fixed_pack is not None else _shared(pool, instruction.pack),
+            size=len(instructions) - index - 1,
+        )
+    return emit
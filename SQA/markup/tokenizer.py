@@ -0,0 +1,127 @@
+"""自定义标记语言的单遍增量分词器
+
+整个文档只从左到右扫描一次，按顺序产出三类事件：
+
+    (START, tag, attrs)   开始标签，attrs 为属性字典
+    (END, tag)            结束标签；自闭合标签会紧跟在 START 之后产出
+    (TEXT, text)          标签之间去掉首尾空白后的非空文本
+
+扫描过程中不会构造中间的匹配列表，也不会为每个标签重新编译正则。
+"""
+import re
+
+START = 'start'
+END = 'end'
+TEXT = 'text'
+
+# 预编译的扫描正则，全部使用 match(text, pos) 原位匹配，避免切片
+_NAME_RE = re.compile(r'\w+')
+_ATTR_RE = re.compile(r'\s*(\w+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def _scan(text, final):
+    """扫描 text 并产出事件，返回已经消费的字符数
+
+    final 为 False 时，末尾不完整的标签或文本会保留下来，等待后续数据。
+    """
+    pos = 0
+    length = len(text)
+    find = text.find
+    startswith = text.startswith
+
+    while pos < length:
+        lt = find('<', pos)
+        if lt < 0:
+            # 剩余部分都是文本
+            if not final:
+                return pos
+            content = text[pos:].strip()
+            if content:
+                yield (TEXT, content)
+            return length
+
+        if lt > pos:
+            content = text[pos:lt].strip()
+            if content:
+                yield (TEXT, content)
+
+        # 注释、XML声明等直接跳过
+        if startswith('<!--', lt):
+            end = find('-->', lt + 4)
+            if end < 0:
+                return length if final else lt
+            pos = end + 3
+            continue
+        if startswith('<?', lt) or startswith('<!', lt):
+            end = find('>', lt + 2)
+            if end < 0:
+                return length if final else lt
+            pos = end + 1
+            continue
+
+        closing = startswith('</', lt)
+        name_match = _NAME_RE.match(text, lt + 2 if closing else lt + 1)
+        if name_match is None:
+            # 不是合法标签，当作普通字符跳过
+            if not final and lt + 2 >= length:
+                return lt
+            pos = lt + 1
+            continue
+        tag = name_match.group()
+        pos = name_match.end()
+
+        # 逐个读取属性
+        attrs = {}
+        attr_match = _ATTR_RE.match(text, pos)
+        while attr_match is not None:
+            name, double_quoted, single_quoted = attr_match.groups()
+            attrs[name] = double_quoted if double_quoted is not None else single_quoted
+            pos = attr_match.end()
+            attr_match = _ATTR_RE.match(text, pos)
+
+        gt = find('>', pos)
+        if gt < 0:
+            # 标签被截断
+            return length if final else lt
+        if not final and ('"' in text[pos:gt] or "'" in text[pos:gt]):
+            # 属性值的引号可能尚未闭合，找到的 ">" 可能在属性值中，等待后续数据
+            return lt
+        self_closing = text[gt - 1] == '/'
+        pos = gt + 1
+
+        if closing:
+            yield (END, tag)
+        else:
+            yield (START, tag, attrs)
+            if self_closing:
+                yield (END, tag)
+
+    return pos
+
+
+def tokenize(markup_text):
+    """对完整的标记文本做单遍扫描，逐个产出事件"""
+    return _scan(markup_text, True)
+
+
+class MarkupTokenizer:
+    """可分块送入数据的增量分词器
+
+    每次 feed() 返回的事件迭代器需要在下一次 feed() 之前消费完。
+    """
+
+    def __init__(self):
+        self._buffer = ''
+
+    def feed(self, chunk):
+        """送入一段文本，返回其中已经完整的事件"""
+        self._buffer += chunk
+        return self._drain(False)
+
+    def close(self):
+        """结束输入，返回缓冲区中剩余的事件"""
+        return self._drain(True)
+
+    def _drain(self, final):
+        consumed = yield from _scan(self._buffer, final)
+        self._buffer = self._buffer[consumed:]
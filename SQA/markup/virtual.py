@@ -0,0 +1,233 @@
+"""虚拟列表/表格：只为可见行（加少量预留行）创建控件
+
+行控件放在 Canvas 上，数量只取决于可视高度，与数据长度无关；
+滚动时按“行号 % 槽位数”循环复用槽位，只有换了数据的槽位才更新文本。
+"""
+import tkinter as tk
+from collections.abc import Mapping
+from tkinter import ttk
+
+
+class _Slot:
+    """一个可复用的行控件"""
+
+    __slots__ = ('item', 'widget', 'labels', 'index')
+
+    def __init__(self, item, widget, labels):
+        self.item = item
+        self.widget = widget
+        self.labels = labels
+        self.index = -1
+
+
+class VirtualList(ttk.Frame):
+    """绑定到Python序列的虚拟列表，指定 columns 时按表格显示
+
+    source 只需支持 len() 和下标访问；数据变化后调用 refresh()。
+    """
+
+    def __init__(self, master=None, source=(), columns=None, column_width=12,
+                 row_height=24, height=240, overscan=4, **kwargs):
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.columns = list(columns) if columns else None
+        self.column_width = int(column_width)
+        self.row_height = max(1, int(row_height))
+        self.overscan = max(0, int(overscan))
+
+        self._offset = 0
+        self._slots = []
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self, height=int(height), highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # 表头
+        self.header = None
+        self._build_header()
+
+        self.canvas.bind("<Configure>", lambda event: self._refresh(resize=True))
+        self._bind_wheel(self.canvas)
+
+    # ---- 公开接口 ----
+
+    def configure(self, cnf=None, **kwargs):
+        """支持 source、columns、column_width、row_height、overscan 和 height"""
+        if cnf is None and not kwargs:
+            return super().configure()
+        handled = bool(set(kwargs) & {"columns", "column_width", "row_height",
+                                      "overscan", "height", "source"})
+        rebuild = False
+        if "columns" in kwargs:
+            columns = kwargs.pop("columns")
+            self.columns = list(columns) if columns else None
+            rebuild = True
+        if "column_width" in kwargs:
+            self.column_width = int(kwargs.pop("column_width"))
+            rebuild = True
+        if "row_height" in kwargs:
+            self.row_height = max(1, int(kwargs.pop("row_height")))
+            rebuild = True
+        if "overscan" in kwargs:
+            self.overscan = max(0, int(kwargs.pop("overscan")))
+            rebuild = True
+        if "height" in kwargs:
+            self.canvas.configure(height=int(kwargs.pop("height")))
+        if "source" in kwargs:
+            self.source = kwargs.pop("source")
+            self._offset = 0
+            for slot in self._slots:
+                slot.index = -1
+
+        if rebuild:
+            self._rebuild()
+        if cnf or kwargs:
+            super().configure(cnf, **kwargs)
+        if handled:
+            self._refresh()
+
+    config = configure
+
+    def refresh(self):
+        """数据源内容或长度变化后重新显示"""
+        for slot in self._slots:
+            slot.index = -1
+        self._set_offset(self._offset)
+
+    def see(self, index):
+        """滚动到指定行"""
+        self._set_offset(index * self.row_height)
+
+    def yview(self, *args):
+        """供滚动条调用：moveto 比例，或按行/页滚动"""
+        if not args:
+            return self._fractions()
+        if args[0] == tk.MOVETO:
+            self._set_offset(float(args[1]) * self._total_height())
+        elif args[0] == tk.SCROLL:
+            amount = int(args[1])
+            step = self._view_height() if args[2] == tk.PAGES else self.row_height
+            self._set_offset(self._offset + amount * step)
+
+    # ---- 内部实现 ----
+
+    def _build_header(self):
+        """表格模式下在滚动区域上方显示列名"""
+        if self.header is not None:
+            self.header.destroy()
+            self.header = None
+        if not self.columns:
+            return
+        self.header = ttk.Frame(self)
+        for column in self.columns:
+            ttk.Label(self.header, text=column, width=self.column_width,
+                      font=("TkDefaultFont", 9, "bold")).pack(side=tk.LEFT)
+        self.header.pack(side=tk.TOP, fill=tk.X, before=self.scrollbar)
+
+    def _rebuild(self):
+        """行结构变化时丢弃全部槽位"""
+        for slot in self._slots:
+            slot.widget.destroy()
+        self.canvas.delete("all")
+        self._slots = []
+        self._build_header()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda event: self.yview(tk.SCROLL, -3, tk.UNITS))
+        widget.bind("<Button-5>", lambda event: self.yview(tk.SCROLL, 3, tk.UNITS))
+
+    def _on_wheel(self, event):
+        # Windows 上 delta 为 120 的倍数，macOS 上为较小的整数
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview(tk.SCROLL, -3 * delta, tk.UNITS)
+
+    def _new_slot(self):
+        if self.columns:
+            widget = ttk.Frame(self.canvas)
+            labels = []
+            for _ in self.columns:
+                label = ttk.Label(widget, width=self.column_width, anchor=tk.W)
+                label.pack(side=tk.LEFT)
+                self._bind_wheel(label)
+                labels.append(label)
+        else:
+            widget = ttk.Label(self.canvas, anchor=tk.W)
+            labels = [widget]
+        self._bind_wheel(widget)
+        item = self.canvas.create_window(0, 0, window=widget, anchor=tk.NW,
+                                         height=self.row_height, state=tk.HIDDEN)
+        width = self.canvas.winfo_width()
+        if width > 1:
+            self.canvas.itemconfigure(item, width=width)
+        return _Slot(item, widget, labels)
+
+    def _row_values(self, row):
+        """将一行数据转换为各列的显示文本"""
+        if not self.columns:
+            return (row,)
+        if isinstance(row, Mapping):
+            return [row.get(column, "") for column in self.columns]
+        if isinstance(row, (str, bytes)):
+            return (row,)
+        return row
+
+    def _total_height(self):
+        return len(self.source) * self.row_height
+
+    def _view_height(self):
+        height = self.canvas.winfo_height()
+        return height if height > 1 else int(self.canvas.cget("height"))
+
+    def _fractions(self):
+        total = self._total_height()
+        if total <= 0:
+            return (0.0, 1.0)
+        view = self._view_height()
+        return (self._offset / total, min(1.0, (self._offset + view) / total))
+
+    def _set_offset(self, offset):
+        limit = max(0, self._total_height() - self._view_height())
+        self._offset = int(min(max(0, offset), limit))
+        self._refresh()
+
+    def _refresh(self, resize=False):
+        """按当前偏移摆放槽位，只更新换了行号的槽位文本"""
+        row_height = self.row_height
+        view = self._view_height()
+        count = len(self.source)
+
+        needed = view // row_height + 2 + 2 * self.overscan
+        while len(self._slots) < needed:
+            self._slots.append(self._new_slot())
+        slots = self._slots
+        slot_count = len(slots)
+
+        if resize:
+            width = self.canvas.winfo_width()
+            for slot in slots:
+                self.canvas.itemconfigure(slot.item, width=width)
+
+        first = max(0, self._offset // row_height - self.overscan)
+        last = min(count, first + slot_count)
+        visible = set()
+        for index in range(first, last):
+            slot = slots[index % slot_count]
+            visible.add(slot.item)
+            if slot.index != index:
+                values = self._row_values(self.source[index])
+                for label, value in zip(slot.labels, values):
+                    label.configure(text=value)
+                if slot.index < 0:
+                    self.canvas.itemconfigure(slot.item, state=tk.NORMAL)
+                slot.index = index
+            self.canvas.coords(slot.item, 0, index * row_height - self._offset)
+
+        # 数据不足时隐藏多余槽位
+        for slot in slots:
+            if slot.item not in visible and slot.index >= 0:
+                self.canvas.itemconfigure(slot.item, state=tk.HIDDEN)
+                slot.index = -1
+
+        self.scrollbar.set(*self._fractions())
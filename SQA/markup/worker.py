@@ -0,0 +1,78 @@
+"""后台解析：在工作线程中解析、校验和编译标记，Tk控件只在主线程中创建
+
+工作线程把结果放入线程安全的队列，主线程用 after() 轮询队列并调用回调。
+每次提交都会递增代数，取回结果时代数落后的（对应旧的编辑器内容）直接丢弃。
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundCompiler:
+    """把耗时的纯Python工作放到后台线程，结果交回 widget 所在的Tk主线程"""
+
+    def __init__(self, widget, poll_ms=15, max_workers=1):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        # 默认只有一个工作线程，提交的任务按顺序执行，共享的缓存无需加锁
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="markup-worker")
+        self.generation = 0
+        self.discarded = 0
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._poll_job = None
+
+    def submit(self, func, *args, on_done, on_error=None):
+        """在后台执行 func(*args)，完成后在主线程中调用 on_done(结果) 或 on_error(异常)
+
+        之前提交但尚未交付的任务结果会被丢弃。
+        """
+        self.generation += 1
+        generation = self.generation
+        results = self._results
+
+        def job():
+            try:
+                result = func(*args)
+            except Exception as e:
+                results.put((generation, None, e, on_done, on_error))
+            else:
+                results.put((generation, result, None, on_done, on_error))
+
+        self.executor.submit(job)
+        self._outstanding += 1
+        if self._poll_job is None:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """丢弃所有尚未交付的结果"""
+        self.generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                generation, result, error, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if generation != self.generation:
+                # 对应较旧的编辑器内容
+                self.discarded += 1
+                continue
+            if error is None:
+                on_done(result)
+            elif on_error is not None:
+                on_error(error)
+            else:
+                raise error
+
+        if self._outstanding > 0:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)
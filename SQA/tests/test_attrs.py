@@ -0,0 +1,23 @@
+"""属性值转换（markup.attrs）"""
+import pytest
+
+from markup.attrs import parse_font, parse_pad, to_int
+
+
+def test_parse_font():
+    assert parse_font('Arial 14 bold') == ('Arial', 14, 'bold', 'roman')
+    assert parse_font('Courier') == ('Courier', 10, 'normal', 'roman')
+    assert parse_font('Arial 9 italic') == ('Arial', 9, 'normal', 'italic')
+    assert parse_font('') is None
+
+
+def test_malformed_font_raises():
+    with pytest.raises(ValueError, match='无法解析的字体'):
+        parse_font('Arial big')
+
+
+def test_numbers():
+    assert to_int('12') == 12
+    assert parse_pad('3 5') == (3, 5)
+    with pytest.raises(ValueError):
+        to_int('wide')
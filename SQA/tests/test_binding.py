@@ -0,0 +1,67 @@
+"""数据绑定（markup.binding）：模型的合并通知，绑定器用 tkinter.Tcl() 解释器中的变量"""
+import tkinter as tk
+
+import pytest
+
+from markup.binding import Binder, Model
+
+
+def collect(model, path):
+    events = []
+    model.subscribe(path, lambda changed, value: events.append((changed, value)))
+    return events
+
+
+def test_changes_are_coalesced_until_flush():
+    scheduled = []
+    model = Model({"form": {}}, schedule=scheduled.append)
+    events = collect(model, "form")
+    model.set("form.name", "a")
+    model.set("form.name", "b")
+    model.set("form.age", 3)
+    assert events == [] and len(scheduled) == 1
+    scheduled[0]()
+    assert events == [("form.name", "b"), ("form.age", 3)]
+    assert model.flushes == 1
+
+
+def test_unchanged_values_do_not_notify():
+    model = Model({"a": 1})
+    events = collect(model, "a")
+    model.set("a", 1)
+    assert events == [] and model.mutations == 0
+
+
+def test_parents_and_whole_model_are_notified():
+    model = Model()
+    parent = collect(model, "user")
+    everything = collect(model, "")
+    model.set("user.name", "a")
+    assert parent == everything == [("user.name", "a")]
+    assert model.get("user") == {"name": "a"}
+
+
+def test_replacing_a_subtree_notifies_descendants():
+    model = Model({"user": {"name": "a"}})
+    name = collect(model, "user.name")
+    model.set("user", {"name": "b"})
+    model.set("user", None)
+    assert name == [("user.name", "b"), ("user.name", None)]
+
+
+@pytest.fixture
+def interpreter():
+    return tk.Tcl()
+
+
+def test_binder_variables_follow_the_model(interpreter):
+    model = Model({"user": {"name": "a", "admin": True}})
+    binder = Binder(model, interpreter)
+    name = binder.variable("user.name", "string")
+    admin = binder.variable("user.admin", "boolean")
+    assert (name.get(), admin.get()) == ("a", True)
+    model.set("user", {"name": "b"})
+    assert (name.get(), admin.get()) == ("b", False)
+    # 控件中的输入写回模型
+    name.set("c")
+    assert model.get("user.name") == "c"
@@ -0,0 +1,84 @@
+"""markup.build 的校验和批量编译"""
+from markup.build import ERROR, WARNING, compile_file, compile_files, find_files, validate
+from markup.node import parse_nodes
+
+
+def diagnostics(markup_text):
+    return [(d.level, d.location, d.message) for d in validate(parse_nodes(markup_text))]
+
+
+def test_valid_document_has_no_diagnostics():
+    assert diagnostics('<window title="a"><frame layout="grid" cols="2">'
+                       '<label text="x" row="0" col="0" /><entry width="20" /></frame></window>') == []
+
+
+def test_root_must_be_window():
+    assert diagnostics('<frame />') == [(ERROR, 'frame', '根元素必须是window')]
+
+
+def test_unknown_tag_and_attribute():
+    result = diagnostics('<window><frame><blink /><label text="x" colour="red" /></frame></window>')
+    assert (ERROR, 'window/frame[1]/blink[1]', '未知标签 <blink>') in result
+    assert (WARNING, 'window/frame[1]/label[1]', '<label> 不支持属性 colour') in result
+
+
+def test_attribute_type_error():
+    [(level, location, message)] = diagnostics('<window><entry width="wide" /></window>')
+    assert (level, location) == (ERROR, 'window/entry[1]')
+    assert 'wide' in message
+
+
+def test_placement_attributes_only_inside_layouts():
+    assert diagnostics('<window><frame layout="grid"><label row="1" /></frame></window>') == []
+    assert diagnostics('<window><frame><label row="1" /></frame></window>') == [
+        (WARNING, 'window/frame[1]/label[1]', '<label> 不支持属性 row')]
+
+
+def test_unknown_layout_is_a_warning():
+    assert diagnostics('<window><frame layout="flex" /></window>') == [
+        (WARNING, 'window/frame[1]', "未知的 layout 取值 'flex'")]
+
+
+def write(directory, name, text):
+    path = directory / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_component_library_files_are_validated_as_libraries(tmp_path):
+    write(tmp_path, 'fields.xml', '<library><component name="field" params="label">'
+                                  '<label text="{label}" /></component></library>')
+    screen = write(tmp_path, 'screen.xml', '<window><include src="fields.xml" />'
+                                           '<field label="姓名" /></window>')
+    reports = {report.path: report for report in compile_files(find_files([str(tmp_path)], '*.xml'), jobs=1)}
+    assert [d for report in reports.values() for d in report.diagnostics] == []
+    assert reports[screen].instructions == 1
+
+
+def test_component_library_errors(tmp_path):
+    path = write(tmp_path, 'broken.xml', '<library><component name="label" />'
+                                         '<include src="missing.xml" /></library>')
+    report = compile_file(path)
+    assert [d.level for d in report.diagnostics] == [ERROR]
+    assert '重名' in report.diagnostics[0].message
+
+
+def test_unexpected_errors_are_reported_per_file(tmp_path):
+    deep = write(tmp_path, 'deep.xml', '<window>' + '<frame>' * 5000 + '</frame>' * 5000 + '</window>')
+    (tmp_path / 'latin1.xml').write_bytes('<library><component name="x"><label text="é" />'
+                                          '</component></library>'.encode('latin-1'))
+    bad_include = write(tmp_path, 'screen.xml', '<window><include src="latin1.txt" /></window>')
+    (tmp_path / 'latin1.txt').write_bytes((tmp_path / 'latin1.xml').read_bytes())
+    good = write(tmp_path, 'good.xml', '<window><label text="ok" /></window>')
+
+    reports = {report.path: report for report in compile_files([deep, bad_include, good], jobs=1)}
+    assert [d.level for d in reports[deep].diagnostics] == [ERROR]
+    assert 'RecursionError' in reports[deep].diagnostics[0].message
+    assert [d.level for d in reports[bad_include].diagnostics] == [ERROR]
+    assert reports[good].diagnostics == [] and reports[good].instructions == 1
+
+
+def test_malformed_font_is_an_attribute_error():
+    [(level, location, message)] = diagnostics('<window><label text="x" font="Arial big" /></window>')
+    assert (level, location) == (ERROR, 'window/label[1]')
+    assert '无法解析的字体' in message
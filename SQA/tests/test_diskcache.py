@@ -0,0 +1,80 @@
+"""渲染计划的磁盘缓存（markup.diskcache）"""
+import os
+
+from markup.diskcache import DiskPlanCache
+from markup.plan import PLAN_VERSION, PlanCache, compile_markup
+
+MARKUP = '<window title="t"><frame layout="grid"><label text="a" /><entry id="e" width="20" /></frame></window>'
+
+
+def instructions(plan):
+    return [tuple(instruction) for instruction in plan.instructions]
+
+
+def test_round_trip(tmp_path):
+    cache = DiskPlanCache(str(tmp_path))
+    expected = compile_markup(MARKUP)
+    assert cache.load(MARKUP) is None
+    cache.store(MARKUP, expected)
+
+    plan = DiskPlanCache(str(tmp_path)).load(MARKUP)
+    assert plan.attrs == expected.attrs
+    assert instructions(plan) == instructions(expected)
+
+
+def test_get_counts_hits_and_misses(tmp_path):
+    cache = DiskPlanCache(str(tmp_path))
+    first = cache.get(MARKUP)
+    second = cache.get(MARKUP)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert instructions(first) == instructions(second)
+
+
+def test_other_versions_are_pruned(tmp_path):
+    old = tmp_path / f"{'0' * 40}-v{PLAN_VERSION - 1}.plan"
+    old.write_bytes(b"old")
+    unrelated = tmp_path / "notes.txt"
+    unrelated.write_text("x")
+    DiskPlanCache(str(tmp_path))
+    assert not old.exists()
+    assert unrelated.exists()
+
+
+def test_prune_keeps_newest_entries(tmp_path):
+    cache = DiskPlanCache(str(tmp_path), max_entries=2)
+    for index in range(4):
+        text = MARKUP.replace('"t"', f'"t{index}"')
+        cache.store(text, compile_markup(text))
+        os.utime(cache.path(text), (index, index))
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(cache.path(MARKUP.replace('"t"', f'"t{index}"'))) for index in (2, 3))
+
+
+def test_corrupt_file_is_discarded(tmp_path):
+    cache = DiskPlanCache(str(tmp_path))
+    with open(cache.path(MARKUP), "wb") as f:
+        f.write(b"garbage")
+    assert cache.load(MARKUP) is None
+    assert not os.path.exists(cache.path(MARKUP))
+
+
+def test_include_changes_invalidate_and_base_dir_is_part_of_the_key(tmp_path):
+    text = '<window><include src="inc.xml" /><field /></window>'
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "inc.xml").write_text(
+            f'<lib><component name="field"><label text="{name}" /></component></lib>', encoding="utf-8")
+    cache = DiskPlanCache(str(tmp_path / "cache"))
+    a = cache.get(text, str(tmp_path / "a"))
+    b = cache.get(text, str(tmp_path / "b"))
+    assert [i.kwargs["text"] for i in a.instructions] == ["a"]
+    assert [i.kwargs["text"] for i in b.instructions] == ["b"]
+
+    include = tmp_path / "a" / "inc.xml"
+    include.write_text('<lib><component name="field"><label text="a2" /></component></lib>', encoding="utf-8")
+    os.utime(include, ns=(1, 1))
+    assert cache.load(text, str(tmp_path / "a")) is None
+
+    memory = PlanCache(disk_cache=cache)
+    assert [i.kwargs["text"] for i in memory.get(text, str(tmp_path / "a")).instructions] == ["a2"]
@@ -0,0 +1,52 @@
+"""网格布局和约束布局（markup.layout）"""
+import pytest
+
+from markup.layout import GRID, PACK, PLACE, arrange, parse_expression
+
+
+def test_grid_auto_flow_and_span():
+    manager, positions = arrange({'layout': 'grid', 'cols': '3'},
+                                 [{}, {'span': '2'}, {}, {'row': '5', 'col': '1'}, {}])
+    assert manager == GRID
+    assert [(p['row'], p['column']) for p in positions] == [(0, 0), (0, 1), (1, 0), (5, 1), (5, 2)]
+    assert positions[1]['columnspan'] == 2
+    assert all(p['sticky'] == 'ew' for p in positions)
+
+
+def test_grid_skips_occupied_cells():
+    _, positions = arrange({'layout': 'grid', 'cols': '2'}, [{'rowspan': '2'}, {}, {}])
+    assert [(p['row'], p['column']) for p in positions] == [(0, 0), (0, 1), (1, 1)]
+    assert positions[0]['rowspan'] == 2
+
+
+def test_pack_layout_has_no_positions():
+    assert arrange({'layout': 'horizontal'}, [{}, {}]) == (PACK, None)
+
+
+def test_constraints_reference_siblings():
+    manager, positions = arrange({'layout': 'constraint'}, [
+        {'id': 'a', 'left': '10', 'place_width': '50%-12'},
+        {'left': 'a.right+8', 'right': '100%-10', 'top': '4'},
+        {'right': '20'},
+    ])
+    assert manager == PLACE
+    assert positions[0] == {'anchor': 'nw', 'x': 10, 'y': 0, 'width': -12, 'relwidth': 0.5}
+    assert positions[1] == {'anchor': 'nw', 'x': 6, 'relx': 0.5, 'y': 4, 'width': -16, 'relwidth': 0.5}
+    # 只给出右边时以控件的右边对齐
+    assert positions[2]['anchor'] == 'ne'
+
+
+@pytest.mark.parametrize('children, message', [
+    ([{'id': 'a', 'left': 'b.right'}, {'id': 'b', 'left': 'a.right'}], '循环'),
+    ([{'left': 'missing.right'}], '不存在'),
+    ([{'id': 'a', 'left': '0'}, {'left': 'a.right'}], '自身大小'),
+])
+def test_constraint_errors(children, message):
+    with pytest.raises(ValueError, match=message):
+        arrange({'layout': 'constraint'}, children)
+
+
+def test_parse_expression_rejects_garbage():
+    assert parse_expression('50%-12') == ((1, 0, 0.5), (-1, 12.0, 0))
+    with pytest.raises(ValueError):
+        parse_expression('10 20')
@@ -0,0 +1,53 @@
+"""实时预览（markup.live）：编辑所在的顶层子元素定位"""
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from markup.live import LiveDocument, toplevel_spans
+from markup.node import parse_nodes
+
+OLD = '<window><label text="a"/><frame><entry id="e"/></frame><label text="b"/></window>'
+
+
+@pytest.fixture
+def document():
+    document = LiveDocument()
+    document.update(OLD)
+    return document
+
+
+def test_toplevel_spans():
+    assert [(OLD[start:end], tag) for start, end, tag in toplevel_spans(OLD)] == [
+        ('<label text="a"/>', 'label'),
+        ('<frame><entry id="e"/></frame>', 'frame'),
+        ('<label text="b"/>', 'label'),
+    ]
+
+
+def test_edit_inside_one_element(document):
+    index, element = document.locate(OLD.replace('"a"', '"ab"'), parse_nodes(OLD))
+    assert index == 0 and element.get('text') == 'ab'
+    index, element = document.locate(OLD.replace('id="e"', 'id="f"'), parse_nodes(OLD))
+    assert index == 1 and element[0].get('id') == 'f'
+
+
+@pytest.mark.parametrize('new_text', [
+    # 在两个顶层元素之间插入元素
+    OLD.replace('<label text="a"/>', '<label text="a"/><button/>'),
+    OLD.replace('<label text="b"/>', '<frame/><label text="b"/>'),
+    # 删除整个元素
+    OLD.replace('<label text="a"/>', ''),
+    # 跨越两个元素
+    OLD.replace('"a"', '"y"').replace('id="e"', 'id="z"'),
+])
+def test_edits_at_or_across_boundaries_need_a_full_render(document, new_text):
+    assert document.locate(new_text, parse_nodes(OLD)) is None
+
+
+def test_incomplete_element_raises(document):
+    with pytest.raises(ParseError):
+        document.locate(OLD.replace('<entry id="e"/>', '<entry id="e">'), parse_nodes(OLD))
+
+
+def test_nothing_to_compare_against():
+    assert LiveDocument().locate(OLD, parse_nodes(OLD)) is None
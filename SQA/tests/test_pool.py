@@ -0,0 +1,88 @@
+"""控件回收池（markup.pool）：控件换成桩对象"""
+import gc
+
+from markup.pool import DROP, WidgetPool
+
+
+class StubWidget:
+    def __init__(self, master=None, **kwargs):
+        self.options = dict(kwargs)
+        self.destroyed = False
+
+    def configure(self, **kwargs):
+        self.options.update(kwargs)
+
+    def winfo_manager(self):
+        return "pack"
+
+    def pack_forget(self):
+        pass
+
+    def lift(self):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def make_pool(**kwargs):
+    return WidgetPool({"Label": StubWidget, "Entry": StubWidget}, **kwargs)
+
+
+def test_released_widgets_are_reused_for_the_same_signature():
+    pool = make_pool()
+    label = pool.acquire("Label", None, {"text": "a"})
+    pool.release(label)
+    assert pool.acquire("Label", None, {"text": "b"}) is label
+    assert label.options["text"] == "b"
+    # 参数名不同时不复用
+    assert pool.acquire("Label", None, {"text": "c", "width": 3}) is not label
+    assert (pool.hits, pool.misses) == (1, 2)
+
+
+def test_lru_eviction_destroys_the_oldest_idle_widget():
+    pool = make_pool(caps={"Label": 2})
+    widgets = [pool.acquire("Label", None, {"text": str(i)}) for i in range(3)]
+    for widget in widgets:
+        pool.release(widget)
+    assert widgets[0].destroyed and not widgets[1].destroyed and not widgets[2].destroyed
+    assert pool.stats()["idle"] == {"Label": 2}
+    assert pool.evictions == 1
+    # 最近归还的最先复用
+    assert pool.acquire("Label", None, {"text": "x"}) is widgets[2]
+
+
+def test_drop_policy_destroys_the_returned_widget():
+    pool = make_pool(caps={"Label": 1}, policy=DROP)
+    first, second = (pool.acquire("Label", None, {"text": "x"}) for _ in range(2))
+    pool.release(first)
+    pool.release(second)
+    assert second.destroyed and not first.destroyed
+
+
+def test_foreign_widgets_are_destroyed_on_release():
+    pool = make_pool()
+    foreign = StubWidget()
+    pool.release(foreign)
+    assert foreign.destroyed
+    assert pool.stats()["idle"] == {}
+
+
+def test_clear_destroys_idle_widgets_without_counting_evictions():
+    pool = make_pool()
+    widget = pool.acquire("Entry", None, {})
+    pool.release(widget)
+    pool.clear()
+    assert widget.destroyed
+    assert pool.evictions == 0
+
+
+def test_widgets_destroyed_outside_the_pool_are_not_kept():
+    pool = make_pool()
+    widget = pool.acquire("Label", None, {"text": "a"})
+    assert len(pool._keys) == 1
+    # 增量渲染直接销毁控件，不经过池
+    widget.destroy()
+    del widget
+    gc.collect()
+    assert len(pool._keys) == 0
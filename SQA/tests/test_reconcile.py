@@ -0,0 +1,143 @@
+"""增量渲染（markup.reconcile）：控件换成桩对象，按比对结果检查新建、复用和删除"""
+from markup.layout import placements
+from markup.node import parse_nodes
+from markup.plan import RenderNode
+from markup.reconcile import Reconciler, ReconcileStats, _keys
+from markup.tags import TAGS
+
+
+class StubWidget:
+    """记录调用的控件，容器按 pack 顺序保存子控件"""
+
+    def __init__(self, name, master=None):
+        self.name = name
+        self.master = master
+        self.destroyed = False
+        self.manager = None
+        self.configured = []
+        self.slaves = []
+
+    def __str__(self):
+        return self.name
+
+    def configure(self, **options):
+        self.configured.append(options)
+
+    def destroy(self):
+        self.destroyed = True
+        if self in self.master.slaves:
+            self.master.slaves.remove(self)
+
+    def pack(self, **options):
+        self.manager = 'pack'
+        if self not in self.master.slaves:
+            self.master.slaves.append(self)
+
+    def grid(self, **options):
+        self.manager = 'grid'
+
+    def pack_slaves(self):
+        return list(self.slaves)
+
+    def pack_configure(self, before=None, after=None):
+        slaves = self.master.slaves
+        slaves.remove(self)
+        names = [str(w) for w in slaves]
+        if before is not None:
+            slaves.insert(names.index(str(before)), self)
+        else:
+            slaves.insert(names.index(str(after)) + 1, self)
+
+
+class StubRenderer:
+    def __init__(self):
+        self.widgets = {}
+        self.created = 0
+
+    def get_command_handler(self, name):
+        return None
+
+    def render_element(self, element, parent, placement=None):
+        self.created += 1
+        widget = StubWidget(f"{element.tag}{self.created}", parent)
+        if placement is None:
+            widget.pack()
+        else:
+            widget.grid()
+        node = RenderNode(element.tag, element.attrib, widget)
+        if element.get('id'):
+            self.widgets[element.get('id')] = widget
+        for child, child_placement in zip(element, placements(element)):
+            if child.tag in TAGS:
+                node.children.append(self.render_element(child, widget, child_placement))
+        return node
+
+
+def render(markup_text):
+    renderer = StubRenderer()
+    root = parse_nodes(markup_text)
+    node = RenderNode(root.tag, root.attrib, StubWidget('window', StubWidget('root')))
+    for child in root:
+        node.children.append(renderer.render_element(child, node.widget))
+    return Reconciler(renderer), node
+
+
+def test_keys_prefer_ids_and_fall_back_to_position():
+    items = [('label', 'a'), ('label', 'a'), ('label', None), ('button', 'a')]
+    assert _keys(items, lambda item: item[0], lambda item: item[1]) == [
+        ('id', 'a'), ('label', 0), ('label', 1), ('button', 0)]
+
+
+def test_unchanged_document_reuses_everything():
+    text = '<window><label text="a" /><frame><entry id="e" /></frame></window>'
+    reconciler, node = render(text)
+    stats = reconciler.reconcile(node, parse_nodes(text))
+    assert (stats.created, stats.updated, stats.destroyed) == (0, 0, 0)
+    assert stats.reused == 4
+
+
+def test_changed_text_is_configured_in_place():
+    reconciler, node = render('<window><label text="a" /></window>')
+    label = node.children[0].widget
+    stats = reconciler.reconcile(node, parse_nodes('<window><label text="b" /></window>'))
+    assert (stats.created, stats.updated) == (0, 1)
+    assert label.configured == [{'text': 'b'}]
+
+
+def test_moved_ids_keep_their_widgets_and_pack_order():
+    reconciler, node = render('<window><entry id="a" /><entry id="b" /></window>')
+    a, b = (child.widget for child in node.children)
+    reconciler.reconcile(node, parse_nodes('<window><entry id="b" /><entry id="a" /></window>'))
+    assert [child.widget for child in node.children] == [b, a]
+    assert node.widget.pack_slaves() == [b, a]
+
+
+def test_duplicate_ids_are_all_removed():
+    reconciler, node = render('<window><label id="x" text="1" /><label id="x" text="2" /></window>')
+    widgets = [child.widget for child in node.children]
+    stats = reconciler.reconcile(node, parse_nodes('<window></window>'))
+    assert stats.destroyed == 2
+    assert all(widget.destroyed for widget in widgets)
+
+
+def test_grid_children_are_left_alone():
+    text = '<window><frame layout="grid"><label text="a" /><label text="b" /></frame></window>'
+    reconciler, node = render(text)
+    frame = node.children[0]
+    assert frame.widget.pack_slaves() == []
+    stats = reconciler.reconcile(node, parse_nodes(text.replace('"b"', '"c"')))
+    assert (stats.created, stats.updated, stats.destroyed) == (0, 1, 0)
+    # 容器中没有 pack 管理的子控件时不调整顺序
+    reconciler._restore_order(frame.widget, frame.children, ReconcileStats())
+    assert all(child.widget.manager == 'grid' for child in frame.children)
+
+
+def test_only_packed_children_are_reordered():
+    container = StubWidget('frame', StubWidget('root'))
+    packed, gridded, other = (StubWidget(name, container) for name in ('packed', 'gridded', 'other'))
+    other.pack()
+    packed.pack()
+    gridded.grid()
+    nodes = [RenderNode('label', {}, widget) for widget in (packed, gridded, other)]
+    Reconciler(StubRenderer())._restore_order(container, nodes, ReconcileStats())
+    assert container.pack_slaves() == [packed, other]
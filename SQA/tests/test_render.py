@@ -0,0 +1,82 @@
+"""example.MarkupParser.render：控件类换成桩对象，不需要图形界面"""
+import tkinter as tk
+
+import pytest
+
+import example
+
+
+class StubWidget:
+    """代替Tk控件，记录布局调用"""
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+        self.kwargs = kwargs
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, kwargs))
+
+    def placed(self, manager):
+        return [kwargs for name, kwargs in self.calls if name == manager]
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    """控件类全部换成桩对象的 MarkupParser"""
+    monkeypatch.setattr(tk, '_default_root', tk.Tcl())
+    monkeypatch.setattr(example, 'shared_font', lambda font, widget: font)
+    parser = example.MarkupParser()
+    parser.supported_tags = {tag: StubWidget for tag in parser.supported_tags}
+    return parser
+
+
+def test_render_grid_frame_places_leaf_children(parser):
+    root = parser.parse('''<window>
+        <frame layout="grid" cols="2" colweights="0,1">
+            <label text="姓名" />
+            <entry id="name" />
+            <label text="邮箱" />
+            <entry id="email" />
+            <button text="保存" span="2" />
+        </frame>
+    </window>''')
+    assert parser.render(root) is not None
+    name = parser.elements['name']
+    email = parser.elements['email']
+    assert name.placed('grid')[0]['row'] == 0 and name.placed('grid')[0]['column'] == 1
+    assert email.placed('grid')[0]['row'] == 1
+    # 网格中的子元素不再自行 pack
+    assert not name.placed('pack')
+    frame = name.master
+    assert ('columnconfigure', {'weight': 1}) in frame.calls
+
+
+def test_render_grid_frame_places_every_child(parser):
+    created = []
+
+    class Recording(StubWidget):
+        def __init__(self, master=None, **kwargs):
+            super().__init__(master, **kwargs)
+            created.append(self)
+
+    parser.supported_tags = {tag: Recording for tag in parser.supported_tags}
+    parser.render(parser.parse('<window><frame layout="grid" cols="3">'
+                               + '<label text="x" />' * 7 + '</frame></window>'))
+    labels = [widget for widget in created if widget.kwargs.get('text') == 'x']
+    assert len(labels) == 7
+    cells = [(w.placed('grid')[0]['row'], w.placed('grid')[0]['column']) for w in labels]
+    assert cells == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0)]
+
+
+def test_src_is_only_passed_to_image(parser):
+    parser.render(parser.parse('<window><label id="l" text="x" src="a.png" />'
+                               '<image id="i" src="a.png" width="32" /></window>'))
+    assert 'src' not in parser.elements['l'].kwargs
+    assert parser.elements['i'].kwargs == {'src': 'a.png', 'width': 32}
+
+
+def test_malformed_font_is_skipped_with_a_warning(parser, caplog):
+    parser.render(parser.parse('<window><label id="l" text="x" font="Arial big" /></window>'))
+    assert 'font' not in parser.elements['l'].kwargs
+    assert '无法解析的字体' in caplog.text
@@ -0,0 +1,77 @@
+"""分批渲染（markup.scheduler）：事件循环换成手动执行的回调队列"""
+from markup.scheduler import ChunkedRender
+
+
+class FakeLoop:
+    """代替控件的 after()/after_idle()，run() 依次执行排队的回调"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self):
+        batches = 0
+        while self.jobs:
+            job = min(self.jobs)
+            self.jobs.pop(job)()
+            batches += 1
+        return batches
+
+
+def test_steps_run_in_batches_until_done():
+    loop = FakeLoop()
+    progress = []
+    done = []
+    # 时间片为0时每批只执行一步
+    render = ChunkedRender(loop, budget_ms=0, on_progress=lambda d, t: progress.append((d, t)),
+                           on_done=lambda: done.append(True))
+    executed = []
+    render.start((executed.append(i) for i in range(3)), 3)
+    assert executed == []
+    assert loop.run() == 4
+    assert executed == [0, 1, 2]
+    assert progress == [(1, 3), (2, 3), (3, 3), (3, 3)]
+    assert done == [True] and not render.running
+
+
+def test_large_budget_finishes_in_one_batch():
+    loop = FakeLoop()
+    render = ChunkedRender(loop, budget_ms=10000)
+    render.start(iter(range(1000)), 1000)
+    assert loop.run() == 1
+
+
+def test_restart_cancels_the_previous_render():
+    loop = FakeLoop()
+    render = ChunkedRender(loop, budget_ms=0)
+    first = []
+    render.start((first.append(i) for i in range(5)), 5)
+    loop.jobs.pop(min(loop.jobs))()
+    render.start(iter(range(2)), 2)
+    loop.run()
+    assert first == [0]
+
+
+def test_errors_are_reported():
+    loop = FakeLoop()
+    errors = []
+
+    def steps():
+        yield
+        raise RuntimeError("坏的指令")
+
+    render = ChunkedRender(loop, budget_ms=10000, on_error=errors.append)
+    render.start(steps(), 2)
+    loop.run()
+    assert [str(e) for e in errors] == ["坏的指令"] and not render.running
@@ -0,0 +1,72 @@
+"""数据模板（markup.template）：表达式、属性值和 <for>/<if> 渲染"""
+import pytest
+
+from markup.build import ERROR, validate
+from markup.node import parse_nodes
+from markup.plan import compile_markup
+from markup.template import compile_expression, compile_template_markup, compile_value
+
+SCOPE = {'rows': [{'name': 'a', 'width': 3}], 'user': {'name': 'b'}, 'n': 2}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('len(rows)', 1),
+    ('rows[0].name', 'a'),
+    ('user.name', 'b'),
+    ('user.missing', None),
+    ('missing', None),
+    ('n * 3 + 1', 7),
+    ('n > 1 and "y" or "z"', 'y'),
+    ('"x" if n else "y"', 'x'),
+    ('not n', False),
+])
+def test_expression_values(text, expected):
+    assert compile_expression(text)(SCOPE) == expected
+
+
+@pytest.mark.parametrize('text', [
+    'rows.__class__', 'user._secret', '__import__("os")', 'open("x")', 'lambda: 1', 'a b',
+])
+def test_unsafe_or_invalid_expressions_are_rejected(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_value_formatting():
+    assert compile_value('${n}')(SCOPE) == '2'
+    assert compile_value('a${n}b${missing}c')(SCOPE) == 'a2bc'
+    assert compile_value('${n > 1}')(SCOPE) == '1'
+    assert compile_value('${n > 5}')(SCOPE) == '0'
+
+
+@pytest.mark.parametrize('value', ['a${n', '${n}${user.name', '${'])
+def test_unterminated_expression(value):
+    with pytest.raises(ValueError, match='未闭合'):
+        compile_value(value)
+
+
+def test_unterminated_expression_is_a_build_error():
+    [diagnostic] = validate(parse_nodes('<window><label text="共${n" /></window>'))
+    assert diagnostic.level == ERROR
+    assert '未闭合' in diagnostic.message
+    with pytest.raises(ValueError, match='未闭合'):
+        compile_template_markup('<window><label text="共${n" /></window>')
+
+
+def test_template_matches_generated_markup():
+    template = compile_template_markup('''<window title="${title}">
+        <frame layout="grid" cols="2">
+            <for each="row in rows" index="i">
+                <label text="${row.name}：" />
+                <if test="row.required"><entry id="f${i}" width="${row.width}" /></if>
+                <else><label text="（选填）" /></else>
+            </for>
+        </frame>
+    </window>''')
+    rows = [{'name': 'a', 'width': 10, 'required': True}, {'name': 'b', 'width': 20, 'required': False}]
+    plan = template.render({'title': '表单', 'rows': rows})
+    expected = compile_markup('<window title="表单"><frame layout="grid" cols="2">'
+                              '<label text="a：" /><entry id="f0" width="10" />'
+                              '<label text="b：" /><label text="（选填）" /></frame></window>')
+    assert plan.attrs == expected.attrs
+    assert [tuple(i) for i in plan.instructions] == [tuple(i) for i in expected.instructions]
@@ -0,0 +1,46 @@
+"""单遍分词器（markup.tokenizer）：完整扫描与分块送入的结果一致"""
+import pytest
+
+from markup.tokenizer import END, START, TEXT, MarkupTokenizer, tokenize
+
+DOCUMENTS = [
+    '<window title="演示"><label text="x>y" /><entry id=\'a>b\' width="20"/></window>',
+    '<?xml version="1.0"?>\n<!-- 注释 <label> -->\n<window>\n  <text>多行\n文本</text>\n'
+    '  <frame layout="grid"><button text="确定" command="ok" /></frame>\n</window>',
+    '<window><label text="a" / ><!DOCTYPE x><p>1 &lt; 2</p></window>',
+]
+
+
+def chunked(chunks):
+    tokenizer = MarkupTokenizer()
+    events = []
+    for chunk in chunks:
+        events.extend(tokenizer.feed(chunk))
+    events.extend(tokenizer.close())
+    return events
+
+
+def test_events():
+    assert list(tokenize('<window><label text="x>y" />hi</window>')) == [
+        (START, 'window', {}),
+        (START, 'label', {'text': 'x>y'}),
+        (END, 'label'),
+        (TEXT, 'hi'),
+        (END, 'window'),
+    ]
+
+
+def test_comments_and_declarations_are_skipped():
+    assert list(tokenize('<?xml version="1.0"?><!-- <a> --><b/>')) == [(START, 'b', {}), (END, 'b')]
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_split_at_every_offset(document):
+    expected = list(tokenize(document))
+    for offset in range(len(document) + 1):
+        assert chunked([document[:offset], document[offset:]]) == expected, offset
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_one_character_at_a_time(document):
+    assert chunked(document) == list(tokenize(document))